@@ -12,13 +12,13 @@
         * Recommend optimal reorder quantities
         * Display predicted vs actual sales comparison
         * Alert for potential stockouts
-        * Uses linear regression and moving average algorithms
+        * Uses moving average, linear regression, Holt-Winters and weekday profile models
     """,
     'author': 'Your Name',
     'website': 'https://www.yourcompany.com',
-    'depends': ['base', 'erp_inventory', 'erp_sales'],
+    'depends': ['base', 'purchase_stock', 'erp_inventory', 'erp_sales'],
     'external_dependencies': {
-        'python': ['numpy', 'pandas', 'sklearn'],
+        'python': ['numpy', 'pandas'],
     },
     'data': [
         'security/ir.model.access.csv',
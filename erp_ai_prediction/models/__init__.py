@@ -2,3 +2,4 @@
 
 from . import stock_prediction
 from . import prediction_engine
+from . import prediction_backtest
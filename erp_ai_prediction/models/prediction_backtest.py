@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+from .prediction_engine import PredictionEngine, FORECAST_METHODS, BACKTEST_FOLDS, PERIOD_DAYS
+from .stock_prediction import HISTORY_DAYS, PREDICTION_METHODS
+
+_logger = logging.getLogger(__name__)
+
+BACKTEST_BATCH_SIZE = 1000
+BACKTEST_MAX_AGE_DAYS = 7
+
+
+class StockPredictionBacktest(models.Model):
+    _name = 'stock.prediction.backtest'
+    _description = 'Prediction Method Backtest'
+    _order = 'best_error desc'
+
+    product_id = fields.Many2one('product.product', string='Product', required=True, index=True, ondelete='cascade')
+    best_method = fields.Selection(PREDICTION_METHODS, string='Best Method', required=True)
+    best_error = fields.Float('Backtest Error %', help="Absolute forecast error of the best method over the "
+                                                        "holdout weeks, as a percentage of actual demand")
+    method_errors = fields.Json('Errors per Method')
+    evaluated_on = fields.Date('Evaluated On', required=True, default=fields.Date.today, index=True)
+
+    _sql_constraints = [
+        ('product_uniq', 'unique(product_id)', 'A product has a single backtest result!'),
+    ]
+
+    @api.model
+    def _get_best_methods(self, products):
+        """Stored winning method of products, keyed by product id"""
+        return {
+            backtest['product_id'][0]: backtest['best_method']
+            for backtest in self.search_read([('product_id', 'in', products.ids)], ['product_id', 'best_method'])
+        }
+
+    @api.model
+    def _run_backtests(self, products, workers=1):
+        """Backtest every forecasting method on products, batch by batch
+
+        Sales history is loaded with one query per batch; the backtests of
+        the batches run in a thread pool when several workers are requested.
+
+        Args:
+            products: product.product recordset
+            workers: number of threads computing backtests
+        """
+        engine = PredictionEngine()
+        horizon = PERIOD_DAYS['week']
+        date_to = fields.Date.today() - timedelta(days=1)
+        date_from = date_to - timedelta(days=HISTORY_DAYS + BACKTEST_FOLDS * horizon - 1)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for index in range(0, len(products), BACKTEST_BATCH_SIZE):
+                batch = products[index:index + BACKTEST_BATCH_SIZE]
+                demand = self.env['stock.prediction']._get_daily_demand(batch, date_from, date_to)
+                futures.append((batch, executor.submit(engine.backtest, demand, date_from, horizon)))
+
+            vals_list = []
+            for batch, future in futures:
+                errors = future.result()
+                for product_id, product_errors in zip(batch.ids, errors):
+                    best = int(product_errors.argmin())
+                    vals_list.append({
+                        'product_id': product_id,
+                        'best_method': FORECAST_METHODS[best],
+                        'best_error': float(product_errors[best]),
+                        'method_errors': dict(zip(FORECAST_METHODS, product_errors.round(2).tolist())),
+                    })
+
+        self.search([('product_id', 'in', products.ids)]).unlink()
+        self.create(vals_list)
+        return len(vals_list)
+
+    @api.model
+    def cron_backtest_prediction_methods(self, workers=1):
+        """Cron job to re-evaluate the best forecasting method of stale products"""
+        products = self.env['product.product'].search([
+            ('type', '=', 'product'),
+            ('active', '=', True)
+        ])
+        fresh_ids = set(self.search([
+            ('evaluated_on', '>', fields.Date.today() - timedelta(days=BACKTEST_MAX_AGE_DAYS)),
+        ]).product_id.ids)
+        products = products.filtered(lambda product: product.id not in fresh_ids)
+        count = self._run_backtests(products, workers) if products else 0
+        _logger.info(f"Backtested forecasting methods of {count} products")
+        return True
@@ -1,21 +1,37 @@
 # -*- coding: utf-8 -*-
 
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
+from math import sqrt
+from statistics import NormalDist
 
 try:
     import numpy as np
-    import pandas as pd
-    from sklearn.linear_model import LinearRegression
-    from sklearn.preprocessing import StandardScaler
 except ImportError:
     np = None
+
+try:
+    import pandas as pd
+except ImportError:
     pd = None
-    LinearRegression = None
-    StandardScaler = None
 
 _logger = logging.getLogger(__name__)
 
+# Forecast horizon in days of each prediction period
+PERIOD_DAYS = {'week': 7, 'month': 30}
+SEASON_LENGTH = 7
+MOVING_AVERAGE_DAYS = 28
+PROFILE_WEEKS = 8
+BACKTEST_FOLDS = 4
+INTERVAL_LEVEL = 0.95
+
+FORECAST_METHODS = ('moving_average', 'linear_regression', 'hybrid', 'holt_winters', 'weekday_profile')
+
+# Smoothing constants searched when fitting Holt-Winters
+HW_ALPHAS = (0.1, 0.3, 0.5, 0.7, 0.9)
+HW_BETAS = (0.0, 0.05, 0.1, 0.2)
+HW_GAMMAS = (0.05, 0.1, 0.3, 0.5)
+
 
 class PredictionEngine:
     """AI Engine for stock demand prediction"""
@@ -76,54 +92,357 @@ class PredictionEngine:
         recent_sales = sales_data[-window:]
         return sum(recent_sales) / len(recent_sales)
     
-    def predict_with_linear_regression(self, df, product_id):
+    def build_daily_series(self, df, product_id, date_from, date_to):
         """
-        Predict demand using linear regression
+        Aggregate the sales of a product into a per-day demand series
         
         Args:
             df: pandas DataFrame with historical data
-            product_id: product ID to predict
+            product_id: product ID to aggregate
+            date_from: first day of the series
+            date_to: last day of the series
             
         Returns:
-            predicted quantity
+            numpy array with one demand value per day, days without sales are zero
         """
-        if not LinearRegression or not np:
-            _logger.error("Scikit-learn not installed. Cannot use linear regression.")
-            return 0.0
+        product_data = df[df['product_id'] == product_id]
+        days = (date_to - date_from).days + 1
+        offsets = np.array([(order_date.date() - date_from).days for order_date in product_data['date']], dtype=int)
+        quantities = product_data['quantity'].to_numpy(dtype=float)
+        inside = (offsets >= 0) & (offsets < days)
+        return self.build_demand_matrix([0] * int(inside.sum()), offsets[inside], quantities[inside], 1, days)[0]
+    
+    def build_demand_matrix(self, rows, offsets, quantities, row_count, days):
+        """
+        Scatter (row, day offset, quantity) triples into a demand matrix
         
-        # Filter data for specific product
-        product_data = df[df['product_id'] == product_id].copy()
+        Args:
+            rows: row index of each quantity
+            offsets: day offset of each quantity from the first day
+            quantities: quantities to add
+            row_count: number of rows (products)
+            days: number of days
+            
+        Returns:
+            numpy array of shape (row_count, days)
+        """
+        matrix = np.zeros((row_count, days))
+        np.add.at(matrix, (np.asarray(rows, dtype=int), np.asarray(offsets, dtype=int)),
+                  np.asarray(quantities, dtype=float))
+        return matrix
+    
+    def predict_with_moving_average(self, demand, horizon=7):
+        """
+        Predict demand from the average daily demand of the last weeks
         
-        if len(product_data) < 3:
+        Args:
+            demand: numpy array of daily demand, one row per product
+            horizon: number of days to forecast
+            
+        Returns:
+            numpy array with the predicted quantity of each row over the horizon
+        """
+        return demand[:, -MOVING_AVERAGE_DAYS:].mean(axis=1) * horizon
+    
+    def predict_with_linear_regression(self, demand, date_from, horizon=7):
+        """
+        Predict demand using linear regression on the daily series
+        
+        All rows share the same time features, so they are solved together
+        in a single least-squares call.
+        
+        Args:
+            demand: numpy array of daily demand, one row per product
+            date_from: date of the first day of the series
+            horizon: number of days to forecast
+            
+        Returns:
+            numpy array with the predicted quantity of each row over the horizon
+        """
+        days = demand.shape[1]
+        if days < 3:
             # Not enough data for regression
-            return self.calculate_moving_average(product_data['quantity'].tolist())
+            return self.predict_with_moving_average(demand, horizon)
+        
+        # Time-based features of the history and of each forecast day
+        all_days = [date_from + timedelta(days=offset) for offset in range(days + horizon)]
+        features = np.array([[offset, day.weekday(), day.month, 1] for offset, day in enumerate(all_days)], dtype=float)
+        coefficients = np.linalg.lstsq(features[:days], demand.T, rcond=None)[0]
+        daily = features[days:] @ coefficients
+        return np.clip(daily, 0, None).sum(axis=0)
+    
+    def fit_holt_winters(self, demand, params=None):
+        """
+        Fit additive Holt-Winters smoothing with a weekly season
+        
+        Every row is filtered with every candidate smoothing constant at
+        once, and each row keeps the candidate with the lowest one-step
+        squared error.
+        
+        Args:
+            demand: numpy array of daily demand, one row per product, at least two seasons long
+            params: previously fitted smoothing constants of each row to reuse instead of searching
+            
+        Returns:
+            dict of arrays with the smoothing constants and the final level, trend and season of each row
+        """
+        rows, days = demand.shape
+        if params:
+            alpha, beta, gamma = (np.array([[row_params[key]] for row_params in params])
+                                  for key in ('alpha', 'beta', 'gamma'))
+        else:
+            alpha, beta, gamma = (grid.reshape(1, -1)
+                                  for grid in np.meshgrid(HW_ALPHAS, HW_BETAS, HW_GAMMAS, indexing='ij'))
+        shape = (rows, max(alpha.shape[1], 1))
+        alpha, beta, gamma = (np.broadcast_to(constant, shape) for constant in (alpha, beta, gamma))
+        
+        m = SEASON_LENGTH
+        first_season = demand[:, :m].mean(axis=1, keepdims=True)
+        level = np.broadcast_to(first_season, shape).copy()
+        trend = np.broadcast_to((demand[:, m:2 * m].mean(axis=1, keepdims=True) - first_season) / m, shape).copy()
+        season = np.broadcast_to((demand[:, :m] - first_season)[:, None, :], shape + (m,)).copy()
+        squared_errors = np.zeros(shape)
+        
+        for t in range(m, days):
+            actual = demand[:, t:t + 1]
+            seasonal = season[:, :, t % m]
+            error = actual - (level + trend + seasonal)
+            squared_errors += error ** 2
+            new_level = alpha * (actual - seasonal) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            season[:, :, t % m] = gamma * (actual - new_level) + (1 - gamma) * seasonal
+            level = new_level
+        
+        best = np.argmin(squared_errors, axis=1)
+        index = np.arange(rows)
+        return {
+            'alpha': alpha[index, best],
+            'beta': beta[index, best],
+            'gamma': gamma[index, best],
+            'level': level[index, best],
+            'trend': trend[index, best],
+            'season': season[index, best],
+            'length': days,
+        }
+    
+    def predict_with_holt_winters(self, demand, horizon=7, params=None):
+        """
+        Predict demand with Holt-Winters exponential smoothing
+        
+        Args:
+            demand: numpy array of daily demand, one row per product
+            horizon: number of days to forecast
+            params: cached smoothing constants of each row, if any
+            
+        Returns:
+            tuple of (predicted quantity of each row over the horizon, fitted parameters or None)
+        """
+        if demand.shape[1] < 2 * SEASON_LENGTH:
+            return self.predict_with_moving_average(demand, horizon), None
+        
+        fitted = self.fit_holt_winters(demand, params)
+        steps = np.arange(1, horizon + 1)
+        season = fitted['season'][:, (fitted['length'] + steps - 1) % SEASON_LENGTH]
+        daily = fitted['level'][:, None] + steps * fitted['trend'][:, None] + season
+        return np.clip(daily, 0, None).sum(axis=1), fitted
+    
+    def predict_with_weekday_profile(self, demand, date_from, horizon=7):
+        """
+        Predict demand from the average demand of each weekday over recent weeks
+        
+        Args:
+            demand: numpy array of daily demand, one row per product
+            date_from: date of the first day of the series
+            horizon: number of days to forecast
+            
+        Returns:
+            numpy array with the predicted quantity of each row over the horizon
+        """
+        days = demand.shape[1]
+        recent = demand[:, -PROFILE_WEEKS * SEASON_LENGTH:]
+        first_weekday = (date_from.weekday() + days - recent.shape[1]) % SEASON_LENGTH
+        weekdays = np.eye(SEASON_LENGTH)[(first_weekday + np.arange(recent.shape[1])) % SEASON_LENGTH]
+        counts = weekdays.sum(axis=0)
+        profile = np.divide(recent @ weekdays, counts, out=np.zeros((len(demand), SEASON_LENGTH)), where=counts > 0)
+        
+        future_weekdays = (date_from.weekday() + days + np.arange(horizon)) % SEASON_LENGTH
+        return profile[:, future_weekdays].sum(axis=1)
+    
+    def forecast_matrix(self, demand, date_from, method='hybrid', horizon=7, params=None):
+        """
+        Forecast the total demand of the next days for many products at once
         
-        # Create time-based features
-        product_data['days_since_start'] = (product_data['date'] - product_data['date'].min()).dt.days
+        Args:
+            demand: numpy array of daily demand, one row per product, ending the day before the forecast
+            date_from: date of the first day of the series
+            method: one of FORECAST_METHODS
+            horizon: number of days to forecast
+            params: cached fitted parameters of each row for this method
+            
+        Returns:
+            tuple of (predicted quantity of each row, fitted parameters or None)
+        """
+        if method == 'moving_average':
+            return self.predict_with_moving_average(demand, horizon), None
+        
+        elif method == 'linear_regression':
+            return self.predict_with_linear_regression(demand, date_from, horizon), None
+        
+        elif method == 'hybrid':
+            # Use both methods and average
+            ma_pred = self.predict_with_moving_average(demand, horizon)
+            lr_pred = self.predict_with_linear_regression(demand, date_from, horizon)
+            return (ma_pred + lr_pred) / 2, None
+        
+        elif method == 'holt_winters':
+            return self.predict_with_holt_winters(demand, horizon, params)
+        
+        elif method == 'weekday_profile':
+            return self.predict_with_weekday_profile(demand, date_from, horizon), None
+        
+        return np.zeros(len(demand)), None
+    
+    def forecast(self, series, date_from, method='hybrid', horizon=7, params=None):
+        """
+        Forecast the total demand of the next days from a daily demand series
+        
+        Args:
+            series: numpy array of daily demand, ending the day before the forecast
+            date_from: date of the first day of the series
+            method: one of FORECAST_METHODS
+            horizon: number of days to forecast
+            params: cached fitted parameters of the product for this method
+            
+        Returns:
+            tuple of (predicted quantity, fitted parameters worth caching or None)
+        """
+        if not np:
+            _logger.error("NumPy not installed. Cannot forecast demand.")
+            return 0.0, None
+        
+        if not len(series) or not series.any():
+            return 0.0, None
+        
+        forecasts, fitted = self.forecast_matrix(series[None, :], date_from, method, horizon, params and [params])
+        if fitted:
+            fitted = {key: float(fitted[key][0]) for key in ('alpha', 'beta', 'gamma')}
+        return float(forecasts[0]), fitted
+    
+    def holdout_errors(self, demand, date_from, method, horizon=7, folds=BACKTEST_FOLDS, params=None):
+        """
+        Forecast errors of a method on rolling-origin holdout windows
+        
+        Each fold trains on the history up to an origin and forecasts the
+        following horizon; origins step back one horizon per fold. Folds
+        leaving less than two seasons of history are skipped.
+        
+        Args:
+            demand: numpy array of daily demand, one row per product
+            date_from: date of the first day of the series
+            method: one of FORECAST_METHODS
+            horizon: number of days of each holdout window
+            folds: number of holdout windows
+            params: fitted parameters of each row to reuse on every fold instead of searching
+            
+        Returns:
+            tuple of numpy arrays of shape (products, folds used): forecast minus
+            actual demand, and actual demand of each holdout window
+        """
+        days = demand.shape[1]
+        errors = []
+        actuals = []
+        for fold in range(folds, 0, -1):
+            origin = days - fold * horizon
+            if origin < 2 * SEASON_LENGTH:
+                continue
+            actual = demand[:, origin:origin + horizon].sum(axis=1)
+            forecasts = self.forecast_matrix(demand[:, :origin], date_from, method, horizon, params)[0]
+            errors.append(forecasts - actual)
+            actuals.append(actual)
+        if not errors:
+            return np.zeros((len(demand), 0)), np.zeros((len(demand), 0))
+        return np.column_stack(errors), np.column_stack(actuals)
+    
+    def backtest(self, demand, date_from, horizon=7, folds=BACKTEST_FOLDS, methods=FORECAST_METHODS):
+        """
+        Evaluate forecasting methods on rolling-origin holdout windows
+        
+        Args:
+            demand: numpy array of daily demand, one row per product
+            date_from: date of the first day of the series
+            horizon: number of days of each holdout window
+            folds: number of holdout windows
+            methods: methods to evaluate
+            
+        Returns:
+            numpy array of shape (products, methods) with the absolute error summed
+            over all folds, as a percentage of the actual demand
+        """
+        scores = np.zeros((len(demand), len(methods)))
+        for index, method in enumerate(methods):
+            errors, actuals = self.holdout_errors(demand, date_from, method, horizon, folds)
+            scores[:, index] = np.abs(errors).sum(axis=1) / np.maximum(actuals.sum(axis=1), 1) * 100
+        return scores
+    
+    def forecast_with_uncertainty(self, demand, date_from, method='hybrid', horizon=7, params=None):
+        """
+        Forecast demand of many products together with its uncertainty
         
-        # Prepare features and target
-        X = product_data[['days_since_start', 'day_of_week', 'month']].values
-        y = product_data['quantity'].values
+        The daily forecast error of each row is estimated from the holdout
+        errors of the method, or from the variance of daily demand when the
+        history is too short for holdouts. Holdouts reuse the parameters of
+        the forecast, so smoothing constants are searched at most once per row.
         
-        # Train model
-        model = LinearRegression()
-        model.fit(X, y)
+        Args:
+            demand: numpy array of daily demand, one row per product, ending the day before the forecast
+            date_from: date of the first day of the series
+            method: one of FORECAST_METHODS
+            horizon: number of days to forecast
+            params: cached fitted parameters of each row for this method, if any
+            
+        Returns:
+            dict of arrays with one value per row: the 'forecast', the daily error
+            standard deviation 'sigma', the 'lower' and 'upper' bounds of the
+            prediction interval and a 'confidence' score between 0 and 100, and
+            under 'fitted' the list of parameters of each row worth caching, or None
+        """
+        forecasts, fitted = self.forecast_matrix(demand, date_from, method, horizon, params)
+        forecasts = np.where(demand.any(axis=1), forecasts, 0.0)
+        if fitted:
+            params = [{key: float(fitted[key][row]) for key in ('alpha', 'beta', 'gamma')}
+                      for row in range(len(demand))]
         
-        # Predict for next period (7 days ahead)
-        max_days = product_data['days_since_start'].max()
-        next_period = [[max_days + 7, datetime.now().weekday(), datetime.now().month]]
-        prediction = model.predict(next_period)[0]
+        errors = self.holdout_errors(demand, date_from, method, horizon, params=params)[0]
+        if errors.shape[1]:
+            sigma = np.sqrt(np.mean(errors ** 2, axis=1) / horizon)
+        elif demand.shape[1] > 1:
+            sigma = demand.std(axis=1, ddof=1)
+        else:
+            sigma = np.zeros(len(demand))
+        sigma = np.where(forecasts > 0, sigma, 0.0)
         
-        return max(0, prediction)  # Ensure non-negative
+        # Two-sided interval on the total demand of the horizon
+        spread = NormalDist().inv_cdf(0.5 + INTERVAL_LEVEL / 2) * sigma * sqrt(horizon)
+        confidence = np.divide(100 * forecasts, forecasts + sigma * sqrt(horizon),
+                               out=np.zeros(len(demand)), where=forecasts > 0)
+        return {
+            'forecast': forecasts,
+            'fitted': params if fitted else None,
+            'sigma': sigma,
+            'lower': np.maximum(forecasts - spread, 0.0),
+            'upper': forecasts + spread,
+            'confidence': confidence,
+        }
     
-    def predict_demand(self, df, product_id, method='hybrid'):
+    def predict_demand(self, df, product_id, method='hybrid', horizon=7):
         """
         Predict demand using specified method
         
         Args:
             df: pandas DataFrame with historical data
             product_id: product ID to predict
-            method: 'moving_average', 'linear_regression', or 'hybrid'
+            method: forecasting method, see forecast()
+            horizon: number of days to forecast
             
         Returns:
             predicted quantity
@@ -136,21 +455,29 @@ class PredictionEngine:
         if len(product_data) == 0:
             return 0.0
         
-        if method == 'moving_average':
-            return self.calculate_moving_average(product_data['quantity'].tolist())
-        
-        elif method == 'linear_regression':
-            return self.predict_with_linear_regression(df, product_id)
-        
-        elif method == 'hybrid':
-            # Use both methods and average
-            ma_pred = self.calculate_moving_average(product_data['quantity'].tolist())
-            lr_pred = self.predict_with_linear_regression(df, product_id)
-            return (ma_pred + lr_pred) / 2
+        date_from = product_data['date'].min().date()
+        date_to = product_data['date'].max().date()
+        series = self.build_daily_series(df, product_id, date_from, date_to)
+        return self.forecast(series, date_from, method, horizon)[0]
+    
+    def calculate_safety_stock(self, sigma, lead_time_days, service_level=0.95):
+        """
+        Calculate safety stock for a cycle service level
         
-        return 0.0
+        Args:
+            sigma: standard deviation of the daily demand forecast error
+            lead_time_days: replenishment lead time in days
+            service_level: probability of not running out during the lead time
+            
+        Returns:
+            safety stock quantity
+        """
+        if sigma <= 0 or lead_time_days <= 0:
+            return 0.0
+        return NormalDist().inv_cdf(service_level) * sigma * sqrt(lead_time_days)
     
-    def calculate_reorder_quantity(self, predicted_demand, current_stock, min_stock, max_stock, safety_factor=1.2):
+    def calculate_reorder_quantity(self, predicted_demand, current_stock, min_stock, max_stock, safety_factor=1.2,
+                                   safety_stock=None, lead_time_demand=0.0):
         """
         Calculate optimal reorder quantity
         
@@ -159,21 +486,32 @@ class PredictionEngine:
             current_stock: current stock level
             min_stock: minimum stock level
             max_stock: maximum stock level
-            safety_factor: safety stock multiplier
+            safety_factor: safety stock multiplier, used when no safety stock is given
+            safety_stock: statistical safety stock, see calculate_safety_stock()
+            lead_time_demand: demand expected during the replenishment lead time
             
         Returns:
             recommended reorder quantity
         """
-        # Calculate safety stock
-        safety_stock = predicted_demand * safety_factor
-        
-        # Calculate reorder point
-        reorder_point = min_stock + safety_stock
+        if safety_stock is None:
+            # Calculate safety stock
+            safety_stock = predicted_demand * safety_factor
+            
+            # Calculate reorder point
+            reorder_point = min_stock + safety_stock
+            
+            # If current stock is below reorder point, calculate order quantity
+            if current_stock < reorder_point:
+                # Order enough to reach max stock plus predicted demand
+                order_qty = max_stock - current_stock + predicted_demand
+                return max(0, order_qty)
+            
+            return 0.0
         
-        # If current stock is below reorder point, calculate order quantity
+        # Stock must cover the lead time demand plus the safety stock on top of the minimum
+        reorder_point = min_stock + lead_time_demand + safety_stock
         if current_stock < reorder_point:
-            # Order enough to reach max stock plus predicted demand
-            order_qty = max_stock - current_stock + predicted_demand
+            order_qty = max(max_stock, reorder_point) - current_stock + predicted_demand
             return max(0, order_qty)
         
         return 0.0
@@ -1,12 +1,29 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
-from datetime import datetime, timedelta
-from .prediction_engine import PredictionEngine
+from collections import defaultdict
+from datetime import timedelta
+from math import ceil
+from .prediction_engine import PredictionEngine, PERIOD_DAYS
 import logging
 
 _logger = logging.getLogger(__name__)
 
+HISTORY_DAYS = 90
+FIT_MAX_AGE_DAYS = 7
+DEFAULT_LEAD_TIME_DAYS = 7
+DEFAULT_SERVICE_LEVEL = 0.95
+PREDICTION_BATCH_SIZE = 1000
+ACCURACY_WINDOW_DAYS = 90
+
+PREDICTION_METHODS = [
+    ('moving_average', 'Moving Average'),
+    ('linear_regression', 'Linear Regression'),
+    ('hybrid', 'Hybrid (MA + LR)'),
+    ('holt_winters', 'Holt-Winters Smoothing'),
+    ('weekday_profile', 'Weekday Profile'),
+]
+
 
 class StockPrediction(models.Model):
     _name = 'stock.prediction'
@@ -15,7 +32,8 @@ class StockPrediction(models.Model):
 
     name = fields.Char('Reference', required=True, copy=False, readonly=True, default='New')
     product_id = fields.Many2one('product.product', string='Product', required=True)
-    product_tmpl_id = fields.Many2one('product.template', related='product_id.product_tmpl_id', string='Product Template')
+    product_tmpl_id = fields.Many2one('product.template', related='product_id.product_tmpl_id', string='Product Template',
+                                      store=True, index=True)
     
     # Current stock information
     current_stock = fields.Float('Current Stock', related='product_id.qty_available', readonly=True)
@@ -30,14 +48,18 @@ class StockPrediction(models.Model):
     ], string='Prediction Period', default='week', required=True)
     
     predicted_demand = fields.Float('Predicted Demand', readonly=True)
+    predicted_demand_lower = fields.Float('Predicted Demand (Low)', readonly=True,
+                                          help="Lower bound of the 95% prediction interval")
+    predicted_demand_upper = fields.Float('Predicted Demand (High)', readonly=True,
+                                          help="Upper bound of the 95% prediction interval")
+    demand_std = fields.Float('Daily Forecast Error Std Deviation', readonly=True)
     confidence_score = fields.Float('Confidence Score %', readonly=True)
-    prediction_method = fields.Selection([
-        ('moving_average', 'Moving Average'),
-        ('linear_regression', 'Linear Regression'),
-        ('hybrid', 'Hybrid (MA + LR)'),
-    ], string='Prediction Method', default='hybrid')
+    prediction_method = fields.Selection(PREDICTION_METHODS, string='Prediction Method', default='hybrid')
     
     # Reorder suggestion
+    lead_time_days = fields.Float('Lead Time (days)', readonly=True)
+    safety_stock = fields.Float('Safety Stock', readonly=True)
+    reorder_point = fields.Float('Reorder Point', readonly=True)
     reorder_quantity = fields.Float('Reorder Quantity', readonly=True)
     reorder_priority = fields.Selection([
         ('low', 'Low'),
@@ -47,7 +69,9 @@ class StockPrediction(models.Model):
     ], string='Priority', compute='_compute_reorder_priority', store=True)
     
     # Actual data (for accuracy tracking)
+    period_end_date = fields.Date('Period End', compute='_compute_period_end_date', store=True, index=True)
     actual_demand = fields.Float('Actual Demand')
+    actual_date = fields.Date('Actual Demand Recorded On', readonly=True)
     accuracy = fields.Float('Accuracy %', compute='_compute_accuracy', store=True)
     
     # Status
@@ -59,27 +83,47 @@ class StockPrediction(models.Model):
     
     notes = fields.Text('Notes')
     company_id = fields.Many2one('res.company', default=lambda self: self.env.company)
+    warehouse_id = fields.Many2one('stock.warehouse', string='Warehouse',
+                                   default=lambda self: self.env['stock.warehouse'].search(
+                                       [('company_id', '=', self.env.company.id)], limit=1))
+    purchase_order_id = fields.Many2one('purchase.order', string='Purchase Order', readonly=True, copy=False)
     
-    @api.model
-    def create(self, vals):
+    def init(self):
+        """Serve the latest prediction of products from an index"""
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS stock_prediction_tmpl_latest_index
+                ON stock_prediction (product_tmpl_id, prediction_date DESC, id DESC)
+        """)
+    
+    @api.model_create_multi
+    def create(self, vals_list):
         """Generate sequence for prediction"""
-        if vals.get('name', 'New') == 'New':
-            vals['name'] = self.env['ir.sequence'].next_by_code('stock.prediction') or 'New'
-        return super(StockPrediction, self).create(vals)
+        for vals in vals_list:
+            if vals.get('name', 'New') == 'New':
+                vals['name'] = self.env['ir.sequence'].next_by_code('stock.prediction') or 'New'
+        return super(StockPrediction, self).create(vals_list)
     
-    @api.depends('current_stock', 'predicted_demand', 'min_stock_level')
+    @api.depends('current_stock', 'predicted_demand', 'min_stock_level', 'safety_stock', 'reorder_point')
     def _compute_reorder_priority(self):
         """Calculate reorder priority based on stock levels"""
         for prediction in self:
             if prediction.current_stock <= 0:
                 prediction.reorder_priority = 'urgent'
-            elif prediction.current_stock < prediction.min_stock_level:
+            elif prediction.current_stock < prediction.min_stock_level + prediction.safety_stock:
                 prediction.reorder_priority = 'high'
-            elif prediction.current_stock < (prediction.min_stock_level + prediction.predicted_demand):
+            elif prediction.current_stock < max(prediction.reorder_point,
+                                                prediction.min_stock_level + prediction.predicted_demand):
                 prediction.reorder_priority = 'medium'
             else:
                 prediction.reorder_priority = 'low'
     
+    @api.depends('prediction_date', 'prediction_period')
+    def _compute_period_end_date(self):
+        """First day after the predicted period"""
+        for prediction in self:
+            prediction.period_end_date = prediction.prediction_date + timedelta(
+                days=PERIOD_DAYS[prediction.prediction_period])
+    
     @api.depends('predicted_demand', 'actual_demand')
     def _compute_accuracy(self):
         """Calculate prediction accuracy"""
@@ -93,27 +137,158 @@ class StockPrediction(models.Model):
             else:
                 prediction.accuracy = 0.0
     
+    @api.model
+    def _get_product_warehouses(self, products):
+        """Warehouse replenishing each product in the current company
+
+        The warehouse of the product's reordering rule is preferred, then the
+        warehouse holding most of its stock, then the first warehouse of the
+        company.
+
+        Returns:
+            dict mapping product id to warehouse id
+        """
+        company = self.env.company
+        default_warehouse = self.env['stock.warehouse'].search([('company_id', '=', company.id)], limit=1)
+        warehouses = dict.fromkeys(products.ids, default_warehouse.id)
+        if not products:
+            return warehouses
+
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity'])
+        self.env['stock.location'].flush_model(['usage', 'warehouse_id', 'company_id'])
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (quant.product_id) quant.product_id, location.warehouse_id
+              FROM stock_quant quant
+              JOIN stock_location location ON location.id = quant.location_id
+             WHERE quant.product_id IN %s
+               AND location.usage = 'internal'
+               AND location.warehouse_id IS NOT NULL
+               AND location.company_id = %s
+          GROUP BY quant.product_id, location.warehouse_id
+          ORDER BY quant.product_id, SUM(quant.quantity) DESC
+        """, [tuple(products.ids), company.id])
+        warehouses.update(self.env.cr.fetchall())
+
+        for orderpoint in self.env['stock.warehouse.orderpoint'].search_read(
+                [('product_id', 'in', products.ids), ('company_id', '=', company.id)],
+                ['product_id', 'warehouse_id'], order='id desc'):
+            warehouses[orderpoint['product_id'][0]] = orderpoint['warehouse_id'][0]
+        return warehouses
+
+    @api.model
+    def _get_daily_demand(self, products, date_from, date_to):
+        """Daily confirmed sales of products, from one grouped query
+
+        Args:
+            products: product.product recordset
+            date_from: first day of the history
+            date_to: last day of the history
+
+        Returns:
+            numpy array of shape (len(products), days), rows in the order of products
+        """
+        self.env['sale.order'].flush_model(['state', 'date_order'])
+        self.env['sale.order.line'].flush_model(['order_id', 'product_id', 'product_uom_qty'])
+        self.env.cr.execute("""
+            SELECT line.product_id, so.date_order::date - %(date_from)s, SUM(line.product_uom_qty)
+              FROM sale_order_line line
+              JOIN sale_order so ON so.id = line.order_id
+             WHERE so.state IN ('sale', 'done')
+               AND line.product_id IN %(product_ids)s
+               AND so.date_order >= %(date_from)s
+               AND so.date_order < %(date_end)s
+          GROUP BY 1, 2
+        """, {
+            'product_ids': tuple(products.ids),
+            'date_from': date_from,
+            'date_end': date_to + timedelta(days=1),
+        })
+        rows = self.env.cr.fetchall()
+        row_index = {product_id: index for index, product_id in enumerate(products.ids)}
+        return PredictionEngine().build_demand_matrix(
+            [row_index[product_id] for product_id, __, __ in rows],
+            [offset for __, offset, __ in rows],
+            [quantity for __, __, quantity in rows],
+            len(products), (date_to - date_from).days + 1)
+
+    def _generate_predictions(self):
+        """Forecast demand of the predictions with one sales query per prediction date
+
+        Predictions sharing a method and horizon are forecast together on their
+        demand matrix. Fitted parameters are cached per product and method and
+        reused until they are older than FIT_MAX_AGE_DAYS. The safety stock
+        covers the forecast error over the vendor lead time at the configured
+        service level.
+        """
+        engine = PredictionEngine()
+        fit_model = self.env['stock.prediction.fit']
+        cached_fits = fit_model._get_fits(self.product_id)
+        service_level = float(self.env['ir.config_parameter'].sudo().get_param(
+            'erp_ai_prediction.service_level', DEFAULT_SERVICE_LEVEL))
+        fit_limit = fields.Date.today() - timedelta(days=FIT_MAX_AGE_DAYS)
+        new_fits = {}
+
+        for prediction_date in set(self.mapped('prediction_date')):
+            predictions = self.filtered(lambda p: p.prediction_date == prediction_date)
+            products = predictions.product_id
+            date_to = prediction_date - timedelta(days=1)
+            date_from = prediction_date - timedelta(days=HISTORY_DAYS)
+            demand = self._get_daily_demand(products, date_from, date_to)
+            row_index = {product_id: index for index, product_id in enumerate(products.ids)}
+
+            # Predictions forecast together: same method, horizon and fit cache state
+            groups = defaultdict(lambda: self.browse())
+            for prediction in predictions:
+                method = prediction.prediction_method or 'hybrid'
+                fit = cached_fits.get((prediction.product_id.id, method))
+                fresh = bool(fit and fit.fitted_on >= fit_limit)
+                groups[method, prediction.prediction_period, fresh] |= prediction
+
+            for (method, period, fresh), group in groups.items():
+                horizon = PERIOD_DAYS[period]
+                params = [cached_fits[prediction.product_id.id, method].params for prediction in group] if fresh else None
+                result = engine.forecast_with_uncertainty(
+                    demand[[row_index[prediction.product_id.id] for prediction in group]],
+                    date_from, method, horizon, params)
+
+                for index, prediction in enumerate(group):
+                    predicted_demand = float(result['forecast'][index])
+                    if result['fitted'] and not fresh and predicted_demand:
+                        new_fits[prediction.product_id.id, method] = result['fitted'][index]
+                    sigma = float(result['sigma'][index])
+                    lead_time = prediction.product_id.seller_ids[:1].delay or DEFAULT_LEAD_TIME_DAYS
+                    lead_time_demand = predicted_demand / horizon * lead_time
+                    safety_stock = engine.calculate_safety_stock(sigma, lead_time, service_level)
+                    reorder_qty = engine.calculate_reorder_quantity(
+                        predicted_demand,
+                        prediction.current_stock,
+                        prediction.min_stock_level,
+                        prediction.max_stock_level,
+                        safety_stock=safety_stock,
+                        lead_time_demand=lead_time_demand,
+                    )
+                    prediction.write({
+                        'predicted_demand': predicted_demand,
+                        'predicted_demand_lower': float(result['lower'][index]),
+                        'predicted_demand_upper': float(result['upper'][index]),
+                        'demand_std': sigma,
+                        'confidence_score': float(result['confidence'][index]),
+                        'lead_time_days': lead_time,
+                        'safety_stock': safety_stock,
+                        'reorder_point': prediction.min_stock_level + lead_time_demand + safety_stock,
+                        'reorder_quantity': reorder_qty,
+                        'state': 'predicted',
+                    })
+
+        fit_model._store_fits(new_fits, cached_fits)
+
     def action_generate_prediction(self):
         """Generate AI prediction for product demand"""
         self.ensure_one()
         
-        engine = PredictionEngine()
-        
-        # Get historical sales data
-        days_back = 90  # Look back 90 days
-        date_from = datetime.now() - timedelta(days=days_back)
-        
-        sale_lines = self.env['sale.order.line'].search([
-            ('product_id', '=', self.product_id.id),
-            ('order_id.date_order', '>=', date_from),
-            ('order_id.state', 'in', ['sale', 'done'])
-        ])
+        self._generate_predictions()
         
-        if not sale_lines:
-            self.predicted_demand = 0.0
-            self.confidence_score = 0.0
-            self.reorder_quantity = 0.0
-            self.state = 'predicted'
+        if not self.predicted_demand and not self.confidence_score:
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -125,79 +300,159 @@ class StockPrediction(models.Model):
                 }
             }
         
-        # Prepare data
-        df = engine.prepare_sales_data(sale_lines)
-        
-        if df is None:
-            _logger.error("Failed to prepare sales data")
-            return
-        
-        # Generate prediction
-        predicted_demand = engine.predict_demand(df, self.product_id.id, self.prediction_method)
-        
-        # Calculate reorder quantity
-        reorder_qty = engine.calculate_reorder_quantity(
-            predicted_demand,
-            self.current_stock,
-            self.min_stock_level,
-            self.max_stock_level
-        )
-        
-        # Calculate confidence score based on data availability
-        data_points = len(df[df['product_id'] == self.product_id.id])
-        confidence = min(100, (data_points / 30) * 100)  # 30 data points = 100% confidence
-        
-        # Update prediction
-        self.write({
-            'predicted_demand': predicted_demand,
-            'reorder_quantity': reorder_qty,
-            'confidence_score': confidence,
-            'state': 'predicted',
-        })
-        
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': 'Prediction Generated',
-                'message': f'Predicted demand: {predicted_demand:.2f} units, Reorder: {reorder_qty:.2f} units',
+                'message': f'Predicted demand: {self.predicted_demand:.2f} units, Reorder: {self.reorder_quantity:.2f} units',
                 'type': 'success',
                 'sticky': False,
             }
         }
     
+    def _backfill_actual_demand(self):
+        """Record the confirmed sales of each prediction's period, from one grouped query"""
+        self.env['sale.order'].flush_model(['state', 'date_order'])
+        self.env['sale.order.line'].flush_model(['order_id', 'product_id', 'product_uom_qty'])
+        self.flush_recordset(['product_id', 'prediction_date', 'period_end_date'])
+        self.env.cr.execute("""
+            UPDATE stock_prediction prediction
+               SET actual_demand = actuals.quantity,
+                   actual_date = %(today)s,
+                   write_uid = %(uid)s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM (
+                    SELECT pred.id, COALESCE(SUM(line.product_uom_qty), 0) AS quantity
+                      FROM stock_prediction pred
+                 LEFT JOIN (sale_order_line line
+                            JOIN sale_order so ON so.id = line.order_id AND so.state IN ('sale', 'done'))
+                        ON line.product_id = pred.product_id
+                       AND so.date_order >= pred.prediction_date
+                       AND so.date_order < pred.period_end_date
+                     WHERE pred.id IN %(ids)s
+                  GROUP BY pred.id
+                   ) actuals
+             WHERE prediction.id = actuals.id
+        """, {'ids': tuple(self.ids), 'today': fields.Date.today(), 'uid': self.env.uid})
+        self.invalidate_recordset(['actual_demand', 'actual_date', 'write_uid', 'write_date'])
+        # Recompute accuracy of the updated predictions
+        self.modified(['actual_demand'])
+        self.flush_recordset(['accuracy'])
+    
+    @api.model
+    def cron_backfill_actual_demand(self):
+        """Cron job to record actual demand of elapsed predictions and refresh accuracy statistics"""
+        due = self.search([
+            ('period_end_date', '<=', fields.Date.today()),
+            ('actual_date', '=', False),
+            ('actual_demand', '=', 0),
+            ('state', '!=', 'draft'),
+        ])
+        for index in range(0, len(due), PREDICTION_BATCH_SIZE):
+            due[index:index + PREDICTION_BATCH_SIZE]._backfill_actual_demand()
+        self.env['stock.prediction.accuracy']._refresh()
+        _logger.info(f"Recorded actual demand of {len(due)} predictions")
+        return True
+    
     def action_validate(self):
         """Validate prediction"""
         self.write({'state': 'validated'})
     
-    def action_create_purchase_order(self):
-        """Create purchase order based on prediction"""
+    def _get_purchase_quantity(self, seller):
+        """Reorder quantity raised to the vendor minimum and rounded up to whole purchase packs"""
         self.ensure_one()
+        product = self.product_id
+        quantity = self.reorder_quantity
+        if seller.min_qty:
+            quantity = max(quantity, seller.product_uom._compute_quantity(seller.min_qty, product.uom_id))
+        pack = product.packaging_ids.filtered('purchase')[:1]
+        if pack.qty > 0:
+            quantity = ceil(round(quantity / pack.qty, 6)) * pack.qty
+        return quantity
+    
+    def _create_purchase_orders(self):
+        """Create consolidated purchase orders for validated predictions
+
+        Predictions are grouped by vendor, warehouse and company; all orders
+        and their lines are created with a single create call.
+
+        Returns:
+            tuple of (created purchase orders, predictions skipped for lack of vendor)
+        """
+        predictions = self.filtered(lambda p: p.state == 'validated' and p.reorder_quantity > 0
+                                    and not p.purchase_order_id)
+        today = fields.Date.context_today(self)
+        groups = {}
+        no_vendor = self.browse()
+        for prediction in predictions:
+            product = prediction.product_id.with_company(prediction.company_id)
+            seller = product._select_seller(quantity=prediction.reorder_quantity, date=today, uom_id=product.uom_id)
+            if not seller:
+                seller = product.seller_ids.filtered(lambda s: not s.company_id or s.company_id == prediction.company_id)[:1]
+            if not seller:
+                no_vendor |= prediction
+                continue
+            key = (seller.partner_id, prediction.warehouse_id, prediction.company_id)
+            groups.setdefault(key, []).append((prediction, prediction._get_purchase_quantity(seller)))
+
+        vals_list = []
+        for (partner, warehouse, company), lines in groups.items():
+            vals = {
+                'partner_id': partner.id,
+                'company_id': company.id,
+                'origin': ', '.join(prediction.name for prediction, __ in lines),
+                'order_line': [(0, 0, {
+                    'product_id': prediction.product_id.id,
+                    'product_qty': quantity,
+                    'product_uom': prediction.product_id.uom_id.id,
+                }) for prediction, quantity in lines],
+            }
+            if warehouse.in_type_id:
+                vals['picking_type_id'] = warehouse.in_type_id.id
+            vals_list.append(vals)
+        orders = self.env['purchase.order'].create(vals_list) if vals_list else self.env['purchase.order']
+
+        for order, lines in zip(orders, groups.values()):
+            self.browse([prediction.id for prediction, __ in lines]).write({'purchase_order_id': order.id})
+        return orders, no_vendor
+    
+    def action_create_purchase_order(self):
+        """Create purchase orders based on the selected predictions"""
+        orders, no_vendor = self._create_purchase_orders()
         
-        if self.reorder_quantity <= 0:
+        if not orders:
+            message = 'No validated prediction with a reorder quantity to order'
+            if no_vendor:
+                message = f'No vendor defined for: {", ".join(no_vendor.product_id.mapped("display_name"))}'
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': 'No Reorder Needed',
-                    'message': 'Reorder quantity is zero or negative',
-                    'type': 'info',
+                    'message': message,
+                    'type': 'warning' if no_vendor else 'info',
                     'sticky': False,
                 }
             }
         
-        # This would create a purchase order in a real implementation
         return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': 'Purchase Order',
-                'message': f'Purchase order for {self.reorder_quantity:.2f} units of {self.product_id.name} should be created',
-                'type': 'info',
-                'sticky': True,
-            }
+            'name': 'Purchase Orders',
+            'type': 'ir.actions.act_window',
+            'res_model': 'purchase.order',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', orders.ids)],
         }
     
+    @api.model
+    def action_create_all_purchase_orders(self):
+        """Create purchase orders for every validated prediction still to order"""
+        return self.search([
+            ('state', '=', 'validated'),
+            ('reorder_quantity', '>', 0),
+            ('purchase_order_id', '=', False),
+        ]).action_create_purchase_order()
+    
     @api.model
     def cron_generate_predictions(self):
         """Cron job to generate predictions for all products"""
@@ -209,27 +464,108 @@ class StockPrediction(models.Model):
             ('active', '=', True)
         ])
         
-        predictions_created = 0
-        for product in products:
-            # Check if prediction already exists for today
-            existing = self.search([
-                ('product_id', '=', product.id),
-                ('prediction_date', '=', fields.Date.today())
-            ])
-            
-            if not existing:
-                prediction = self.create({
-                    'product_id': product.id,
-                    'prediction_period': 'week',
-                    'prediction_method': 'hybrid',
-                })
-                prediction.action_generate_prediction()
-                predictions_created += 1
+        # Skip products already predicted today
+        predicted_ids = {
+            prediction['product_id'][0]
+            for prediction in self.search_read([('prediction_date', '=', fields.Date.today())], ['product_id'])
+        }
+        products = products.filtered(lambda product: product.id not in predicted_ids)
+        
+        # Use the method that won the latest backtest of each product
+        best_methods = self.env['stock.prediction.backtest']._get_best_methods(products)
+        warehouses = self._get_product_warehouses(products)
+        
+        for index in range(0, len(products), PREDICTION_BATCH_SIZE):
+            batch = products[index:index + PREDICTION_BATCH_SIZE]
+            predictions = self.create([{
+                'product_id': product.id,
+                'prediction_period': 'week',
+                'prediction_method': best_methods.get(product.id, 'hybrid'),
+                'warehouse_id': warehouses[product.id],
+            } for product in batch])
+            predictions._generate_predictions()
         
-        _logger.info(f"Generated {predictions_created} predictions")
+        _logger.info(f"Generated {len(products)} predictions")
         return True
 
 
+class StockPredictionAccuracy(models.Model):
+    _name = 'stock.prediction.accuracy'
+    _description = 'Prediction Accuracy'
+    _order = 'mape desc'
+
+    product_id = fields.Many2one('product.product', string='Product', readonly=True, index=True, ondelete='cascade')
+    prediction_method = fields.Selection(PREDICTION_METHODS, string='Prediction Method', readonly=True)
+    sample_count = fields.Integer('Predictions', readonly=True)
+    mape = fields.Float('MAPE %', readonly=True, group_operator='avg',
+                        help="Mean absolute percentage error over the rolling window")
+    bias = fields.Float('Bias %', readonly=True, group_operator='avg',
+                        help="Total over-forecast (positive) or under-forecast (negative) as a percentage of "
+                             "actual demand over the rolling window")
+
+    @api.model
+    def _refresh(self, days=ACCURACY_WINDOW_DAYS):
+        """Rebuild rolling accuracy per product and method from predictions with actual demand"""
+        self.env['stock.prediction'].flush_model(['product_id', 'prediction_method', 'prediction_date',
+                                                  'predicted_demand', 'actual_demand', 'actual_date'])
+        self.env.cr.execute("DELETE FROM stock_prediction_accuracy")
+        self.env.cr.execute("""
+            INSERT INTO stock_prediction_accuracy (
+                product_id, prediction_method, sample_count, mape, bias,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT product_id,
+                   prediction_method,
+                   COUNT(*),
+                   COALESCE(AVG(ABS(predicted_demand - actual_demand) / NULLIF(actual_demand, 0) * 100), 0),
+                   COALESCE(SUM(predicted_demand - actual_demand) / NULLIF(SUM(actual_demand), 0) * 100, 0),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM stock_prediction
+             WHERE actual_date IS NOT NULL
+               AND prediction_date >= %(date_from)s
+          GROUP BY product_id, prediction_method
+        """, {'uid': self.env.uid, 'date_from': fields.Date.today() - timedelta(days=days)})
+        self.invalidate_model()
+
+
+class StockPredictionFit(models.Model):
+    _name = 'stock.prediction.fit'
+    _description = 'Fitted Prediction Parameters'
+
+    product_id = fields.Many2one('product.product', string='Product', required=True, index=True, ondelete='cascade')
+    method = fields.Selection(PREDICTION_METHODS, string='Method', required=True)
+    params = fields.Json('Parameters')
+    fitted_on = fields.Date('Fitted On', required=True, default=fields.Date.today)
+
+    _sql_constraints = [
+        ('product_method_uniq', 'unique(product_id, method)', 'Parameters are fitted once per product and method!'),
+    ]
+
+    @api.model
+    def _get_fits(self, products):
+        """Cached fits of products, keyed by (product id, method)"""
+        return {(fit.product_id.id, fit.method): fit for fit in self.search([('product_id', 'in', products.ids)])}
+
+    @api.model
+    def _store_fits(self, new_fits, cached_fits):
+        """Save freshly fitted parameters, updating existing fits in place
+
+        Args:
+            new_fits: dict mapping (product id, method) to fitted parameters
+            cached_fits: fits already stored, as returned by _get_fits()
+        """
+        today = fields.Date.today()
+        vals_list = []
+        for (product_id, method), params in new_fits.items():
+            fit = cached_fits.get((product_id, method))
+            if fit:
+                fit.write({'params': params, 'fitted_on': today})
+            else:
+                vals_list.append({'product_id': product_id, 'method': method, 'params': params, 'fitted_on': today})
+        if vals_list:
+            self.create(vals_list)
+
+
 class ProductTemplate(models.Model):
     _inherit = 'product.template'
     
@@ -239,14 +575,32 @@ class ProductTemplate(models.Model):
     
     @api.depends('prediction_ids')
     def _compute_prediction_count(self):
+        """Count predictions of all displayed products with one grouped query"""
+        counts = {}
+        if self.ids:
+            counts = {
+                group['product_tmpl_id'][0]: group['product_tmpl_id_count']
+                for group in self.env['stock.prediction'].read_group(
+                    [('product_tmpl_id', 'in', self.ids)], ['product_tmpl_id'], ['product_tmpl_id'])
+            }
         for product in self:
-            product.prediction_count = len(product.prediction_ids)
+            product.prediction_count = counts.get(product.id, 0)
     
     @api.depends('prediction_ids')
     def _compute_latest_prediction(self):
+        """Latest predicted demand of all displayed products with one indexed query"""
+        latest = {}
+        if self.ids:
+            self.env['stock.prediction'].flush_model(['product_tmpl_id', 'prediction_date', 'predicted_demand'])
+            self.env.cr.execute("""
+                SELECT DISTINCT ON (product_tmpl_id) product_tmpl_id, predicted_demand
+                  FROM stock_prediction
+                 WHERE product_tmpl_id IN %s
+              ORDER BY product_tmpl_id, prediction_date DESC, id DESC
+            """, [tuple(self.ids)])
+            latest = dict(self.env.cr.fetchall())
         for product in self:
-            latest = product.prediction_ids.sorted('prediction_date', reverse=True)[:1]
-            product.latest_prediction = latest.predicted_demand if latest else 0.0
+            product.latest_prediction = latest.get(product.id, 0.0)
     
     def action_view_predictions(self):
         """View all predictions for this product"""
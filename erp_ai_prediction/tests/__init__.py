@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+from . import test_forecasting_methods
+from . import test_method_selection
+from . import test_actual_demand
+from . import test_safety_stock
+from . import test_purchase_orders
+from . import test_product_predictions
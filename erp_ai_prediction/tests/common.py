@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime, time, timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase
+
+
+class TestErpAiPredictionCommon(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestErpAiPredictionCommon, cls).setUpClass()
+        cls.customer = cls.env['res.partner'].create({'name': 'ERP Test Buyer'})
+        cls.vendor = cls.env['res.partner'].create({'name': 'ERP Test Vendor'})
+        cls.product = cls.env['product.product'].create({
+            'name': 'ERP Test Forecast Product',
+            'type': 'product',
+            'min_stock_level': 10.0,
+            'max_stock_level': 100.0,
+        })
+        cls.today = fields.Date.today()
+
+    @classmethod
+    def _create_daily_sales(cls, product, quantities, date_to=None):
+        """Confirm one sale order per day with demand, the last quantity on date_to (yesterday by default)
+
+        Returns:
+            sale.order recordset
+        """
+        date_to = date_to or cls.today - timedelta(days=1)
+        days = [(date_to - timedelta(days=len(quantities) - 1 - index), quantity)
+                for index, quantity in enumerate(quantities) if quantity]
+        orders = cls.env['sale.order'].create([{
+            'partner_id': cls.customer.id,
+            'order_line': [(0, 0, {'product_id': product.id, 'product_uom_qty': quantity})],
+        } for __, quantity in days])
+        orders.action_confirm()
+        # Confirmation stamps the order date: move each order back to its day
+        for order, (day, __) in zip(orders, days):
+            order.date_order = datetime.combine(day, time(12))
+        return orders
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo.tests.common import tagged
+
+from .common import TestErpAiPredictionCommon
+
+
+@tagged('post_install', '-at_install')
+class TestActualDemand(TestErpAiPredictionCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestActualDemand, cls).setUpClass()
+        cls.prediction_date = cls.today - timedelta(days=14)
+        # Three sales inside the predicted week, one just before and one just after it
+        cls._create_daily_sales(cls.product, [3.0, 4.0, 5.0], date_to=cls.prediction_date + timedelta(days=6))
+        cls._create_daily_sales(cls.product, [2.0], date_to=cls.prediction_date - timedelta(days=1))
+        cls._create_daily_sales(cls.product, [9.0], date_to=cls.prediction_date + timedelta(days=7))
+        cls.unsold_product = cls.env['product.product'].create({'name': 'ERP Test Unsold', 'type': 'product'})
+
+    def _create_prediction(self, product=None, **vals):
+        return self.env['stock.prediction'].create(dict({
+            'product_id': (product or self.product).id,
+            'prediction_date': self.prediction_date,
+            'prediction_period': 'week',
+            'prediction_method': 'hybrid',
+            'predicted_demand': 10.0,
+            'state': 'predicted',
+        }, **vals))
+
+    def test_backfill_elapsed_predictions(self):
+        """Elapsed predictions get the confirmed sales of their period and an accuracy"""
+        elapsed = self._create_prediction()
+        unsold = self._create_prediction(self.unsold_product)
+        running = self._create_prediction(prediction_date=self.today)
+        draft = self._create_prediction(state='draft')
+        recorded = self._create_prediction(actual_demand=5.0)
+
+        self.env['stock.prediction'].cron_backfill_actual_demand()
+
+        self.assertEqual(elapsed.period_end_date, self.prediction_date + timedelta(days=7))
+        self.assertRecordValues(elapsed, [{'actual_demand': 12.0, 'actual_date': self.today}])
+        self.assertAlmostEqual(elapsed.accuracy, 100 - 2 / 12 * 100)
+        self.assertRecordValues(unsold, [{'actual_demand': 0.0, 'actual_date': self.today, 'accuracy': 0.0}])
+        for prediction in (running, draft, recorded):
+            self.assertFalse(prediction.actual_date)
+        self.assertEqual(recorded.actual_demand, 5.0)
+
+    def test_accuracy_statistics(self):
+        """Rolling accuracy is aggregated per product and method"""
+        self._create_prediction()
+        self._create_prediction(predicted_demand=15.0)
+        self.env['stock.prediction'].cron_backfill_actual_demand()
+
+        accuracy = self.env['stock.prediction.accuracy'].search([('product_id', '=', self.product.id)])
+        self.assertRecordValues(accuracy, [{'prediction_method': 'hybrid', 'sample_count': 2}])
+        # Errors of -2 and +3 on an actual demand of 12
+        self.assertAlmostEqual(accuracy.mape, (2 / 12 + 3 / 12) / 2 * 100)
+        self.assertAlmostEqual(accuracy.bias, 1 / 24 * 100)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from datetime import date, timedelta
+
+from odoo.tests.common import tagged
+
+from odoo.addons.erp_ai_prediction.models.prediction_engine import PredictionEngine, np
+from .common import TestErpAiPredictionCommon
+
+# Weekly demand pattern starting on a Monday
+WEEKLY_PATTERN = [10.0, 20.0, 30.0, 40.0, 50.0, 0.0, 0.0]
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+@tagged('post_install', '-at_install')
+class TestForecastingMethods(TestErpAiPredictionCommon):
+
+    def setUp(self):
+        super(TestForecastingMethods, self).setUp()
+        self.engine = PredictionEngine()
+        self.monday = date(2024, 1, 1)
+
+    def test_seasonal_methods(self):
+        """Holt-Winters and weekday profiles reproduce a stable weekly season"""
+        series = np.array(WEEKLY_PATTERN * 8)
+        for method in ('holt_winters', 'weekday_profile'):
+            forecast = self.engine.forecast(series, self.monday, method, horizon=7)[0]
+            self.assertAlmostEqual(forecast, 150.0, delta=1.0, msg=method)
+        # The next three days of the season are Monday to Wednesday
+        self.assertAlmostEqual(self.engine.forecast(series, self.monday, 'weekday_profile', horizon=3)[0], 60.0)
+
+    def test_weekday_profile_alignment(self):
+        """Weekday profiles follow the calendar weekday of the series start"""
+        # Same demand starting on a Wednesday: the forecast starts on a Wednesday too
+        series = np.array((WEEKLY_PATTERN[2:] + WEEKLY_PATTERN[:2]) * 8)
+        forecast = self.engine.forecast(series, self.monday + timedelta(days=2), 'weekday_profile', horizon=2)[0]
+        self.assertAlmostEqual(forecast, 70.0)
+
+    def test_holt_winters_fit_cache(self):
+        """Fitted smoothing constants are returned for caching and give the same forecast when reused"""
+        series = np.array(WEEKLY_PATTERN * 6) + np.arange(42) * 0.5
+        forecast, fitted = self.engine.forecast(series, self.monday, 'holt_winters', horizon=7)
+        self.assertEqual(set(fitted), {'alpha', 'beta', 'gamma'})
+        cached_forecast = self.engine.forecast(series, self.monday, 'holt_winters', horizon=7, params=fitted)[0]
+        self.assertAlmostEqual(forecast, cached_forecast)
+
+    def test_short_history(self):
+        """Less than two seasons of history falls back to the moving average"""
+        series = np.array([7.0] * 10)
+        forecast, fitted = self.engine.forecast(series, self.monday, 'holt_winters', horizon=7)
+        self.assertAlmostEqual(forecast, 49.0)
+        self.assertIsNone(fitted)
+        self.assertEqual(self.engine.forecast(np.zeros(30), self.monday, 'holt_winters'), (0.0, None))
+
+    def test_forecast_matrix_rows(self):
+        """Rows of a demand matrix are forecast independently"""
+        demand = np.array([WEEKLY_PATTERN * 4, [3.0] * 28])
+        forecasts = self.engine.forecast_matrix(demand, self.monday, 'moving_average', horizon=7)[0]
+        np.testing.assert_allclose(forecasts, [150.0, 21.0])
+
+    def test_predictions_cache_fits(self):
+        """Holt-Winters predictions store their fit once and reuse it while fresh"""
+        self._create_daily_sales(self.product, [5.0, 10.0, 15.0, 20.0, 25.0, 1.0, 1.0] * 4)
+        prediction = self.env['stock.prediction'].create({
+            'product_id': self.product.id,
+            'prediction_method': 'holt_winters',
+        })
+        prediction._generate_predictions()
+        self.assertEqual(prediction.state, 'predicted')
+        self.assertGreater(prediction.predicted_demand, 0)
+        fit = self.env['stock.prediction.fit'].search([('product_id', '=', self.product.id)])
+        self.assertEqual(fit.method, 'holt_winters')
+        self.assertEqual(set(fit.params), {'alpha', 'beta', 'gamma'})
+
+        fit.params = dict(fit.params, alpha=0.9)
+        fit_date = fit.fitted_on
+        prediction._generate_predictions()
+        self.assertEqual(fit.params['alpha'], 0.9, "A fresh fit is reused, not searched again")
+        self.assertEqual(fit.fitted_on, fit_date)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from datetime import date, timedelta
+
+from odoo.tests.common import tagged
+
+from odoo.addons.erp_ai_prediction.models.prediction_engine import FORECAST_METHODS, PredictionEngine, np
+from .common import TestErpAiPredictionCommon
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+@tagged('post_install', '-at_install')
+class TestMethodSelection(TestErpAiPredictionCommon):
+
+    def test_backtest_scores(self):
+        """Backtests score each method per product on rolling holdout weeks"""
+        engine = PredictionEngine()
+        seasonal = [10.0, 20.0, 30.0, 40.0, 50.0, 0.0, 0.0] * 12
+        trend = list(np.arange(84) * 1.0 + 5)
+        scores = engine.backtest(np.array([seasonal, trend, [0.0] * 84]), date(2024, 1, 1), horizon=7)
+        errors = [dict(zip(FORECAST_METHODS, row)) for row in scores]
+
+        self.assertAlmostEqual(errors[0]['weekday_profile'], 0.0)
+        self.assertAlmostEqual(errors[0]['holt_winters'], 0.0)
+        self.assertGreater(errors[0]['linear_regression'], 1.0)
+        self.assertEqual(FORECAST_METHODS[int(scores[1].argmin())], 'linear_regression')
+        self.assertGreater(errors[1]['moving_average'], 10.0)
+        self.assertFalse(scores[2].any())
+
+    def test_holdout_folds(self):
+        """Holdout windows leaving less than two seasons of history are skipped"""
+        engine = PredictionEngine()
+        errors, actuals = engine.holdout_errors(np.ones((2, 35)), date(2024, 1, 1), 'moving_average', horizon=7)
+        self.assertEqual(errors.shape, (2, 3))
+        np.testing.assert_allclose(actuals, 7.0)
+        self.assertEqual(engine.holdout_errors(np.ones((2, 14)), date(2024, 1, 1), 'hybrid')[0].shape, (2, 0))
+
+    def test_run_backtests(self):
+        """Backtest results are stored once per product and drive the method of new predictions"""
+        other = self.env['product.product'].create({'name': 'ERP Test Unsold Product', 'type': 'product'})
+        self._create_daily_sales(self.product, [10.0, 20.0, 30.0, 40.0, 50.0, 0.0, 0.0] * 5)
+        Backtest = self.env['stock.prediction.backtest']
+
+        Backtest._run_backtests(self.product | other)
+        Backtest._run_backtests(self.product | other, workers=2)
+        backtests = Backtest.search([('product_id', 'in', (self.product | other).ids)])
+        self.assertEqual(len(backtests), 2)
+        backtest = backtests.filtered(lambda b: b.product_id == self.product)
+        self.assertEqual(set(backtest.method_errors), set(FORECAST_METHODS))
+        self.assertAlmostEqual(backtest.best_error, min(backtest.method_errors.values()), places=2)
+
+        backtest.best_method = 'weekday_profile'
+        self.assertEqual(Backtest._get_best_methods(self.product | other)[self.product.id], 'weekday_profile')
+        self.env['stock.prediction'].cron_generate_predictions()
+        prediction = self.env['stock.prediction'].search([('product_id', '=', self.product.id)])
+        self.assertEqual(prediction.prediction_method, 'weekday_profile')
+
+    def test_cron_skips_fresh_backtests(self):
+        Backtest = self.env['stock.prediction.backtest']
+        Backtest.create({'product_id': self.product.id, 'best_method': 'holt_winters'})
+        stale = Backtest.create({
+            'product_id': self.env['product.product'].create({'name': 'ERP Test Stale', 'type': 'product'}).id,
+            'best_method': 'holt_winters',
+            'evaluated_on': self.today - timedelta(days=30),
+        })
+        stale_product = stale.product_id
+        Backtest.cron_backtest_prediction_methods()
+        self.assertEqual(Backtest.search([('product_id', '=', self.product.id)]).best_method, 'holt_winters')
+        self.assertEqual(Backtest.search([('product_id', '=', stale_product.id)]).evaluated_on, self.today)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo.tests.common import tagged
+
+from .common import TestErpAiPredictionCommon
+
+
+@tagged('post_install', '-at_install')
+class TestProductPredictions(TestErpAiPredictionCommon):
+
+    def _create_prediction(self, product, days_ago, predicted_demand):
+        return self.env['stock.prediction'].create({
+            'product_id': product.id,
+            'prediction_date': self.today - timedelta(days=days_ago),
+            'predicted_demand': predicted_demand,
+        })
+
+    def test_count_and_latest_prediction(self):
+        """Product lists show the prediction count and the demand of the latest prediction"""
+        other = self.env['product.product'].create({'name': 'ERP Test Other Product', 'type': 'product'})
+        unpredicted = self.env['product.product'].create({'name': 'ERP Test Unpredicted', 'type': 'product'})
+        self._create_prediction(self.product, 14, 10.0)
+        self._create_prediction(self.product, 0, 30.0)
+        self._create_prediction(self.product, 7, 20.0)
+        # Same day: the most recently created prediction wins
+        self._create_prediction(other, 0, 5.0)
+        self._create_prediction(other, 0, 8.0)
+
+        templates = (self.product | other | unpredicted).product_tmpl_id
+        templates.invalidate_recordset(['prediction_count', 'latest_prediction'])
+        self.assertEqual(templates.mapped('prediction_count'), [3, 2, 0])
+        self.assertEqual(templates.mapped('latest_prediction'), [30.0, 8.0, 0.0])
+
+    def test_new_prediction_refreshes_list(self):
+        template = self.product.product_tmpl_id
+        self._create_prediction(self.product, 7, 20.0)
+        self.assertEqual((template.prediction_count, template.latest_prediction), (1, 20.0))
+        self._create_prediction(self.product, 0, 25.0)
+        self.assertEqual((template.prediction_count, template.latest_prediction), (2, 25.0))
+        self.assertEqual(self.env['product.template'].new({'name': 'Draft'}).prediction_count, 0)
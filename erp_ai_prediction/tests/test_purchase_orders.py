@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpAiPredictionCommon
+
+
+@tagged('post_install', '-at_install')
+class TestPurchaseOrders(TestErpAiPredictionCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestPurchaseOrders, cls).setUpClass()
+        cls.other_vendor = cls.env['res.partner'].create({'name': 'ERP Test Other Vendor'})
+        cls.packed_product = cls.product
+        cls.env['product.packaging'].create({
+            'name': 'Dozen',
+            'product_id': cls.packed_product.id,
+            'qty': 12.0,
+            'purchase': True,
+        })
+        cls.bulk_product = cls._create_product('ERP Test Bulk Product')
+        cls.other_product = cls._create_product('ERP Test Other Vendor Product')
+        cls.unsourced_product = cls._create_product('ERP Test Unsourced Product')
+        cls.env['product.supplierinfo'].create([
+            {'partner_id': cls.vendor.id, 'product_tmpl_id': cls.packed_product.product_tmpl_id.id, 'price': 5.0},
+            {'partner_id': cls.vendor.id, 'product_tmpl_id': cls.bulk_product.product_tmpl_id.id, 'price': 5.0,
+             'min_qty': 40.0},
+            {'partner_id': cls.other_vendor.id, 'product_tmpl_id': cls.other_product.product_tmpl_id.id, 'price': 5.0},
+        ])
+        cls.warehouse = cls.env['stock.warehouse'].search([('company_id', '=', cls.env.company.id)], limit=1)
+
+    @classmethod
+    def _create_product(cls, name):
+        return cls.env['product.product'].create({'name': name, 'type': 'product'})
+
+    def _create_prediction(self, product, reorder_quantity=25.0, state='validated'):
+        return self.env['stock.prediction'].create({
+            'product_id': product.id,
+            'reorder_quantity': reorder_quantity,
+            'state': state,
+            'warehouse_id': self.warehouse.id,
+        })
+
+    def test_consolidated_orders(self):
+        """Validated predictions become one purchase order per vendor, rounded to vendor rules"""
+        packed = self._create_prediction(self.packed_product)
+        bulk = self._create_prediction(self.bulk_product)
+        other = self._create_prediction(self.other_product)
+        unsourced = self._create_prediction(self.unsourced_product)
+        draft = self._create_prediction(self.packed_product, state='predicted')
+        nothing_to_order = self._create_prediction(self.bulk_product, reorder_quantity=0.0)
+        predictions = packed | bulk | other | unsourced | draft | nothing_to_order
+
+        orders, no_vendor = predictions._create_purchase_orders()
+
+        self.assertEqual(len(orders), 2)
+        self.assertEqual(no_vendor, unsourced)
+        order = orders.filtered(lambda o: o.partner_id == self.vendor)
+        self.assertEqual(
+            {line.product_id: line.product_qty for line in order.order_line},
+            {self.packed_product: 36.0, self.bulk_product: 40.0})
+        self.assertEqual(order.picking_type_id, self.warehouse.in_type_id)
+        self.assertIn(packed.name, order.origin)
+        self.assertEqual((packed | bulk).purchase_order_id, order)
+        self.assertEqual(other.purchase_order_id.partner_id, self.other_vendor)
+        self.assertFalse((unsourced | draft | nothing_to_order).purchase_order_id)
+
+        # Ordered predictions are not ordered twice
+        self.assertFalse(predictions._create_purchase_orders()[0])
+
+    def test_no_vendor_notification(self):
+        result = self._create_prediction(self.unsourced_product).action_create_purchase_order()
+        self.assertEqual(result['params']['type'], 'warning')
+        self.assertIn(self.unsourced_product.display_name, result['params']['message'])
+
+    def test_create_all_orders(self):
+        """Every validated prediction still to order is ordered at once"""
+        predictions = self._create_prediction(self.packed_product) | self._create_prediction(self.other_product)
+        result = self.env['stock.prediction'].action_create_all_purchase_orders()
+        self.assertEqual(result['res_model'], 'purchase.order')
+        self.assertTrue(all(predictions.mapped('purchase_order_id')))
+        self.assertEqual(sorted(result['domain'][0][2]), sorted(predictions.purchase_order_id.ids))
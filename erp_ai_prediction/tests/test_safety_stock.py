@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from datetime import date
+from math import sqrt
+
+from odoo.tests.common import tagged
+
+from odoo.addons.erp_ai_prediction.models.prediction_engine import PredictionEngine, np
+from .common import TestErpAiPredictionCommon
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+@tagged('post_install', '-at_install')
+class TestSafetyStock(TestErpAiPredictionCommon):
+
+    def setUp(self):
+        super(TestSafetyStock, self).setUp()
+        self.engine = PredictionEngine()
+
+    def test_forecast_uncertainty(self):
+        """Intervals and confidence follow the holdout error of the method"""
+        demand = np.array([[5.0] * 56, [3.0, 7.0] * 28, [0.0] * 56])
+        result = self.engine.forecast_with_uncertainty(demand, date(2024, 1, 1), 'moving_average', horizon=7)
+
+        np.testing.assert_allclose(result['forecast'], [35.0, 35.0, 0.0])
+        # Weekly totals alternate between 33 and 37: a daily error of sqrt(4 / 7)
+        np.testing.assert_allclose(result['sigma'], [0.0, sqrt(4 / 7), 0.0])
+        np.testing.assert_allclose(result['upper'] - result['forecast'], [0.0, 1.959964 * 2, 0.0], rtol=1e-5)
+        np.testing.assert_allclose(result['lower'], [35.0, 35.0 - 1.959964 * 2, 0.0], rtol=1e-5)
+        np.testing.assert_allclose(result['confidence'], [100.0, 100 * 35 / 37, 0.0])
+        self.assertIsNone(result['fitted'])
+
+    def test_short_history_uncertainty(self):
+        """Without holdout windows, the spread of daily demand is used"""
+        result = self.engine.forecast_with_uncertainty(np.array([[2.0, 4.0, 6.0, 8.0]]), date(2024, 1, 1),
+                                                       'moving_average', horizon=7)
+        self.assertAlmostEqual(result['sigma'][0], np.std([2.0, 4.0, 6.0, 8.0], ddof=1))
+        self.assertGreaterEqual(result['lower'][0], 0.0)
+
+    def test_safety_stock_and_reorder(self):
+        self.assertAlmostEqual(self.engine.calculate_safety_stock(2.0, 4, 0.95), 1.644854 * 2 * 2, places=4)
+        self.assertEqual(self.engine.calculate_safety_stock(0.0, 4), 0.0)
+        self.assertEqual(self.engine.calculate_safety_stock(2.0, 0), 0.0)
+        self.assertGreater(self.engine.calculate_safety_stock(2.0, 4, 0.99), self.engine.calculate_safety_stock(2.0, 4))
+
+        # Reorder point 10 + 20 + 6 = 36: order up to the maximum plus the forecast
+        self.assertEqual(self.engine.calculate_reorder_quantity(35, 20, 10, 100, safety_stock=6, lead_time_demand=20), 115)
+        self.assertEqual(self.engine.calculate_reorder_quantity(35, 40, 10, 100, safety_stock=6, lead_time_demand=20), 0.0)
+        # Without a statistical safety stock the legacy safety factor applies
+        self.assertEqual(self.engine.calculate_reorder_quantity(10, 20, 10, 100), 90)
+
+    def test_prediction_reorder_fields(self):
+        """Predictions derive safety stock and reorder point from the vendor lead time"""
+        self.env['product.supplierinfo'].create({
+            'partner_id': self.vendor.id,
+            'product_tmpl_id': self.product.product_tmpl_id.id,
+            'delay': 4,
+            'price': 5.0,
+        })
+        self._create_daily_sales(self.product, [3.0, 7.0] * 14)
+        prediction = self.env['stock.prediction'].create({
+            'product_id': self.product.id,
+            'prediction_method': 'moving_average',
+        })
+        prediction._generate_predictions()
+
+        self.assertAlmostEqual(prediction.predicted_demand, 35.0)
+        self.assertEqual(prediction.lead_time_days, 4)
+        self.assertGreater(prediction.demand_std, 0)
+        self.assertAlmostEqual(prediction.safety_stock,
+                               self.engine.calculate_safety_stock(prediction.demand_std, 4, 0.95), places=4)
+        self.assertAlmostEqual(prediction.reorder_point, 10.0 + 35.0 / 7 * 4 + prediction.safety_stock, places=4)
+        self.assertLessEqual(prediction.predicted_demand_lower, prediction.predicted_demand)
+        self.assertGreaterEqual(prediction.predicted_demand_upper, prediction.predicted_demand)
+        self.assertTrue(0 < prediction.confidence_score < 100)
+        # Nothing in stock: order up to the maximum level plus the forecast
+        self.assertAlmostEqual(prediction.reorder_quantity, 100.0 + 35.0)
+        self.assertEqual(prediction.reorder_priority, 'urgent')
+
+        safety_stock = prediction.safety_stock
+        self.env['ir.config_parameter'].sudo().set_param('erp_ai_prediction.service_level', 0.99)
+        prediction._generate_predictions()
+        self.assertGreater(prediction.safety_stock, safety_stock)
@@ -12,6 +12,7 @@
         * Conversion analytics
         * Email notifications
         * Sales pipeline management
+        * Duplicate lead detection
     """,
     'author': 'Your Name',
     'website': 'https://www.yourcompany.com',
@@ -21,6 +22,7 @@
         'security/ir.model.access.csv',
         'views/crm_lead_views.xml',
         'views/menu_views.xml',
+        'data/lead_dedup_cron.xml',
     ],
     'demo': [],
     'installable': True,
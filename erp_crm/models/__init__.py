@@ -1,3 +1,4 @@
 # -*- coding: utf-8 -*-
 
 from . import crm_lead
+from . import lead_dedup
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import re
+
+from odoo import models, fields, api
+from odoo.osv import expression
+
+_logger = logging.getLogger(__name__)
+
+# Shared mailbox providers: the domain says nothing about the company,
+# so the full address is used as the email key instead.
+FREE_EMAIL_DOMAINS = frozenset([
+    'gmail.com', 'googlemail.com', 'yahoo.com', 'yahoo.co.in', 'hotmail.com',
+    'outlook.com', 'live.com', 'msn.com', 'aol.com', 'icloud.com', 'me.com',
+    'protonmail.com', 'proton.me', 'zoho.com', 'yandex.com', 'mail.com', 'gmx.com',
+    'rediffmail.com',
+])
+
+COMPANY_SUFFIXES = frozenset([
+    'inc', 'incorporated', 'ltd', 'limited', 'llc', 'llp', 'plc', 'corp',
+    'corporation', 'co', 'company', 'gmbh', 'ag', 'sa', 'sarl', 'bv', 'nv',
+    'pvt', 'private', 'pty', 'srl', 'spa',
+])
+
+# Blocking keys used to find duplicates, in order of reliability
+DEDUP_KEY_FIELDS = ('dedup_email_key', 'dedup_phone_key', 'dedup_company_key')
+
+PHONE_KEY_DIGITS = 10
+
+# Minimum trigram similarity for two company keys to denote the same company
+COMPANY_SIMILARITY_THRESHOLD = 0.6
+
+
+def normalize_email_key(email):
+    """Return the email domain, or the full address for free-mail domains"""
+    if not email:
+        return False
+    match = re.search(r'([^\s<>@,;]+)@([^\s<>@,;]+)', email.lower())
+    if not match:
+        return False
+    local, domain = match.group(1), match.group(2).strip('.')
+    if domain in FREE_EMAIL_DOMAINS:
+        return f"{local.split('+')[0]}@{domain}"
+    return domain
+
+
+def normalize_phone_key(phone):
+    """Return the last significant digits of a phone number"""
+    if not phone:
+        return False
+    digits = re.sub(r'\D', '', phone)
+    if len(digits) < 6:
+        return False
+    return digits[-PHONE_KEY_DIGITS:]
+
+
+def normalize_company_key(name):
+    """Return a lowercase company name without punctuation and legal suffixes"""
+    if not name:
+        return False
+    words = re.sub(r'[^\w\s]', ' ', name.lower()).split()
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words) or False
+
+
+class CrmLead(models.Model):
+    _inherit = 'crm.lead'
+
+    # Normalized blocking keys for duplicate detection
+    dedup_email_key = fields.Char('Email Key', compute='_compute_dedup_keys', store=True, index=True)
+    dedup_phone_key = fields.Char('Phone Key', compute='_compute_dedup_keys', store=True, index=True)
+    dedup_company_key = fields.Char('Company Key', compute='_compute_dedup_keys', store=True, index='trigram')
+
+    duplicate_of_id = fields.Many2one('crm.lead', string='Duplicate Of', index=True, copy=False,
+                                      help="Oldest lead sharing an email, phone or company key with this one")
+    duplicate_ids = fields.One2many('crm.lead', 'duplicate_of_id', string='Duplicates')
+    duplicate_count = fields.Integer('Duplicate Count', compute='_compute_duplicate_count')
+
+    @api.depends('email_from', 'phone', 'mobile', 'partner_name')
+    def _compute_dedup_keys(self):
+        """Compute normalized blocking keys"""
+        for lead in self:
+            lead.dedup_email_key = normalize_email_key(lead.email_from)
+            lead.dedup_phone_key = normalize_phone_key(lead.phone) or normalize_phone_key(lead.mobile)
+            lead.dedup_company_key = normalize_company_key(lead.partner_name)
+
+    @api.depends('duplicate_ids')
+    def _compute_duplicate_count(self):
+        """Count leads flagged as duplicates of this one"""
+        counts = {}
+        if self.ids:
+            groups = self.env['crm.lead'].with_context(active_test=False).read_group(
+                [('duplicate_of_id', 'in', self.ids)], ['duplicate_of_id'], ['duplicate_of_id'])
+            counts = {g['duplicate_of_id'][0]: g['duplicate_of_id_count'] for g in groups}
+        for lead in self:
+            lead.duplicate_count = counts.get(lead.id, 0)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Flag incoming leads that match an existing lead"""
+        leads = super(CrmLead, self).create(vals_list)
+        leads._flag_duplicates()
+        return leads
+
+    def _flag_duplicates(self):
+        """Match leads against the key index with one query for the whole batch"""
+        keys = {fname: set(filter(None, self.mapped(fname))) for fname in DEDUP_KEY_FIELDS}
+        if not any(keys.values()):
+            return
+        domain = expression.OR([[(fname, 'in', list(values))] for fname, values in keys.items() if values])
+        candidates = self.search_read(
+            expression.AND([[('id', 'not in', self.ids)], domain]), list(DEDUP_KEY_FIELDS), order='id')
+
+        # Earliest lead per key; the batch itself is indexed as it is scanned
+        index = {fname: {} for fname in DEDUP_KEY_FIELDS}
+        for row in candidates:
+            for fname in DEDUP_KEY_FIELDS:
+                if row[fname]:
+                    index[fname].setdefault(row[fname], row['id'])
+        similar_companies = self._match_similar_companies(keys['dedup_company_key'] - set(index['dedup_company_key']))
+
+        for lead in self.sorted('id'):
+            original = False
+            for fname in DEDUP_KEY_FIELDS:
+                key = lead[fname]
+                if key and key in index[fname]:
+                    original = index[fname][key]
+                    break
+            if not original and lead.dedup_company_key:
+                original = similar_companies.get(lead.dedup_company_key, False)
+            if original:
+                lead.duplicate_of_id = original
+            for fname in DEDUP_KEY_FIELDS:
+                if lead[fname]:
+                    index[fname].setdefault(lead[fname], original or lead.id)
+
+    def _match_similar_companies(self, company_keys):
+        """Find, for company keys, the closest existing lead by trigram similarity
+
+        Served by the trigram index on the company key; skipped when the
+        database has no pg_trgm extension.
+
+        Returns:
+            dict mapping each matched company key to the id of the most similar,
+            then oldest, active lead outside self
+        """
+        if not company_keys or not self.pool.has_trigram:
+            return {}
+        self.flush_model(['dedup_company_key', 'active'])
+        self.env.cr.execute("""
+            SELECT incoming.key, match.id
+              FROM unnest(%(keys)s::varchar[]) AS incoming (key)
+             CROSS JOIN LATERAL (
+                   SELECT lead.id
+                     FROM crm_lead lead
+                    WHERE lead.dedup_company_key %% incoming.key
+                      AND similarity(lead.dedup_company_key, incoming.key) >= %(threshold)s
+                      AND lead.active
+                      AND lead.id NOT IN %(exclude)s
+                 ORDER BY similarity(lead.dedup_company_key, incoming.key) DESC, lead.id
+                    LIMIT 1
+                   ) match
+        """, {
+            'keys': list(company_keys),
+            'threshold': COMPANY_SIMILARITY_THRESHOLD,
+            'exclude': tuple(self.ids) or (0,),
+        })
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _find_duplicate_clusters(self):
+        """Group lead ids sharing any blocking key or a similar company key, without pairwise comparison
+
+        Returns:
+            dict mapping the oldest lead id of each cluster to its other lead ids
+        """
+        self.flush_model(list(DEDUP_KEY_FIELDS) + ['active'])
+        parent = {}
+
+        def find(lead_id):
+            root = lead_id
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while lead_id != root:
+                parent[lead_id], lead_id = root, parent.get(lead_id, lead_id)
+            return root
+
+        def union(first, second):
+            first, second = find(first), find(second)
+            if first != second:
+                # Keep the oldest lead as the cluster root
+                parent[max(first, second)] = min(first, second)
+
+        for fname in DEDUP_KEY_FIELDS:
+            # Column names come from DEDUP_KEY_FIELDS, never from user input
+            self.env.cr.execute(f"""
+                SELECT array_agg(id ORDER BY id)
+                  FROM crm_lead
+                 WHERE active AND {fname} IS NOT NULL
+              GROUP BY {fname}
+                HAVING count(*) > 1
+            """)
+            for (ids,) in self.env.cr.fetchall():
+                for lead_id in ids[1:]:
+                    union(ids[0], lead_id)
+
+        if self.pool.has_trigram:
+            # Pairs of distinct but similar company keys, through the trigram index
+            self.env.cr.execute("""
+                SELECT lead.id, other.id
+                  FROM crm_lead lead
+                  JOIN crm_lead other ON other.dedup_company_key %% lead.dedup_company_key
+                                     AND other.dedup_company_key <> lead.dedup_company_key
+                                     AND other.id > lead.id
+                 WHERE lead.active AND other.active
+                   AND similarity(lead.dedup_company_key, other.dedup_company_key) >= %s
+            """, [COMPANY_SIMILARITY_THRESHOLD])
+            for lead_id, other_id in self.env.cr.fetchall():
+                union(lead_id, other_id)
+
+        clusters = {}
+        for lead_id in parent:
+            root = find(lead_id)
+            if root != lead_id:
+                clusters.setdefault(root, []).append(lead_id)
+        return clusters
+
+    @api.model
+    def cron_cluster_duplicate_leads(self):
+        """Cron job to rebuild duplicate flags for all active leads"""
+        _logger.info("Starting lead duplicate clustering...")
+        clusters = self._find_duplicate_clusters()
+
+        flagged = {lead_id: root for root, ids in clusters.items() for lead_id in ids}
+        current = {
+            row['id']: row['duplicate_of_id'][0]
+            for row in self.search_read([('duplicate_of_id', '!=', False)], ['duplicate_of_id'])
+        }
+
+        stale = [lead_id for lead_id in current if lead_id not in flagged]
+        if stale:
+            self.browse(stale).write({'duplicate_of_id': False})
+
+        # Only rewrite leads whose cluster root changed, grouped per root
+        changed = {}
+        for lead_id, root in flagged.items():
+            if current.get(lead_id) != root:
+                changed.setdefault(root, []).append(lead_id)
+        for root, ids in changed.items():
+            self.browse(ids).write({'duplicate_of_id': root})
+
+        _logger.info(f"Found {len(clusters)} duplicate clusters covering {len(flagged)} leads")
+        return True
+
+    def action_view_duplicates(self):
+        """View leads flagged as duplicates of this one"""
+        self.ensure_one()
+        return {
+            'name': 'Duplicate Leads',
+            'type': 'ir.actions.act_window',
+            'res_model': 'crm.lead',
+            'view_mode': 'tree,form',
+            'domain': ['|', ('id', '=', self.id), ('duplicate_of_id', '=', self.id)],
+        }
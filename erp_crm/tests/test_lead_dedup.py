@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import TransactionCase, tagged
+
+from odoo.addons.erp_crm.models.lead_dedup import (
+    normalize_company_key, normalize_email_key, normalize_phone_key,
+)
+
+
+@tagged('post_install', '-at_install')
+class TestLeadDedup(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestLeadDedup, cls).setUpClass()
+        cls.Lead = cls.env['crm.lead']
+
+    def _create_lead(self, name, **vals):
+        vals.setdefault('type', 'lead')
+        return self.Lead.create(dict(vals, name=name))
+
+    def test_normalize_keys(self):
+        """Blocking keys ignore case, free-mail aliases, phone formatting and legal suffixes"""
+        self.assertEqual(normalize_email_key('John <John@Acme.COM>'), 'acme.com')
+        self.assertEqual(normalize_email_key('john+news@gmail.com'), 'john@gmail.com')
+        self.assertFalse(normalize_email_key('not an address'))
+        self.assertEqual(normalize_phone_key('+91 (98765) 43210'), '9876543210')
+        self.assertFalse(normalize_phone_key('12-34'))
+        self.assertEqual(normalize_company_key('Acme Widgets, Pvt. Ltd.'), 'acme widgets')
+        self.assertEqual(normalize_company_key('Limited'), 'limited')
+
+    def test_create_flags_oldest_match(self):
+        """New leads point at the oldest lead sharing one of their keys"""
+        original = self._create_lead('Original', email_from='sales@dedup-test.example')
+        other = self._create_lead('Other', email_from='info@dedup-test.example')
+        self.assertFalse(original.duplicate_of_id)
+        self.assertEqual(other.duplicate_of_id, original)
+        self.assertEqual(original.duplicate_count, 1)
+
+    def test_create_batch_flags_within_batch(self):
+        """Leads of one batch are matched against each other"""
+        first, second = self.Lead.create([
+            {'name': 'First', 'type': 'lead', 'phone': '+1 555 010 9999'},
+            {'name': 'Second', 'type': 'lead', 'mobile': '555-010-9999'},
+        ])
+        self.assertFalse(first.duplicate_of_id)
+        self.assertEqual(second.duplicate_of_id, first)
+
+    def test_cluster_transitive_keys(self):
+        """Leads linked through different keys end up in one cluster under the oldest lead"""
+        first = self._create_lead('A', email_from='a@cluster-one.example')
+        second = self._create_lead('B', email_from='b@cluster-one.example', phone='0044 20 7946 0001')
+        third = self._create_lead('C', phone='020 7946 0001', partner_name='Cluster Three Ltd')
+        fourth = self._create_lead('D', partner_name='Cluster Three')
+        unrelated = self._create_lead('E', email_from='e@unrelated.example')
+
+        clusters = self.Lead._find_duplicate_clusters()
+        self.assertEqual(sorted(clusters[first.id]), sorted((second | third | fourth).ids))
+        self.assertNotIn(unrelated.id, clusters)
+        self.assertFalse(any(unrelated.id in ids for ids in clusters.values()))
+
+    def test_cron_rewrites_flags(self):
+        """The clustering cron clears stale flags and points members at their root"""
+        first = self._create_lead('A', email_from='a@cron-dedup.example')
+        second = self._create_lead('B', email_from='b@cron-dedup.example')
+        loner = self._create_lead('C', email_from='c@cron-loner.example')
+        loner.duplicate_of_id = first
+
+        self.Lead.cron_cluster_duplicate_leads()
+        self.assertEqual(second.duplicate_of_id, first)
+        self.assertFalse(loner.duplicate_of_id)
+        self.assertFalse(first.duplicate_of_id)
+
+    def test_similar_company_names(self):
+        """Company names that differ slightly are matched through trigram similarity"""
+        if not self.env.registry.has_trigram:
+            self.skipTest("pg_trgm is not installed")
+        original = self._create_lead('Original', partner_name='Globex Corporation International')
+        similar = self._create_lead('Similar', partner_name='Globex Corporaton International')
+        self.assertEqual(similar.duplicate_of_id, original)
+        self.assertIn(similar.id, self.Lead._find_duplicate_clusters().get(original.id, []))
@@ -9,7 +9,11 @@
         ===============================
         * Employee registration and profile management
         * Attendance and leave management
+        * Bulk attendance import from biometric terminals
         * Salary computation and payslip generation
+        * Batch payroll runs per department or company
+        * Background bulk payslip printing
+        * Payroll cost analysis by department, job and month
         * Role-based access control
         * Performance tracking
         * Department and job position management
@@ -23,8 +27,13 @@
         'views/employee_views.xml',
         'views/attendance_views.xml',
         'views/payroll_views.xml',
+        'views/payroll_run_views.xml',
+        'views/payslip_print_views.xml',
+        'views/payroll_cost_report_views.xml',
         'views/menu_views.xml',
         'reports/payslip_report.xml',
+        'data/payslip_print_cron.xml',
+        'data/payroll_cost_report_cron.xml',
     ],
     'demo': [],
     'installable': True,
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from odoo import http
+from odoo.http import request
+
+
+class PayslipPrintController(http.Controller):
+
+    @http.route('/erp_hr/payslip_print/<int:job_id>/download', type='http', auth='user')
+    def download_payslip_print(self, job_id):
+        """Stream a bulk print output from disk without loading it in memory"""
+        job = request.env['hr.payslip.print.job'].browse(job_id).exists()
+        if not job or job.state != 'done':
+            raise request.not_found()
+        job.check_access_rule('read')
+        path = job.sudo().file_path
+        if not path or not os.path.exists(path):
+            raise request.not_found()
+        mimetype = 'application/zip' if path.endswith('.zip') else 'application/pdf'
+        return http.Stream(
+            type='path',
+            path=path,
+            mimetype=mimetype,
+            download_name=job.file_name,
+            size=os.path.getsize(path),
+            as_attachment=True,
+        ).get_response()
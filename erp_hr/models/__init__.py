@@ -3,3 +3,7 @@
 from . import employee
 from . import attendance
 from . import payroll
+from . import payroll_run
+from . import payroll_cost_report
+from . import resource_calendar
+from . import payslip_print
@@ -1,8 +1,26 @@
 # -*- coding: utf-8 -*-
 
+import logging
+from datetime import timedelta
+
+import pytz
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
-from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_logger = logging.getLogger(__name__)
+
+# Fallback schedule for employees without a working calendar
+DEFAULT_START_HOUR = 9.0
+DEFAULT_WORK_HOURS = 8.0
+
+# Below this many worked hours an attendance counts as a half day
+HALF_DAY_HOURS = 4.0
 
 
 class HrAttendance(models.Model):
@@ -32,33 +50,25 @@ class HrAttendance(models.Model):
             else:
                 attendance.work_hours = 0.0
     
-    @api.depends('work_hours')
+    @api.depends('work_hours', 'check_in', 'employee_id')
     def _compute_overtime(self):
-        """Calculate overtime hours (assuming 8 hours standard)"""
+        """Calculate overtime hours beyond the employee's scheduled hours"""
+        schedules = self._get_employee_schedules(self.employee_id)
         for attendance in self:
-            standard_hours = 8.0
-            if attendance.work_hours > standard_hours:
-                attendance.overtime_hours = attendance.work_hours - standard_hours
-            else:
-                attendance.overtime_hours = 0.0
+            hours = attendance._get_schedule_day(schedules)[2]
+            attendance.overtime_hours = max(attendance.work_hours - hours, 0.0)
     
-    @api.depends('check_in')
+    @api.depends('check_in', 'employee_id')
     def _compute_late_arrival(self):
-        """Check if employee arrived late (assuming 9 AM start time)"""
+        """Check if employee arrived after the scheduled start time"""
+        schedules = self._get_employee_schedules(self.employee_id)
         for attendance in self:
-            if attendance.check_in:
-                check_in_time = attendance.check_in.time()
-                standard_time = datetime.strptime('09:00:00', '%H:%M:%S').time()
-                
-                if check_in_time > standard_time:
-                    attendance.is_late = True
-                    # Calculate late minutes
-                    check_in_dt = datetime.combine(date.today(), check_in_time)
-                    standard_dt = datetime.combine(date.today(), standard_time)
-                    attendance.late_minutes = int((check_in_dt - standard_dt).total_seconds() / 60)
-                else:
-                    attendance.is_late = False
-                    attendance.late_minutes = 0
+            local_check_in, start, hours = attendance._get_schedule_day(schedules)
+            if local_check_in and start is not None:
+                day_start = local_check_in.replace(hour=0, minute=0, second=0, microsecond=0)
+                late_seconds = (local_check_in - day_start - timedelta(hours=start)).total_seconds()
+                attendance.is_late = late_seconds > 0
+                attendance.late_minutes = int(late_seconds / 60) if late_seconds > 0 else 0
             else:
                 attendance.is_late = False
                 attendance.late_minutes = 0
@@ -71,10 +81,130 @@ class HrAttendance(models.Model):
                 attendance.attendance_status = 'overtime'
             elif attendance.is_late:
                 attendance.attendance_status = 'late'
-            elif attendance.work_hours < 4:
+            elif attendance.work_hours < HALF_DAY_HOURS:
                 attendance.attendance_status = 'half_day'
             else:
                 attendance.attendance_status = 'present'
+    
+    @api.model
+    def _get_employee_schedules(self, employees):
+        """Per-weekday start hour and expected hours for each employee
+        
+        Read from the compiled calendar table, so no query is issued per record.
+        
+        Args:
+            employees: hr.employee recordset
+            
+        Returns:
+            dict mapping employee id to (timezone name, weekday tuple) as in
+            resource.calendar._get_schedule_table; employees without a calendar
+            get the default schedule on every weekday
+        """
+        table = self.env['resource.calendar']._get_schedule_table()
+        default_days = ((DEFAULT_START_HOUR, DEFAULT_WORK_HOURS),) * 7
+        schedules = {}
+        for employee in employees:
+            calendar_id = employee.resource_calendar_id.id
+            calendar_tz, days = table.get(calendar_id, ('UTC', default_days))
+            schedules[employee.id] = (employee.tz or calendar_tz, days)
+        return schedules
+    
+    def _get_schedule_day(self, schedules):
+        """Local check-in time and (start_hour, work_hours) of its weekday
+        
+        Start hour is None on days without working time.
+        """
+        self.ensure_one()
+        if not self.check_in or self.employee_id.id not in schedules:
+            return self.check_in, DEFAULT_START_HOUR, DEFAULT_WORK_HOURS
+        tz, days = schedules[self.employee_id.id]
+        local_check_in = pytz.utc.localize(self.check_in).astimezone(pytz.timezone(tz)).replace(tzinfo=None)
+        start, hours = days[local_check_in.weekday()] or (None, 0.0)
+        return local_check_in, start, hours
+    
+    @api.model
+    def import_punches(self, punches):
+        """Create attendances for a batch of terminal punches in one create
+        
+        Work hours, overtime, lateness and status are computed for the whole batch
+        with array arithmetic against each employee's working schedule, then
+        passed to create so the per-record computes are skipped.
+        
+        Args:
+            punches: iterable of (employee_id, check_in, check_out) with UTC
+                datetimes; check_out may be False for open attendances
+            
+        Returns:
+            created hr.attendance recordset
+        """
+        punches = list(punches)
+        if not punches:
+            return self.browse()
+        
+        vals_list = [{
+            'employee_id': employee_id,
+            'check_in': check_in,
+            'check_out': check_out or False,
+        } for employee_id, check_in, check_out in punches]
+        
+        if not np:
+            _logger.warning("NumPy not installed. Importing punches record by record.")
+            return self.create(vals_list)
+        
+        employees = self.env['hr.employee'].browse({vals['employee_id'] for vals in vals_list})
+        schedules = self._get_employee_schedules(employees)
+        
+        # Weekday schedule table per employee; NaN start means no working time that day
+        employee_index = {employee_id: index for index, employee_id in enumerate(schedules)}
+        start_table = np.full((len(employee_index), 7), np.nan)
+        hours_table = np.zeros((len(employee_index), 7))
+        for employee_id, (tz, days) in schedules.items():
+            for weekday, day in enumerate(days):
+                if day:
+                    start_table[employee_index[employee_id], weekday] = day[0]
+                    hours_table[employee_index[employee_id], weekday] = day[1]
+        
+        # UTC offset of each punch in its employee's timezone, so DST changes are honoured
+        timezones = {}
+        offset_seconds = []
+        check_ins = []
+        check_outs = []
+        for vals in vals_list:
+            check_in = fields.Datetime.to_datetime(vals['check_in'])
+            tz = schedules[vals['employee_id']][0]
+            if tz not in timezones:
+                timezones[tz] = pytz.timezone(tz)
+            offset_seconds.append(pytz.utc.localize(check_in).astimezone(timezones[tz]).utcoffset().total_seconds())
+            check_ins.append(check_in)
+            check_outs.append(fields.Datetime.to_datetime(vals['check_out']) or None)
+        
+        check_in_arr = np.array(check_ins, dtype='datetime64[s]')
+        check_out_arr = np.array(check_outs, dtype='datetime64[s]')
+        local_in = check_in_arr + np.array(offset_seconds, dtype='timedelta64[s]')
+        local_day = local_in.astype('datetime64[D]')
+        weekday = (local_day.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        time_of_day = (local_in - local_day) / np.timedelta64(1, 'h')
+        
+        rows = np.array([employee_index[vals['employee_id']] for vals in vals_list])
+        start_hours = start_table[rows, weekday]
+        expected_hours = hours_table[rows, weekday]
+        
+        has_out = ~np.isnat(check_out_arr)
+        work_hours = np.zeros(len(vals_list))
+        work_hours[has_out] = (check_out_arr[has_out] - check_in_arr[has_out]) / np.timedelta64(1, 'h')
+        overtime_hours = np.maximum(work_hours - expected_hours, 0.0)
+        is_late = time_of_day > start_hours
+        status = np.where(overtime_hours > 0, 'overtime',
+                          np.where(is_late, 'late',
+                                   np.where(work_hours < HALF_DAY_HOURS, 'half_day', 'present')))
+        
+        for index, vals in enumerate(vals_list):
+            vals.update({
+                'work_hours': float(work_hours[index]),
+                'overtime_hours': float(overtime_hours[index]),
+                'attendance_status': str(status[index]),
+            })
+        return self.create(vals_list)
 
 
 class HrLeave(models.Model):
@@ -86,6 +216,32 @@ class HrLeave(models.Model):
     approval_date = fields.Datetime('Approval Date', readonly=True)
     rejection_reason = fields.Text('Rejection Reason')
     
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidate the per-year leave cache when validated leaves are created"""
+        leaves = super(HrLeave, self).create(vals_list)
+        if any(leave.state == 'validate' for leave in leaves):
+            self.env.registry.clear_cache()
+        return leaves
+    
+    def write(self, vals):
+        """Invalidate the per-year leave cache when validated leave totals can change"""
+        if not {'state', 'number_of_days', 'employee_id', 'date_from'} & set(vals):
+            return super(HrLeave, self).write(vals)
+        was_validated = any(leave.state == 'validate' for leave in self)
+        res = super(HrLeave, self).write(vals)
+        if was_validated or any(leave.state == 'validate' for leave in self):
+            self.env.registry.clear_cache()
+        return res
+    
+    def unlink(self):
+        """Invalidate the per-year leave cache when validated leaves are deleted"""
+        was_validated = any(leave.state == 'validate' for leave in self)
+        res = super(HrLeave, self).unlink()
+        if was_validated:
+            self.env.registry.clear_cache()
+        return res
+    
     def action_approve(self):
         """Override approve to track approver"""
         res = super(HrLeave, self).action_approve()
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
 from datetime import datetime, date
 
+# Employee fields feeding the amounts or grouping of their payslips in the payroll cost report
+EMPLOYEE_COST_REPORT_FIELDS = {'basic_salary', 'allowances', 'department_id', 'job_id'}
+
 
 class HrEmployee(models.Model):
     _inherit = 'hr.employee'
@@ -52,7 +55,8 @@ class HrEmployee(models.Model):
     
     # Statistics
     total_leaves_taken = fields.Integer('Total Leaves Taken', compute='_compute_leave_stats')
-    total_working_days = fields.Integer('Total Working Days', compute='_compute_attendance_stats')
+    leaves_taken_this_year = fields.Float('Leaves Taken This Year', compute='_compute_leaves_this_year')
+    total_working_days = fields.Integer('Total Working Days', compute='_compute_working_days', store=True)
     attendance_percentage = fields.Float('Attendance %', compute='_compute_attendance_stats')
     
     # Bank Details
@@ -60,6 +64,10 @@ class HrEmployee(models.Model):
     bank_name = fields.Char('Bank Name')
     ifsc_code = fields.Char('IFSC Code')
     
+    _sql_constraints = [
+        ('employee_code_uniq', 'unique(employee_code)', 'Employee code already exists!'),
+    ]
+    
     @api.depends('date_of_birth')
     def _compute_age(self):
         """Calculate employee age"""
@@ -90,35 +98,143 @@ class HrEmployee(models.Model):
             employee.net_salary = employee.basic_salary + employee.allowances - employee.deductions
     
     def _compute_leave_stats(self):
-        """Calculate total leaves taken"""
+        """Calculate total leaves taken with one grouped query"""
+        leave_days = {}
+        employee_ids = [employee_id for employee_id in self._origin.ids if employee_id]
+        if employee_ids:
+            groups = self.env['hr.leave'].read_group(
+                [('employee_id', 'in', employee_ids), ('state', '=', 'validate')],
+                ['number_of_days:sum'], ['employee_id'])
+            leave_days = {g['employee_id'][0]: g['number_of_days'] for g in groups}
+        for employee in self:
+            employee.total_leaves_taken = leave_days.get(employee._origin.id, 0)
+    
+    @api.model
+    @tools.ormcache()
+    def _get_leave_days_by_year(self):
+        """Validated leave days per (employee id, year), for all employees at once
+        
+        Cached until a leave is created, validated, edited or deleted. Leaves are
+        counted in the year they start.
+        """
+        groups = self.env['hr.leave'].sudo().read_group(
+            [('state', '=', 'validate')],
+            ['number_of_days:sum'], ['employee_id', 'date_from:year'], lazy=False)
+        return {
+            (g['employee_id'][0], int(g['date_from:year'])): g['number_of_days']
+            for g in groups if g['employee_id'] and g['date_from:year']
+        }
+    
+    def _compute_leaves_this_year(self):
+        """Read leave days for the current year from the per-year cache"""
+        leave_days = self._get_leave_days_by_year()
+        year = date.today().year
         for employee in self:
-            leaves = self.env['hr.leave'].search([
-                ('employee_id', '=', employee.id),
-                ('state', '=', 'validate')
-            ])
-            employee.total_leaves_taken = sum(leaves.mapped('number_of_days'))
+            employee.leaves_taken_this_year = leave_days.get((employee._origin.id, year), 0.0)
     
+    @api.depends('attendance_ids.check_in', 'attendance_ids.check_out')
+    def _compute_working_days(self):
+        """Count distinct worked days per employee with one grouped query"""
+        employee_ids = [employee_id for employee_id in self._origin.ids if employee_id]
+        worked_days = {}
+        if employee_ids:
+            self.env['hr.attendance'].flush_model(['employee_id', 'check_in', 'check_out'])
+            self.env.cr.execute("""
+                SELECT employee_id, COUNT(DISTINCT check_in::date)
+                  FROM hr_attendance
+                 WHERE employee_id IN %s
+                   AND check_out IS NOT NULL
+              GROUP BY employee_id
+            """, (tuple(employee_ids),))
+            worked_days = dict(self.env.cr.fetchall())
+        for employee in self:
+            employee.total_working_days = worked_days.get(employee._origin.id, 0)
+    
+    @api.depends('total_working_days', 'date_of_joining')
     def _compute_attendance_stats(self):
         """Calculate attendance statistics"""
+        today = date.today()
         for employee in self:
-            if employee.date_of_joining:
-                days_since_joining = (date.today() - employee.date_of_joining).days
-                attendances = self.env['hr.attendance'].search([
-                    ('employee_id', '=', employee.id),
-                    ('check_out', '!=', False)
-                ])
-                employee.total_working_days = len(set(attendances.mapped(lambda a: a.check_in.date())))
-                employee.attendance_percentage = (employee.total_working_days / days_since_joining * 100) if days_since_joining > 0 else 0
+            days_since_joining = (today - employee.date_of_joining).days if employee.date_of_joining else 0
+            if days_since_joining > 0:
+                employee.attendance_percentage = employee.total_working_days / days_since_joining * 100
             else:
-                employee.total_working_days = 0
                 employee.attendance_percentage = 0
     
-    @api.constrains('employee_code')
-    def _check_employee_code(self):
-        """Ensure employee code is unique"""
-        for employee in self:
-            if self.search_count([('employee_code', '=', employee.employee_code), ('id', '!=', employee.id)]) > 0:
-                raise ValidationError(f"Employee code {employee.employee_code} already exists!")
+    @api.model
+    def _find_duplicate_employee_codes(self, codes):
+        """Find codes repeated in the list or already used, with one query
+        
+        Args:
+            codes: list of incoming employee codes
+            
+        Returns:
+            dict mapping each duplicate code to 'batch' when it is repeated in the
+            list, or 'existing' when another employee already uses it
+        """
+        codes = [code for code in codes if code]
+        duplicates = {}
+        seen = set()
+        for code in codes:
+            if code in seen:
+                duplicates[code] = 'batch'
+            seen.add(code)
+        if seen:
+            existing = self.with_context(active_test=False).search_read(
+                [('employee_code', 'in', list(seen))], ['employee_code'])
+            for row in existing:
+                duplicates[row['employee_code']] = 'existing'
+        return duplicates
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Report every duplicate employee code at once before creating"""
+        duplicates = self._find_duplicate_employee_codes([vals.get('employee_code') for vals in vals_list])
+        if duplicates:
+            raise ValidationError("Employee codes already exist: " + ", ".join(sorted(duplicates)))
+        return super(HrEmployee, self).create(vals_list)
+    
+    def write(self, vals):
+        """Refresh the payroll cost report when payslip amounts or grouping follow the employee
+        
+        These changes reach done payslips through related and computed field
+        recomputation, which does not go through the payslip write.
+        """
+        res = super(HrEmployee, self).write(vals)
+        if EMPLOYEE_COST_REPORT_FIELDS & set(vals):
+            months = self.env['hr.payslip'].search([
+                ('employee_id', 'in', self.ids),
+                ('state', '=', 'done'),
+            ])._get_cost_report_months()
+            if months:
+                self.env['hr.payroll.cost.report'].sudo()._refresh_months(months)
+        return res
+    
+    @api.model
+    def load(self, fields, data):
+        """Pre-validate imported employee codes and report all duplicates together
+        
+        Imports updating existing records (with an id column) rely on the
+        database constraint alone.
+        """
+        if 'employee_code' in fields and 'id' not in fields and '.id' not in fields:
+            index = fields.index('employee_code')
+            codes = [row[index] if index < len(row) else False for row in data]
+            duplicates = self._find_duplicate_employee_codes(codes)
+            if duplicates:
+                messages = []
+                for row_number, code in enumerate(codes):
+                    if code in duplicates:
+                        reason = 'is repeated in the file' if duplicates[code] == 'batch' else 'already exists'
+                        messages.append({
+                            'type': 'error',
+                            'message': f"Employee code {code} {reason}",
+                            'record': row_number,
+                            'field': 'employee_code',
+                            'rows': {'from': row_number, 'to': row_number},
+                        })
+                return {'ids': False, 'messages': messages}
+        return super(HrEmployee, self).load(fields, data)
     
     def action_generate_payslip(self):
         """Generate payslip for employee"""
@@ -3,6 +3,12 @@
 from odoo import models, fields, api
 from datetime import datetime
 
+# Changes to these fields on done payslips affect the payroll cost report
+COST_REPORT_FIELDS = {
+    'state', 'date_from', 'employee_id', 'company_id', 'overtime_hours', 'bonus',
+    'tax_deduction', 'insurance_deduction', 'other_deductions',
+}
+
 
 class HrPayslip(models.Model):
     _name = 'hr.payslip'
@@ -16,7 +22,8 @@ class HrPayslip(models.Model):
     job_id = fields.Many2one('hr.job', related='employee_id.job_id', string='Job Position', store=True)
     
     # Date range
-    date_from = fields.Date('Date From', required=True, default=lambda self: fields.Date.today().replace(day=1))
+    date_from = fields.Date('Date From', required=True, index=True,
+                            default=lambda self: fields.Date.today().replace(day=1))
     date_to = fields.Date('Date To', required=True)
     
     # Salary components
@@ -31,7 +38,7 @@ class HrPayslip(models.Model):
     
     # Bonuses and overtime
     overtime_hours = fields.Float('Overtime Hours')
-    overtime_amount = fields.Monetary('Overtime Amount', compute='_compute_overtime_amount', currency_field='currency_id')
+    overtime_amount = fields.Monetary('Overtime Amount', compute='_compute_overtime_amount', store=True, currency_field='currency_id')
     bonus = fields.Monetary('Bonus', currency_field='currency_id')
     
     # Totals
@@ -58,13 +65,71 @@ class HrPayslip(models.Model):
     ], string='Payment Method')
     
     notes = fields.Text('Notes')
+    payslip_run_id = fields.Many2one('hr.payslip.run', string='Payroll Run', readonly=True, index=True, ondelete='set null')
     
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """Generate sequence for payslip"""
-        if vals.get('name', 'New') == 'New':
-            vals['name'] = self.env['ir.sequence'].next_by_code('hr.payslip') or 'New'
-        return super(HrPayslip, self).create(vals)
+        for vals in vals_list:
+            if vals.get('name', 'New') == 'New':
+                vals['name'] = self.env['ir.sequence'].next_by_code('hr.payslip') or 'New'
+        return super(HrPayslip, self).create(vals_list)
+    
+    def write(self, vals):
+        """Refresh the payroll cost report for months whose done payslips change"""
+        if not COST_REPORT_FIELDS & set(vals):
+            return super(HrPayslip, self).write(vals)
+        months = self._get_cost_report_months()
+        res = super(HrPayslip, self).write(vals)
+        months |= self._get_cost_report_months()
+        if months:
+            self.env['hr.payroll.cost.report'].sudo()._refresh_months(months)
+        return res
+    
+    def unlink(self):
+        """Refresh the payroll cost report for months of deleted done payslips"""
+        months = self._get_cost_report_months()
+        res = super(HrPayslip, self).unlink()
+        if months:
+            self.env['hr.payroll.cost.report'].sudo()._refresh_months(months)
+        return res
+    
+    def _get_cost_report_months(self):
+        """First day of the months covered by the done payslips in self"""
+        return {slip.date_from.replace(day=1) for slip in self if slip.state == 'done' and slip.date_from}
+    
+    @api.model
+    def _reserve_names(self, count):
+        """Reserve a block of payslip references with a single sequence query
+        
+        Args:
+            count: number of references to reserve
+            
+        Returns:
+            list of formatted references
+        """
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'hr.payslip'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence or sequence.use_date_range or count <= 0:
+            return [self.env['ir.sequence'].next_by_code('hr.payslip') or 'New' for __ in range(count)]
+        
+        if sequence.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                ('ir_sequence_%03d' % sequence.id, count))
+            numbers = [row[0] for row in self.env.cr.fetchall()]
+        else:
+            self.env.cr.execute(
+                "SELECT number_next FROM ir_sequence WHERE id = %s FOR UPDATE", (sequence.id,))
+            number_next = self.env.cr.fetchone()[0]
+            self.env.cr.execute(
+                "UPDATE ir_sequence SET number_next = number_next + %s WHERE id = %s",
+                (count * sequence.number_increment, sequence.id))
+            sequence.invalidate_recordset(['number_next'])
+            numbers = [number_next + index * sequence.number_increment for index in range(count)]
+        return [sequence.get_next_char(number) for number in numbers]
     
     @api.depends('overtime_hours', 'employee_id.basic_salary')
     def _compute_overtime_amount(self):
@@ -110,3 +175,17 @@ class HrPayslip(models.Model):
     def action_print_payslip(self):
         """Print payslip report"""
         return self.env.ref('erp_hr.action_report_payslip').report_action(self)
+    
+    def action_print_payslip_background(self):
+        """Queue a background bulk print job for the selected payslips"""
+        job = self.env['hr.payslip.print.job'].create({
+            'name': f'Payslips {fields.Date.today()}',
+            'payslip_ids': [(6, 0, self.ids)],
+        })
+        return {
+            'name': 'Payslip Print Job',
+            'type': 'ir.actions.act_window',
+            'res_model': 'hr.payslip.print.job',
+            'view_mode': 'form',
+            'res_id': job.id,
+        }
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from dateutil.relativedelta import relativedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+
+class HrPayrollCostReport(models.Model):
+    _name = 'hr.payroll.cost.report'
+    _description = 'Payroll Cost Analysis'
+    _order = 'month desc, department_id, job_id'
+
+    month = fields.Date('Month', readonly=True, index=True)
+    department_id = fields.Many2one('hr.department', string='Department', readonly=True)
+    job_id = fields.Many2one('hr.job', string='Job Position', readonly=True)
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    currency_id = fields.Many2one('res.currency', related='company_id.currency_id')
+
+    payslip_count = fields.Integer('Payslips', readonly=True)
+    overtime_hours = fields.Float('Overtime Hours', readonly=True)
+    overtime_amount = fields.Monetary('Overtime Amount', readonly=True, currency_field='currency_id')
+    gross_salary = fields.Monetary('Gross Salary', readonly=True, currency_field='currency_id')
+    total_deductions = fields.Monetary('Total Deductions', readonly=True, currency_field='currency_id')
+    net_salary = fields.Monetary('Net Salary', readonly=True, currency_field='currency_id')
+    overtime_share = fields.Float('Overtime Share %', readonly=True,
+                                  help="Overtime amount as a percentage of gross salary")
+
+    @api.model
+    def read_group(self, domain, fields, groupby, offset=0, limit=None, orderby=False, lazy=True):
+        """Derive the overtime share of groups from their summed overtime and gross amounts"""
+        names = [spec.split(':')[0].strip() for spec in fields]
+        if 'overtime_share' not in names:
+            return super(HrPayrollCostReport, self).read_group(
+                domain, fields, groupby, offset=offset, limit=limit, orderby=orderby, lazy=lazy)
+        fields = [spec for spec, name in zip(fields, names) if name != 'overtime_share']
+        fields += [f'{name}:sum' for name in ('overtime_amount', 'gross_salary') if name not in names]
+        groups = super(HrPayrollCostReport, self).read_group(
+            domain, fields, groupby, offset=offset, limit=limit, orderby=orderby, lazy=lazy)
+        for group in groups:
+            gross = group.get('gross_salary') or 0.0
+            group['overtime_share'] = (group.get('overtime_amount') or 0.0) / gross * 100 if gross else 0.0
+        return groups
+
+    @api.model
+    def _refresh_months(self, months=None):
+        """Rebuild the cube rows of the given months from done payslips
+
+        Args:
+            months: iterable of first-of-month dates, or None to rebuild everything
+        """
+        self.env['hr.payslip'].flush_model()
+        params = {'uid': self.env.uid}
+        month_filter = ''
+        if months is not None:
+            months = tuple(months)
+            if not months:
+                return
+            params['months'] = months
+            # One date range per month, so the date_from index is used
+            ranges = []
+            for index, month in enumerate(months):
+                params[f'start_{index}'] = month
+                params[f'end_{index}'] = month + relativedelta(months=1)
+                ranges.append(f"(slip.date_from >= %(start_{index})s AND slip.date_from < %(end_{index})s)")
+            month_filter = f"AND ({' OR '.join(ranges)})"
+            self.env.cr.execute("DELETE FROM hr_payroll_cost_report WHERE month IN %(months)s", params)
+        else:
+            self.env.cr.execute("DELETE FROM hr_payroll_cost_report")
+
+        self.env.cr.execute(f"""
+            INSERT INTO hr_payroll_cost_report (
+                month, department_id, job_id, company_id, payslip_count,
+                overtime_hours, overtime_amount, gross_salary,
+                total_deductions, net_salary, overtime_share,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT date_trunc('month', slip.date_from)::date,
+                   slip.department_id,
+                   slip.job_id,
+                   slip.company_id,
+                   COUNT(*),
+                   SUM(COALESCE(slip.overtime_hours, 0)),
+                   SUM(COALESCE(slip.overtime_amount, 0)),
+                   SUM(COALESCE(slip.gross_salary, 0)),
+                   SUM(COALESCE(slip.total_deductions, 0)),
+                   SUM(COALESCE(slip.net_salary, 0)),
+                   COALESCE(SUM(slip.overtime_amount) / NULLIF(SUM(slip.gross_salary), 0) * 100, 0),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM hr_payslip slip
+             WHERE slip.state = 'done'
+                   {month_filter}
+          GROUP BY 1, slip.department_id, slip.job_id, slip.company_id
+        """, params)
+        self.invalidate_model()
+
+    @api.model
+    def cron_refresh_payroll_cost_report(self):
+        """Cron job to rebuild the whole payroll cost cube"""
+        self._refresh_months()
+        _logger.info("Payroll cost report rebuilt")
+        return True
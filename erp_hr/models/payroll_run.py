@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import ValidationError
+
+_logger = logging.getLogger(__name__)
+
+
+class HrPayslipRun(models.Model):
+    _name = 'hr.payslip.run'
+    _description = 'Payroll Run'
+    _order = 'date_from desc, id desc'
+
+    name = fields.Char('Name', required=True)
+    date_from = fields.Date('Date From', required=True, default=lambda self: fields.Date.today().replace(day=1))
+    date_to = fields.Date('Date To', required=True,
+                          default=lambda self: fields.Date.end_of(fields.Date.today(), 'month'))
+    department_id = fields.Many2one('hr.department', string='Department',
+                                    help="Leave empty to run payroll for the whole company")
+    company_id = fields.Many2one('res.company', default=lambda self: self.env.company, required=True)
+    currency_id = fields.Many2one('res.currency', related='company_id.currency_id')
+
+    slip_ids = fields.One2many('hr.payslip', 'payslip_run_id', string='Payslips')
+    payslip_count = fields.Integer('Payslip Count', compute='_compute_payslip_stats')
+    total_net_salary = fields.Monetary('Total Net Salary', compute='_compute_payslip_stats', currency_field='currency_id')
+
+    # Generation statistics
+    generation_time = fields.Float('Generation Time (s)', readonly=True)
+    throughput = fields.Float('Payslips per Second', readonly=True)
+
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('generated', 'Generated'),
+        ('done', 'Done'),
+    ], string='Status', default='draft')
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        """Validate payroll period"""
+        for run in self:
+            if run.date_to < run.date_from:
+                raise ValidationError("Date To must be after Date From!")
+
+    def _compute_payslip_stats(self):
+        """Count payslips and sum net salary with one grouped query"""
+        stats = {}
+        if self.ids:
+            groups = self.env['hr.payslip'].read_group(
+                [('payslip_run_id', 'in', self.ids)], ['net_salary:sum'], ['payslip_run_id'])
+            stats = {g['payslip_run_id'][0]: (g['payslip_run_id_count'], g['net_salary']) for g in groups}
+        for run in self:
+            run.payslip_count, run.total_net_salary = stats.get(run.id, (0, 0.0))
+
+    def _get_employees(self):
+        """Active employees covered by this run"""
+        self.ensure_one()
+        domain = [
+            ('company_id', '=', self.company_id.id),
+            ('employment_status', '=', 'active'),
+        ]
+        if self.department_id:
+            domain.append(('department_id', 'child_of', self.department_id.id))
+        return self.env['hr.employee'].search(domain)
+
+    def _get_overtime_hours(self, employees):
+        """Overtime hours per employee over the run period, in one grouped query"""
+        self.ensure_one()
+        groups = self.env['hr.attendance'].read_group([
+            ('employee_id', 'in', employees.ids),
+            ('check_in', '>=', self.date_from),
+            ('check_in', '<', self.date_to + timedelta(days=1)),
+        ], ['overtime_hours:sum'], ['employee_id'])
+        return {g['employee_id'][0]: g['overtime_hours'] for g in groups}
+
+    def action_generate_payslips(self):
+        """Create payslips for every covered employee in one batched create"""
+        self.ensure_one()
+        start = time.perf_counter()
+
+        employees = self._get_employees()
+        # Skip employees who already have a payslip overlapping the period
+        existing = self.env['hr.payslip'].read_group([
+            ('employee_id', 'in', employees.ids),
+            ('date_from', '<=', self.date_to),
+            ('date_to', '>=', self.date_from),
+            ('state', '!=', 'cancel'),
+        ], ['employee_id'], ['employee_id'])
+        existing_ids = {g['employee_id'][0] for g in existing}
+        employees = employees.filtered(lambda employee: employee.id not in existing_ids)
+
+        overtime = self._get_overtime_hours(employees)
+        names = self.env['hr.payslip']._reserve_names(len(employees))
+        payslips = self.env['hr.payslip'].create([{
+            'name': name,
+            'employee_id': employee.id,
+            'date_from': self.date_from,
+            'date_to': self.date_to,
+            'overtime_hours': overtime.get(employee.id, 0.0),
+            'payslip_run_id': self.id,
+            'company_id': self.company_id.id,
+            'currency_id': self.company_id.currency_id.id,
+        } for employee, name in zip(employees, names)])
+        # Compute totals for the whole batch before timing
+        payslips.flush_recordset()
+
+        elapsed = time.perf_counter() - start
+        throughput = len(payslips) / elapsed if elapsed > 0 else 0.0
+        self.write({
+            'state': 'generated',
+            'generation_time': elapsed,
+            'throughput': throughput,
+        })
+        _logger.info(f"Payroll run {self.name}: generated {len(payslips)} payslips "
+                     f"in {elapsed:.2f}s ({throughput:.0f}/s)")
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Payslips Generated',
+                'message': f'{len(payslips)} payslips generated in {elapsed:.2f}s ({throughput:.0f} per second)',
+                'type': 'success',
+                'sticky': False,
+            }
+        }
+
+    def action_verify_payslips(self):
+        """Submit all draft payslips of the run for verification"""
+        self.mapped('slip_ids').filtered(lambda slip: slip.state == 'draft').action_verify()
+
+    def action_done(self):
+        """Close payroll run"""
+        self.write({'state': 'done'})
+
+    def action_draft(self):
+        """Reset payroll run to draft"""
+        self.write({'state': 'draft'})
+
+    def action_view_payslips(self):
+        """View payslips of this run"""
+        self.ensure_one()
+        return {
+            'name': 'Payslips',
+            'type': 'ir.actions.act_window',
+            'res_model': 'hr.payslip',
+            'view_mode': 'tree,form',
+            'domain': [('payslip_run_id', '=', self.id)],
+        }
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
+
+_logger = logging.getLogger(__name__)
+
+PAYSLIP_REPORT = 'erp_hr.action_report_payslip'
+# Above this, a single PDF would have to be assembled in memory: output a ZIP instead
+PDF_MERGE_MAX_PAYSLIPS = 200
+# Running jobs without progress for this long were interrupted (worker killed, timeout)
+STALE_JOB_MINUTES = 60
+
+
+class HrPayslipPrintJob(models.Model):
+    _name = 'hr.payslip.print.job'
+    _description = 'Payslip Bulk Print Job'
+    _order = 'create_date desc, id desc'
+
+    name = fields.Char('Name', required=True, default='Payslip Print')
+    payslip_ids = fields.Many2many('hr.payslip', string='Payslips', required=True)
+    payslip_count = fields.Integer('Payslip Count', compute='_compute_payslip_count')
+    output_format = fields.Selection([
+        ('pdf', 'Single PDF'),
+        ('zip', 'ZIP of PDF chunks'),
+    ], string='Output', default='zip', required=True,
+       help=f"Single PDF output is only produced up to {PDF_MERGE_MAX_PAYSLIPS} payslips, "
+            f"larger runs are delivered as a ZIP of PDF chunks")
+    chunk_size = fields.Integer('Payslips per Chunk', default=200, required=True)
+    worker_count = fields.Integer('Parallel Workers', default=4, required=True)
+
+    # Progress
+    chunk_count = fields.Integer('Chunks', readonly=True)
+    chunks_done = fields.Integer('Chunks Done', readonly=True)
+    progress = fields.Float('Progress %', compute='_compute_progress')
+    state = fields.Selection([
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='Status', default='queued', readonly=True)
+    error_message = fields.Text('Error', readonly=True)
+
+    # Output stored on disk, outside the database
+    file_path = fields.Char('File Path', readonly=True, groups='base.group_system')
+    file_name = fields.Char('File Name', readonly=True)
+    file_size = fields.Integer('File Size (bytes)', readonly=True)
+
+    @api.constrains('chunk_size', 'worker_count')
+    def _check_job_parameters(self):
+        """Validate chunking parameters"""
+        for job in self:
+            if job.chunk_size <= 0 or job.worker_count <= 0:
+                raise ValidationError("Chunk size and worker count must be positive!")
+
+    @api.depends('payslip_ids')
+    def _compute_payslip_count(self):
+        for job in self:
+            job.payslip_count = len(job.payslip_ids)
+
+    @api.depends('chunks_done', 'chunk_count', 'state')
+    def _compute_progress(self):
+        for job in self:
+            if job.state == 'done':
+                job.progress = 100.0
+            elif job.chunk_count:
+                job.progress = job.chunks_done / job.chunk_count * 100
+            else:
+                job.progress = 0.0
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Wake up the print cron for new jobs"""
+        jobs = super(HrPayslipPrintJob, self).create(vals_list)
+        self.env.ref('erp_hr.ir_cron_process_payslip_print_jobs')._trigger()
+        return jobs
+
+    def unlink(self):
+        """Remove output files from disk"""
+        paths = [path for path in self.sudo().mapped('file_path') if path]
+        res = super(HrPayslipPrintJob, self).unlink()
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        return res
+
+    def _get_output_dir(self):
+        """Directory holding print outputs for this database"""
+        path = os.path.join(self.env['ir.attachment']._filestore(), 'payslip_prints')
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _render_chunk(self, payslip_ids, path):
+        """Render one chunk to a PDF file, in its own cursor (runs in a worker thread)"""
+        threading.current_thread().dbname = self.env.cr.dbname
+        with self.pool.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            pdf_content = env['ir.actions.report']._render_qweb_pdf(PAYSLIP_REPORT, res_ids=payslip_ids)[0]
+        with open(path, 'wb') as chunk_file:
+            chunk_file.write(pdf_content)
+        return path
+
+    def _run(self):
+        """Render payslips in chunks with a worker pool and stream them to one file
+
+        Only one chunk per worker is held in memory. ZIP output adds each chunk
+        as soon as it is rendered; PDF output merges the chunk files from disk
+        once all of them are rendered, which holds every page in memory, so
+        runs above PDF_MERGE_MAX_PAYSLIPS are delivered as a ZIP instead.
+        """
+        self.ensure_one()
+        output_dir = self._get_output_dir()
+        payslip_ids = self.payslip_ids.sorted(lambda slip: (slip.department_id.name or '', slip.name)).ids
+        chunks = [payslip_ids[index:index + self.chunk_size] for index in range(0, len(payslip_ids), self.chunk_size)]
+        chunk_paths = [os.path.join(output_dir, f'job_{self.id}_chunk_{index:05d}.pdf') for index in range(len(chunks))]
+        extension = 'zip' if self.output_format == 'zip' or len(payslip_ids) > PDF_MERGE_MAX_PAYSLIPS else 'pdf'
+        output_path = os.path.join(output_dir, f'job_{self.id}.{extension}')
+
+        self.write({'state': 'running', 'chunk_count': len(chunks), 'chunks_done': 0, 'error_message': False})
+        self.env.cr.commit()
+
+        archive = zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) if extension == 'zip' else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.worker_count) as executor:
+                futures = [executor.submit(self._render_chunk, chunk, path) for chunk, path in zip(chunks, chunk_paths)]
+                for future in as_completed(futures):
+                    path = future.result()
+                    if archive:
+                        archive.write(path, os.path.basename(path))
+                        os.remove(path)
+                    self.chunks_done += 1
+                    self.env.cr.commit()
+            if not archive:
+                self._merge_pdf_chunks(chunk_paths, output_path)
+        finally:
+            if archive:
+                archive.close()
+            for path in chunk_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self.sudo().write({
+            'state': 'done',
+            'file_path': output_path,
+            'file_name': f'{self.name}.{extension}',
+            'file_size': os.path.getsize(output_path),
+        })
+
+    @api.model
+    def _merge_pdf_chunks(self, chunk_paths, output_path):
+        """Merge chunk PDFs from disk into one file"""
+        writer = PdfFileWriter()
+        streams = [open(path, 'rb') for path in chunk_paths]
+        try:
+            for stream in streams:
+                reader = PdfFileReader(stream, strict=False)
+                for page_number in range(reader.getNumPages()):
+                    writer.addPage(reader.getPage(page_number))
+            with open(output_path, 'wb') as output:
+                writer.write(output)
+        finally:
+            for stream in streams:
+                stream.close()
+
+    @api.model
+    def _fail_stale_jobs(self):
+        """Mark running jobs that stopped reporting progress as failed, so they can be retried"""
+        stale_jobs = self.search([
+            ('state', '=', 'running'),
+            ('write_date', '<', fields.Datetime.now() - timedelta(minutes=STALE_JOB_MINUTES)),
+        ])
+        if stale_jobs:
+            _logger.warning(f"Payslip print jobs {stale_jobs.ids} were interrupted")
+            stale_jobs.write({
+                'state': 'failed',
+                'error_message': f"Rendering was interrupted: no progress for {STALE_JOB_MINUTES} minutes",
+            })
+            self.env.cr.commit()
+
+    @api.model
+    def cron_process_print_jobs(self):
+        """Cron job to render queued payslip print jobs"""
+        self._fail_stale_jobs()
+        for job in self.search([('state', '=', 'queued')], order='id'):
+            _logger.info(f"Rendering payslip print job {job.id} ({len(job.payslip_ids)} payslips)")
+            try:
+                job._run()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.exception(f"Payslip print job {job.id} failed")
+                job.write({'state': 'failed', 'error_message': str(e)})
+            self.env.cr.commit()
+        return True
+
+    def action_retry(self):
+        """Queue the job again"""
+        self.write({'state': 'queued', 'chunks_done': 0})
+        self.env.ref('erp_hr.ir_cron_process_payslip_print_jobs')._trigger()
+
+    def action_download(self):
+        """Download the rendered file"""
+        self.ensure_one()
+        if self.state != 'done':
+            raise UserError("The print job is not finished yet!")
+        return {
+            'type': 'ir.actions.act_url',
+            'url': f'/erp_hr/payslip_print/{self.id}/download',
+            'target': 'self',
+        }
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api, tools
+
+
+class ResourceCalendar(models.Model):
+    _inherit = 'resource.calendar'
+
+    @api.model
+    @tools.ormcache()
+    def _get_schedule_table(self):
+        """Compiled working schedule of every calendar, built with one query
+
+        Cached until a calendar or one of its working hours changes.
+
+        Returns:
+            dict mapping calendar id to (timezone name, weekday tuple), where the
+            tuple holds (start_hour, work_hours) for each weekday from Monday to
+            Sunday, or None on days without working time
+        """
+        calendars = self.sudo().with_context(active_test=False).search_read([], ['tz'])
+        days = {calendar['id']: {} for calendar in calendars}
+        lines = self.env['resource.calendar.attendance'].sudo().search_read([
+            ('day_period', '!=', 'lunch'),
+            ('display_type', '=', False),
+        ], ['calendar_id', 'dayofweek', 'hour_from', 'hour_to', 'week_type'])
+        for line in lines:
+            calendar_days = days.get(line['calendar_id'][0])
+            # Two-week calendars are compiled from their first week
+            if calendar_days is None or line['week_type'] == '1':
+                continue
+            weekday = int(line['dayofweek'])
+            start, hours = calendar_days.get(weekday, (line['hour_from'], 0.0))
+            calendar_days[weekday] = (min(start, line['hour_from']), hours + line['hour_to'] - line['hour_from'])
+        return {
+            calendar['id']: (calendar['tz'] or 'UTC', tuple(days[calendar['id']].get(weekday) for weekday in range(7)))
+            for calendar in calendars
+        }
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidate the compiled schedule table"""
+        calendars = super(ResourceCalendar, self).create(vals_list)
+        self.env.registry.clear_cache()
+        return calendars
+
+    def write(self, vals):
+        """Invalidate the compiled schedule table"""
+        res = super(ResourceCalendar, self).write(vals)
+        if {'tz', 'active', 'attendance_ids'} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        """Invalidate the compiled schedule table"""
+        res = super(ResourceCalendar, self).unlink()
+        self.env.registry.clear_cache()
+        return res
+
+
+class ResourceCalendarAttendance(models.Model):
+    _inherit = 'resource.calendar.attendance'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidate the compiled schedule table"""
+        lines = super(ResourceCalendarAttendance, self).create(vals_list)
+        self.env.registry.clear_cache()
+        return lines
+
+    def write(self, vals):
+        """Invalidate the compiled schedule table"""
+        res = super(ResourceCalendarAttendance, self).write(vals)
+        if {'calendar_id', 'dayofweek', 'hour_from', 'hour_to', 'day_period', 'display_type', 'week_type'} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        """Invalidate the compiled schedule table"""
+        res = super(ResourceCalendarAttendance, self).unlink()
+        self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+
+from . import test_attendance_stats
+from . import test_leave_stats
+from . import test_attendance_import
+from . import test_schedule_table
+from . import test_payroll_run
+from . import test_payslip_print
+from . import test_employee_code
+from . import test_payroll_cost_report
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import TransactionCase
+
+
+class TestErpHrCommon(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestErpHrCommon, cls).setUpClass()
+        # UTC calendar working 9:00-13:00 and 14:00-18:00 from Monday to Friday
+        cls.calendar = cls.env['resource.calendar'].create({
+            'name': 'ERP HR Test Calendar',
+            'tz': 'UTC',
+            'attendance_ids': [
+                (0, 0, {
+                    'name': f'Day {dayofweek} {day_period}',
+                    'dayofweek': str(dayofweek),
+                    'hour_from': hour_from,
+                    'hour_to': hour_to,
+                    'day_period': day_period,
+                })
+                for dayofweek in range(5)
+                for hour_from, hour_to, day_period in ((9, 13, 'morning'), (14, 18, 'afternoon'))
+            ],
+        })
+        cls.department = cls.env['hr.department'].create({'name': 'ERP HR Test Department'})
+        cls.job = cls.env['hr.job'].create({'name': 'ERP HR Test Job'})
+        cls.employee = cls._create_employee('Test Employee One', 'ERPTEST001')
+        cls.employee_2 = cls._create_employee('Test Employee Two', 'ERPTEST002')
+
+    @classmethod
+    def _create_employee(cls, name, code, **vals):
+        return cls.env['hr.employee'].create(dict({
+            'name': name,
+            'employee_code': code,
+            'resource_calendar_id': cls.calendar.id,
+            'tz': 'UTC',
+            'department_id': cls.department.id,
+            'job_id': cls.job.id,
+            'basic_salary': 16000.0,
+        }, **vals))
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+from unittest.mock import patch
+
+from odoo.tests.common import tagged
+
+from odoo.addons.erp_hr.models import attendance as attendance_module
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestAttendanceImport(TestErpHrCommon):
+
+    def _get_punches(self, employee):
+        return [
+            # Monday: 30 minutes late and two hours of overtime
+            (employee.id, datetime(2024, 1, 8, 9, 30), datetime(2024, 1, 8, 19, 30)),
+            # Tuesday: on time, just above half a day
+            (employee.id, datetime(2024, 1, 9, 8, 55), datetime(2024, 1, 9, 13, 0)),
+            # Wednesday: late, short day
+            (employee.id, datetime(2024, 1, 10, 9, 15), datetime(2024, 1, 10, 12, 0)),
+            # Saturday: no working time, every hour is overtime
+            (employee.id, datetime(2024, 1, 13, 10, 0), datetime(2024, 1, 13, 12, 0)),
+            # Next Monday: still checked in
+            (employee.id, datetime(2024, 1, 15, 9, 0), False),
+        ]
+
+    def _read_results(self, attendances):
+        return [
+            (round(attendance.work_hours, 4), round(attendance.overtime_hours, 4), attendance.attendance_status)
+            for attendance in attendances.sorted('check_in')
+        ]
+
+    def test_import_punches_schedule_rules(self):
+        """Batch import applies each employee's weekday schedule"""
+        if not attendance_module.np:
+            self.skipTest("NumPy is not installed")
+        attendances = self.env['hr.attendance'].import_punches(self._get_punches(self.employee))
+
+        self.assertEqual(len(attendances), 5)
+        self.assertEqual(self._read_results(attendances), [
+            (10.0, 2.0, 'overtime'),
+            (4.0833, 0.0, 'present'),
+            (2.75, 0.0, 'late'),
+            (2.0, 2.0, 'overtime'),
+            (0.0, 0.0, 'half_day'),
+        ])
+        monday = attendances.sorted('check_in')[0]
+        self.assertTrue(monday.is_late)
+        self.assertEqual(monday.late_minutes, 30)
+
+    def test_import_punches_matches_record_computes(self):
+        """Vectorized values equal those of the record-by-record computes"""
+        if not attendance_module.np:
+            self.skipTest("NumPy is not installed")
+        imported = self.env['hr.attendance'].import_punches(self._get_punches(self.employee))
+        with patch.object(attendance_module, 'np', None):
+            computed = self.env['hr.attendance'].import_punches(self._get_punches(self.employee_2))
+        self.assertEqual(self._read_results(imported), self._read_results(computed))
+
+    def test_import_punches_local_time(self):
+        """Lateness is evaluated in the employee's timezone"""
+        if not attendance_module.np:
+            self.skipTest("NumPy is not installed")
+        self.employee.tz = 'Asia/Kolkata'
+        # 03:45 UTC is 09:15 in Kolkata
+        attendance = self.env['hr.attendance'].import_punches([
+            (self.employee.id, datetime(2024, 1, 8, 3, 45), datetime(2024, 1, 8, 11, 45)),
+        ])
+        self.assertEqual(attendance.attendance_status, 'late')
+        self.assertEqual(attendance.late_minutes, 15)
+
+    def test_import_no_punches(self):
+        self.assertFalse(self.env['hr.attendance'].import_punches([]))
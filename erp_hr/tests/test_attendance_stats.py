@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime, timedelta
+
+from odoo.tests.common import tagged
+
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestAttendanceStats(TestErpHrCommon):
+
+    def _create_attendance(self, employee, check_in, check_out=False):
+        return self.env['hr.attendance'].create({
+            'employee_id': employee.id,
+            'check_in': check_in,
+            'check_out': check_out,
+        })
+
+    def test_working_days_count_distinct_closed_days(self):
+        """Worked days count each day with a closed attendance once"""
+        self._create_attendance(self.employee, datetime(2024, 1, 8, 9), datetime(2024, 1, 8, 12))
+        self._create_attendance(self.employee, datetime(2024, 1, 8, 13), datetime(2024, 1, 8, 17))
+        self._create_attendance(self.employee, datetime(2024, 1, 9, 9), datetime(2024, 1, 9, 17))
+        self._create_attendance(self.employee, datetime(2024, 1, 10, 9))
+        self._create_attendance(self.employee_2, datetime(2024, 1, 8, 9), datetime(2024, 1, 8, 17))
+
+        self.assertEqual(self.employee.total_working_days, 2)
+        self.assertEqual(self.employee_2.total_working_days, 1)
+
+    def test_working_days_follow_attendance_changes(self):
+        """The stored counter is recomputed when attendances are closed or removed"""
+        open_attendance = self._create_attendance(self.employee, datetime(2024, 1, 8, 9))
+        self.assertEqual(self.employee.total_working_days, 0)
+        open_attendance.check_out = datetime(2024, 1, 8, 17)
+        self.assertEqual(self.employee.total_working_days, 1)
+        open_attendance.unlink()
+        self.assertEqual(self.employee.total_working_days, 0)
+
+    def test_attendance_percentage(self):
+        """Attendance percentage relates worked days to days since joining"""
+        self.employee.date_of_joining = date.today() - timedelta(days=10)
+        self._create_attendance(self.employee, datetime(2024, 1, 8, 9), datetime(2024, 1, 8, 17))
+        self._create_attendance(self.employee, datetime(2024, 1, 9, 9), datetime(2024, 1, 9, 17))
+        self.assertAlmostEqual(self.employee.attendance_percentage, 20.0)
+
+        self.employee_2.date_of_joining = date.today()
+        self.assertEqual(self.employee_2.attendance_percentage, 0)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+from psycopg2 import IntegrityError
+
+from odoo.exceptions import ValidationError
+from odoo.tests.common import tagged
+from odoo.tools import mute_logger
+
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestEmployeeCode(TestErpHrCommon):
+
+    def test_find_duplicate_codes(self):
+        """Codes repeated in the batch and codes already used are reported together"""
+        duplicates = self.env['hr.employee']._find_duplicate_employee_codes(
+            ['NEW001', 'NEW002', 'NEW001', 'ERPTEST001', False])
+        self.assertEqual(duplicates, {'NEW001': 'batch', 'ERPTEST001': 'existing'})
+
+    def test_create_reports_all_duplicates(self):
+        with self.assertRaises(ValidationError) as error:
+            self.env['hr.employee'].create([
+                {'name': 'New One', 'employee_code': 'NEW001'},
+                {'name': 'New Two', 'employee_code': 'NEW001'},
+                {'name': 'New Three', 'employee_code': 'ERPTEST002'},
+            ])
+        self.assertIn('NEW001', str(error.exception))
+        self.assertIn('ERPTEST002', str(error.exception))
+
+        employees = self.env['hr.employee'].create([
+            {'name': 'New One', 'employee_code': 'NEW001'},
+            {'name': 'New Two', 'employee_code': 'NEW002'},
+        ])
+        self.assertEqual(len(employees), 2)
+
+    def test_archived_employee_codes(self):
+        """Archived employees keep their code reserved"""
+        self.employee_2.active = False
+        with self.assertRaises(ValidationError):
+            self.env['hr.employee'].create({'name': 'Reuse', 'employee_code': 'ERPTEST002'})
+
+    def test_import_reports_rows(self):
+        """Imports return one error per offending row instead of failing on the first"""
+        result = self.env['hr.employee'].load(['name', 'employee_code'], [
+            ['Import One', 'IMP001'],
+            ['Import Two', 'ERPTEST001'],
+            ['Import Three', 'IMP001'],
+            ['Import Four', 'IMP004'],
+        ])
+        self.assertFalse(result['ids'])
+        self.assertEqual([message['record'] for message in result['messages']], [0, 1, 2])
+        self.assertTrue(all(message['field'] == 'employee_code' for message in result['messages']))
+        self.assertFalse(self.env['hr.employee'].search([('employee_code', 'in', ['IMP001', 'IMP004'])]))
+
+        result = self.env['hr.employee'].load(['name', 'employee_code'], [
+            ['Import One', 'IMP001'],
+            ['Import Four', 'IMP004'],
+        ])
+        self.assertEqual(len(result['ids']), 2)
+
+    @mute_logger('odoo.sql_db')
+    def test_database_constraint(self):
+        """Codes changed through write are guarded by the unique constraint"""
+        with self.assertRaises(IntegrityError):
+            self.employee_2.employee_code = 'ERPTEST001'
+            self.env.flush_all()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, timedelta
+
+from odoo.tests.common import tagged
+
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestLeaveStats(TestErpHrCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestLeaveStats, cls).setUpClass()
+        cls.leave_type = cls.env['hr.leave.type'].create({
+            'name': 'ERP HR Test Leave',
+            'requires_allocation': 'no',
+            'leave_validation_type': 'hr',
+            'request_unit': 'day',
+        })
+        first_day = date(date.today().year, 2, 1)
+        cls.monday = first_day + timedelta(days=(7 - first_day.weekday()) % 7)
+
+    def _create_leave(self, employee, date_from, date_to, validate=True):
+        leave = self.env['hr.leave'].create({
+            'name': 'Test leave',
+            'leave_reason': 'Testing leave totals',
+            'employee_id': employee.id,
+            'holiday_status_id': self.leave_type.id,
+            'request_date_from': date_from,
+            'request_date_to': date_to,
+        })
+        if validate:
+            leave.action_validate()
+        return leave
+
+    def test_leave_totals(self):
+        """Totals sum validated leaves, the yearly figure only those of the current year"""
+        self._create_leave(self.employee, self.monday, self.monday + timedelta(days=2))
+        self._create_leave(self.employee, self.monday + timedelta(days=7), self.monday + timedelta(days=7))
+        self._create_leave(self.employee, self.monday - timedelta(weeks=52), self.monday - timedelta(weeks=52))
+        self._create_leave(self.employee, self.monday + timedelta(days=14), self.monday + timedelta(days=14),
+                           validate=False)
+        self._create_leave(self.employee_2, self.monday, self.monday)
+
+        employees = self.employee | self.employee_2
+        self.assertEqual(employees.mapped('total_leaves_taken'), [5, 1])
+        self.assertEqual(employees.mapped('leaves_taken_this_year'), [4.0, 1.0])
+
+    def test_yearly_leaves_follow_validation(self):
+        """Validating, refusing or deleting a leave updates the cached yearly breakdown"""
+        self._create_leave(self.employee, self.monday, self.monday)
+        self.assertEqual(self.employee.leaves_taken_this_year, 1.0)
+
+        leave = self._create_leave(self.employee, self.monday + timedelta(days=7), self.monday + timedelta(days=8),
+                                   validate=False)
+        self.employee.invalidate_recordset(['leaves_taken_this_year'])
+        self.assertEqual(self.employee.leaves_taken_this_year, 1.0)
+
+        leave.action_validate()
+        self.employee.invalidate_recordset(['leaves_taken_this_year'])
+        self.assertEqual(self.employee.leaves_taken_this_year, 3.0)
+
+        leave.write({'rejection_reason': 'Testing'})
+        leave.action_refuse()
+        self.employee.invalidate_recordset(['leaves_taken_this_year'])
+        self.assertEqual(self.employee.leaves_taken_this_year, 1.0)
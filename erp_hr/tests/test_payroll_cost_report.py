@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date
+
+from odoo.tests.common import tagged
+
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestPayrollCostReport(TestErpHrCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestPayrollCostReport, cls).setUpClass()
+        # 160 hourly units of 100: 8 overtime hours are paid 1200
+        cls.slip = cls._create_payslip(cls.employee, date(2024, 1, 1), overtime_hours=8.0)
+        cls.slip_2 = cls._create_payslip(cls.employee_2, date(2024, 1, 1))
+        cls.draft_slip = cls._create_payslip(cls.employee, date(2024, 2, 1))
+        (cls.slip | cls.slip_2).action_done()
+
+    @classmethod
+    def _create_payslip(cls, employee, date_from, **vals):
+        return cls.env['hr.payslip'].create(dict({
+            'employee_id': employee.id,
+            'date_from': date_from,
+            'date_to': date_from.replace(day=28),
+        }, **vals))
+
+    def _get_rows(self, month):
+        return self.env['hr.payroll.cost.report'].search([
+            ('month', '=', month),
+            ('department_id', '=', self.department.id),
+        ])
+
+    def test_full_rebuild(self):
+        """Done payslips are aggregated per month, department and job"""
+        self.env['hr.payroll.cost.report']._refresh_months()
+        row = self._get_rows(date(2024, 1, 1))
+        self.assertEqual(len(row), 1)
+        self.assertEqual(row.job_id, self.job)
+        self.assertEqual(row.payslip_count, 2)
+        self.assertAlmostEqual(row.overtime_hours, 8.0)
+        self.assertAlmostEqual(row.overtime_amount, 1200.0)
+        self.assertAlmostEqual(row.gross_salary, 33200.0)
+        self.assertAlmostEqual(row.overtime_share, 1200.0 / 33200.0 * 100)
+        self.assertFalse(self._get_rows(date(2024, 2, 1)))
+
+    def test_payslip_changes_refresh_months(self):
+        """Validating, editing or deleting done payslips refreshes their month"""
+        self.draft_slip.action_done()
+        self.assertEqual(self._get_rows(date(2024, 2, 1)).payslip_count, 1)
+
+        self.slip.bonus = 800.0
+        self.assertAlmostEqual(self._get_rows(date(2024, 1, 1)).gross_salary, 34000.0)
+
+        self.slip.date_from = date(2024, 2, 1)
+        self.assertEqual(self._get_rows(date(2024, 1, 1)).payslip_count, 1)
+        self.assertEqual(self._get_rows(date(2024, 2, 1)).payslip_count, 2)
+
+        self.draft_slip.unlink()
+        self.assertEqual(self._get_rows(date(2024, 2, 1)).payslip_count, 1)
+
+    def test_employee_changes_refresh_months(self):
+        """Salary and department changes of employees reach the report"""
+        self.env['hr.payroll.cost.report']._refresh_months()
+        self.employee_2.basic_salary = 20000.0
+        self.assertAlmostEqual(self._get_rows(date(2024, 1, 1)).gross_salary, 37200.0)
+
+        other_department = self.env['hr.department'].create({'name': 'ERP HR Other Department'})
+        self.employee_2.department_id = other_department
+        self.assertEqual(self._get_rows(date(2024, 1, 1)).payslip_count, 1)
+
+    def test_grouped_overtime_share(self):
+        """Grouped overtime share is derived from summed amounts, not averaged"""
+        self.env['hr.payroll.cost.report']._refresh_months()
+        other_department = self.env['hr.department'].create({'name': 'ERP HR Other Department'})
+        self.employee_2.department_id = other_department
+
+        groups = self.env['hr.payroll.cost.report'].read_group(
+            [('month', '=', date(2024, 1, 1)), ('department_id', 'in', (self.department | other_department).ids)],
+            ['overtime_share', 'gross_salary:sum'], ['month'])
+        self.assertEqual(len(groups), 1)
+        self.assertAlmostEqual(groups[0]['gross_salary'], 33200.0)
+        self.assertAlmostEqual(groups[0]['overtime_share'], 1200.0 / 33200.0 * 100)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime
+
+from odoo.tests.common import tagged
+
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestPayrollRun(TestErpHrCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestPayrollRun, cls).setUpClass()
+        cls.sequence = cls.env['ir.sequence'].create({
+            'name': 'Test Payslip Sequence',
+            'code': 'hr.payslip',
+            'prefix': 'TSLIP/',
+            'padding': 4,
+            'company_id': cls.env.company.id,
+        })
+        cls.sub_department = cls.env['hr.department'].create({
+            'name': 'ERP HR Test Sub Department',
+            'parent_id': cls.department.id,
+        })
+        cls.employee_3 = cls._create_employee('Test Employee Three', 'ERPTEST003',
+                                              department_id=cls.sub_department.id)
+        cls.other_employee = cls._create_employee('Test Employee Elsewhere', 'ERPTEST004',
+                                                  department_id=False)
+        cls.run = cls.env['hr.payslip.run'].create({
+            'name': 'January 2024',
+            'date_from': date(2024, 1, 1),
+            'date_to': date(2024, 1, 31),
+            'department_id': cls.department.id,
+        })
+
+    def test_generate_payslips(self):
+        """One payslip per department employee, numbered from a reserved block"""
+        self.env['hr.attendance'].create([{
+            'employee_id': self.employee.id,
+            'check_in': datetime(2024, 1, day, 9),
+            'check_out': datetime(2024, 1, day, 19),
+        } for day in (8, 9)])
+
+        self.run.action_generate_payslips()
+
+        slips = self.run.slip_ids.sorted('name')
+        self.assertEqual(slips.employee_id, self.employee | self.employee_2 | self.employee_3)
+        self.assertEqual(self.run.state, 'generated')
+        self.assertEqual(self.run.payslip_count, 3)
+        self.assertEqual(set(slips.mapped('date_from')), {date(2024, 1, 1)})
+        numbers = [int(name.split('/')[-1]) for name in slips.mapped('name')]
+        self.assertTrue(all(name.startswith('TSLIP/') for name in slips.mapped('name')))
+        self.assertEqual(numbers, list(range(numbers[0], numbers[0] + 3)))
+        overtime = {slip.employee_id: slip.overtime_hours for slip in slips}
+        self.assertAlmostEqual(overtime[self.employee], 4.0)
+        self.assertAlmostEqual(overtime[self.employee_2], 0.0)
+        self.assertAlmostEqual(self.run.total_net_salary, sum(slips.mapped('net_salary')))
+
+    def test_generate_skips_existing_payslips(self):
+        """Employees already paid for the period are not paid twice"""
+        self.env['hr.payslip'].create({
+            'employee_id': self.employee.id,
+            'date_from': date(2024, 1, 15),
+            'date_to': date(2024, 2, 14),
+        })
+        self.run.action_generate_payslips()
+        self.assertEqual(self.run.slip_ids.employee_id, self.employee_2 | self.employee_3)
+
+        self.run.action_generate_payslips()
+        self.assertEqual(self.run.payslip_count, 2)
+
+    def test_reserve_names_no_gap(self):
+        """Reserved names continue the sequence of single payslips"""
+        names = self.env['hr.payslip']._reserve_names(3)
+        single = self.env['hr.payslip'].create({
+            'employee_id': self.employee.id,
+            'date_to': date.today(),
+        })
+        self.assertEqual(len(set(names)), 3)
+        self.assertEqual(int(single.name.split('/')[-1]), int(names[-1].split('/')[-1]) + 1)
+        self.assertEqual(self.env['hr.payslip']._reserve_names(0), [])
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+import os
+import zipfile
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.tests.common import tagged
+from odoo.tools.pdf import PdfFileReader, PdfFileWriter
+
+from odoo.addons.erp_hr.models import payslip_print
+from .common import TestErpHrCommon
+
+
+def _render_blank_chunk(job, payslip_ids, path):
+    """Stand-in for report rendering: one blank page per payslip"""
+    writer = PdfFileWriter()
+    for __ in payslip_ids:
+        writer.addBlankPage(72, 72)
+    with open(path, 'wb') as chunk_file:
+        writer.write(chunk_file)
+    return path
+
+
+@tagged('post_install', '-at_install')
+class TestPayslipPrint(TestErpHrCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestPayslipPrint, cls).setUpClass()
+        cls.payslips = cls.env['hr.payslip'].create([{
+            'employee_id': employee.id,
+            'date_from': date(2024, month, 1),
+            'date_to': date(2024, month, 28),
+        } for employee in (cls.employee, cls.employee_2) for month in (1, 2, 3)])
+
+    def setUp(self):
+        super(TestPayslipPrint, self).setUp()
+        # Jobs commit their progress; keep everything inside the test transaction
+        self.patch(self.env.cr, 'commit', lambda: None)
+        self.patch(type(self.env['hr.payslip.print.job']), '_render_chunk', _render_blank_chunk)
+
+    def _create_job(self, **vals):
+        job = self.env['hr.payslip.print.job'].create(dict({
+            'payslip_ids': [(6, 0, self.payslips.ids)],
+            'chunk_size': 4,
+            'worker_count': 2,
+        }, **vals))
+        self.addCleanup(lambda: os.path.exists(job.sudo().file_path or '') and os.remove(job.sudo().file_path))
+        return job
+
+    def _page_count(self, path):
+        with open(path, 'rb') as stream:
+            return PdfFileReader(stream, strict=False).getNumPages()
+
+    def test_zip_output(self):
+        """ZIP output holds one PDF per chunk"""
+        job = self._create_job()
+        self.env['hr.payslip.print.job'].cron_process_print_jobs()
+
+        self.assertEqual(job.state, 'done')
+        self.assertEqual((job.chunk_count, job.chunks_done, job.progress), (2, 2, 100.0))
+        self.assertTrue(job.file_name.endswith('.zip'))
+        with zipfile.ZipFile(job.sudo().file_path) as archive:
+            self.assertEqual(len(archive.namelist()), 2)
+        self.assertEqual(job.file_size, os.path.getsize(job.sudo().file_path))
+
+    def test_pdf_output(self):
+        """PDF output merges every chunk into one document"""
+        job = self._create_job(output_format='pdf')
+        self.env['hr.payslip.print.job'].cron_process_print_jobs()
+
+        self.assertEqual(job.state, 'done')
+        self.assertTrue(job.file_name.endswith('.pdf'))
+        self.assertEqual(self._page_count(job.sudo().file_path), len(self.payslips))
+
+    def test_pdf_output_capped(self):
+        """Runs above the merge limit are delivered as a ZIP even when a PDF is asked"""
+        job = self._create_job(output_format='pdf')
+        with patch.object(payslip_print, 'PDF_MERGE_MAX_PAYSLIPS', 4):
+            self.env['hr.payslip.print.job'].cron_process_print_jobs()
+        self.assertEqual(job.state, 'done')
+        self.assertTrue(job.file_name.endswith('.zip'))
+
+    def test_failed_render_cleanup(self):
+        """A rendering error leaves no chunk files behind"""
+        job = self._create_job()
+
+        def _render_error(job, payslip_ids, path):
+            raise ValueError("Rendering failed")
+
+        self.patch(type(job), '_render_chunk', _render_error)
+        with self.assertRaises(ValueError):
+            job._run()
+        self.assertFalse([name for name in os.listdir(job._get_output_dir()) if name.startswith(f'job_{job.id}_')])
+
+    def test_stale_running_jobs_fail(self):
+        """Running jobs without progress for too long are failed and can be retried"""
+        stale_job = self._create_job()
+        active_job = self._create_job()
+        (stale_job | active_job).write({'state': 'running'})
+        self.env.flush_all()
+        self.env.cr.execute("UPDATE hr_payslip_print_job SET write_date = %s WHERE id = %s", (
+            fields.Datetime.now() - timedelta(minutes=payslip_print.STALE_JOB_MINUTES + 5), stale_job.id))
+        (stale_job | active_job).invalidate_recordset()
+
+        self.env['hr.payslip.print.job']._fail_stale_jobs()
+        self.assertEqual(stale_job.state, 'failed')
+        self.assertEqual(active_job.state, 'running')
+
+        stale_job.action_retry()
+        self.assertEqual((stale_job.state, stale_job.chunks_done), ('queued', 0))
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+from odoo.tests.common import tagged
+
+from .common import TestErpHrCommon
+
+
+@tagged('post_install', '-at_install')
+class TestScheduleTable(TestErpHrCommon):
+
+    def test_compiled_schedule(self):
+        """Each weekday is compiled to its first start hour and total working hours"""
+        table = self.env['resource.calendar']._get_schedule_table()
+        self.assertEqual(table[self.calendar.id], ('UTC', ((9.0, 8.0),) * 5 + (None, None)))
+
+    def test_schedule_table_invalidation(self):
+        """Changing working hours or the timezone is reflected in the compiled table"""
+        self.env['resource.calendar']._get_schedule_table()
+        monday_morning = self.calendar.attendance_ids.filtered(
+            lambda line: line.dayofweek == '0' and line.day_period == 'morning')
+        monday_morning.hour_from = 10.0
+        self.calendar.tz = 'Europe/Brussels'
+        self.env['resource.calendar.attendance'].create({
+            'name': 'Saturday morning',
+            'calendar_id': self.calendar.id,
+            'dayofweek': '5',
+            'hour_from': 8.0,
+            'hour_to': 12.0,
+            'day_period': 'morning',
+        })
+
+        tz, days = self.env['resource.calendar']._get_schedule_table()[self.calendar.id]
+        self.assertEqual(tz, 'Europe/Brussels')
+        self.assertEqual(days[0], (10.0, 7.0))
+        self.assertEqual(days[5], (8.0, 4.0))
+
+    def test_lateness_uses_schedule(self):
+        """Lateness and overtime of attendances follow the compiled schedule"""
+        monday_morning = self.calendar.attendance_ids.filtered(
+            lambda line: line.dayofweek == '0' and line.day_period == 'morning')
+        monday_morning.hour_from = 10.0
+        attendance = self.env['hr.attendance'].create({
+            'employee_id': self.employee.id,
+            'check_in': datetime(2024, 1, 8, 9, 45),
+            'check_out': datetime(2024, 1, 8, 17, 45),
+        })
+        self.assertFalse(attendance.is_late)
+        self.assertAlmostEqual(attendance.overtime_hours, 1.0)
+
+        sunday = self.env['hr.attendance'].create({
+            'employee_id': self.employee.id,
+            'check_in': datetime(2024, 1, 14, 9, 0),
+            'check_out': datetime(2024, 1, 14, 11, 0),
+        })
+        self.assertFalse(sunday.is_late)
+        self.assertAlmostEqual(sunday.overtime_hours, 2.0)
@@ -23,9 +23,13 @@
         'views/product_views.xml',
         'views/warehouse_views.xml',
         'views/stock_move_views.xml',
+        'views/stock_alert_views.xml',
+        'views/stock_expiry_views.xml',
+        'reports/inventory_report.xml',
         'views/menu_views.xml',
         'data/product_category_data.xml',
-        'reports/inventory_report.xml',
+        'data/stock_removal_data.xml',
+        'data/inventory_cron.xml',
     ],
     'demo': [],
     'installable': True,
@@ -3,3 +3,9 @@
 from . import product
 from . import warehouse
 from . import stock_move
+from . import stock_move_cost_report
+from . import delivery_eta
+from . import stock_status
+from . import stock_alert
+from . import stock_expiry
+from . import scan_resolver
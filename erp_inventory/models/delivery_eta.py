@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+ETA_HISTORY_DAYS = 180
+ETA_MIN_SAMPLES = 5
+
+# GROUPING() bitmask of (picking type, vehicle, region) for each grouping set
+GROUPING_DIMENSIONS = {3: 'route', 5: 'vehicle', 6: 'region', 7: 'all'}
+
+
+class StockDeliveryEta(models.Model):
+    _name = 'stock.delivery.eta'
+    _description = 'Delivery Delay Statistics'
+    _order = 'dimension, sample_count desc'
+
+    dimension = fields.Selection([
+        ('route', 'Route'),
+        ('vehicle', 'Vehicle'),
+        ('region', 'Region'),
+        ('all', 'All Deliveries'),
+    ], string='Dimension', required=True, readonly=True)
+    picking_type_id = fields.Many2one('stock.picking.type', string='Route', readonly=True, ondelete='cascade')
+    vehicle_number = fields.Char('Vehicle Number', readonly=True)
+    state_id = fields.Many2one('res.country.state', string='Region', readonly=True, ondelete='cascade')
+
+    sample_count = fields.Integer('Deliveries', readonly=True)
+    mean_delay = fields.Float('Mean Delay (hours)', readonly=True)
+    median_delay = fields.Float('Median Delay (hours)', readonly=True)
+    p90_delay = fields.Float('90th Percentile Delay (hours)', readonly=True)
+    stddev_delay = fields.Float('Delay Std Deviation (hours)', readonly=True)
+
+    @api.model
+    def _fit(self, days=ETA_HISTORY_DAYS):
+        """Fit delay distributions per route, vehicle and region in one grouped query
+
+        The delay of a completed delivery is the time between its actual
+        delivery date and its estimated date, or its scheduled date when no
+        estimate was given.
+
+        Returns:
+            number of fitted rows
+        """
+        self.env['stock.picking'].flush_model(['state', 'picking_type_id', 'vehicle_number', 'partner_id',
+                                               'scheduled_date', 'estimated_delivery_date', 'actual_delivery_date'])
+        self.env.cr.execute("""
+            WITH delays AS (
+                SELECT picking.picking_type_id,
+                       picking.vehicle_number,
+                       partner.state_id,
+                       EXTRACT(EPOCH FROM picking.actual_delivery_date
+                               - COALESCE(picking.estimated_delivery_date, picking.scheduled_date))::float / 3600 AS delay
+                  FROM stock_picking picking
+             LEFT JOIN res_partner partner ON partner.id = picking.partner_id
+                 WHERE picking.state = 'done'
+                   AND picking.actual_delivery_date IS NOT NULL
+                   AND picking.actual_delivery_date >= %s
+            )
+            SELECT GROUPING(picking_type_id, vehicle_number, state_id),
+                   picking_type_id, vehicle_number, state_id,
+                   COUNT(*),
+                   AVG(delay),
+                   PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY delay),
+                   PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY delay),
+                   COALESCE(STDDEV_SAMP(delay), 0)
+              FROM delays
+          GROUP BY GROUPING SETS ((picking_type_id), (vehicle_number), (state_id), ())
+        """, [fields.Datetime.now() - timedelta(days=days)])
+
+        vals_list = []
+        for grouping, type_id, vehicle, state_id, count, mean, median, p90, stddev in self.env.cr.fetchall():
+            dimension = GROUPING_DIMENSIONS[grouping]
+            if dimension != 'all' and not (type_id or vehicle or state_id):
+                continue
+            vals_list.append({
+                'dimension': dimension,
+                'picking_type_id': type_id,
+                'vehicle_number': vehicle,
+                'state_id': state_id,
+                'sample_count': count,
+                'mean_delay': mean,
+                'median_delay': median,
+                'p90_delay': p90,
+                'stddev_delay': stddev,
+            })
+
+        self.search([]).unlink()
+        self.create(vals_list)
+        return len(vals_list)
+
+    @api.model
+    def _get_delay_table(self):
+        """Median delay in hours per (dimension, key), for distributions with enough samples
+
+        The table holds a few rows per route, vehicle and region; callers read it
+        once per recordset, so fits need no cache invalidation.
+        """
+        table = {}
+        for stat in self.search_read([('sample_count', '>=', ETA_MIN_SAMPLES)],
+                                     ['dimension', 'picking_type_id', 'vehicle_number', 'state_id', 'median_delay']):
+            key = {
+                'route': stat['picking_type_id'] and stat['picking_type_id'][0],
+                'vehicle': stat['vehicle_number'],
+                'region': stat['state_id'] and stat['state_id'][0],
+                'all': None,
+            }[stat['dimension']]
+            table[stat['dimension'], key] = stat['median_delay']
+        return table
+
+    @api.model
+    def _get_expected_delay(self, picking_type_id, vehicle_number, state_id, table=None):
+        """Expected delay in hours, from the most specific fitted distribution
+
+        Vehicle statistics are preferred over region, then route, then all deliveries.
+        """
+        if table is None:
+            table = self._get_delay_table()
+        for key in (('vehicle', vehicle_number), ('region', state_id), ('route', picking_type_id), ('all', None)):
+            if key in table:
+                return table[key]
+        return 0.0
+
+    @api.model
+    def cron_fit_delivery_eta(self):
+        """Cron job to refit delivery delay distributions"""
+        count = self._fit()
+        _logger.info(f"Delivery ETA model fitted {count} delay distributions")
+        return True
+
+
+class StockPicking(models.Model):
+    _inherit = 'stock.picking'
+
+    predicted_delivery_date = fields.Datetime('Predicted Delivery Date', compute='_compute_predicted_delivery_date',
+                                              store=True, help="Estimated or scheduled date plus the expected delay "
+                                                               "learned from past deliveries")
+
+    @api.depends('state', 'scheduled_date', 'estimated_delivery_date', 'picking_type_id',
+                 'vehicle_number', 'partner_id.state_id')
+    def _compute_predicted_delivery_date(self):
+        """Stamp the predicted delivery date while the picking is open"""
+        eta_model = self.env['stock.delivery.eta'].sudo()
+        table = eta_model._get_delay_table()
+        for picking in self:
+            if picking.state == 'draft':
+                picking.predicted_delivery_date = False
+            elif picking.state in ('done', 'cancel'):
+                picking.predicted_delivery_date = picking.predicted_delivery_date
+            else:
+                base_date = picking.estimated_delivery_date or picking.scheduled_date
+                delay = eta_model._get_expected_delay(picking.picking_type_id.id, picking.vehicle_number or False,
+                                                      picking.partner_id.state_id.id, table)
+                picking.predicted_delivery_date = base_date and base_date + timedelta(hours=delay)
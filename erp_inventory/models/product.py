@@ -8,8 +8,8 @@ class ProductTemplate(models.Model):
     _inherit = 'product.template'
 
     # Additional fields for inventory management
-    barcode = fields.Char('Barcode', copy=False, help="Product barcode for scanning")
-    qr_code = fields.Char('QR Code', copy=False, help="Product QR code")
+    barcode = fields.Char('Barcode', copy=False, index=True, help="Product barcode for scanning")
+    qr_code = fields.Char('QR Code', copy=False, index=True, help="Product QR code")
     min_stock_level = fields.Float('Minimum Stock Level', default=10.0, 
                                    help="Alert when stock falls below this level")
     max_stock_level = fields.Float('Maximum Stock Level', default=100.0,
@@ -17,29 +17,28 @@ class ProductTemplate(models.Model):
     reorder_quantity = fields.Float('Reorder Quantity', default=20.0,
                                     help="Suggested quantity to reorder")
     warehouse_location = fields.Char('Warehouse Location', help="Physical location in warehouse")
-    is_low_stock = fields.Boolean('Low Stock Alert', compute='_compute_low_stock', store=True)
+    # Maintained by _refresh_stock_status on stock moves and by a periodic sweep
+    is_low_stock = fields.Boolean('Low Stock Alert', readonly=True, index=True)
     stock_status = fields.Selection([
         ('in_stock', 'In Stock'),
         ('low_stock', 'Low Stock'),
         ('out_of_stock', 'Out of Stock'),
-    ], string='Stock Status', compute='_compute_stock_status', store=True)
+    ], string='Stock Status', readonly=True, index=True)
     
-    @api.depends('qty_available', 'min_stock_level')
-    def _compute_low_stock(self):
-        """Check if product stock is below minimum level"""
-        for product in self:
-            product.is_low_stock = product.qty_available < product.min_stock_level
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Initialize stock status of new products"""
+        templates = super(ProductTemplate, self).create(vals_list)
+        if templates:
+            templates._refresh_stock_status()
+        return templates
     
-    @api.depends('qty_available', 'min_stock_level')
-    def _compute_stock_status(self):
-        """Compute current stock status"""
-        for product in self:
-            if product.qty_available <= 0:
-                product.stock_status = 'out_of_stock'
-            elif product.qty_available < product.min_stock_level:
-                product.stock_status = 'low_stock'
-            else:
-                product.stock_status = 'in_stock'
+    def write(self, vals):
+        """Refresh stock status when thresholds change"""
+        res = super(ProductTemplate, self).write(vals)
+        if self and ('min_stock_level' in vals or 'type' in vals):
+            self._refresh_stock_status()
+        return res
     
     @api.constrains('min_stock_level', 'max_stock_level')
     def _check_stock_levels(self):
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api, tools
+
+
+class StockScanResolver(models.AbstractModel):
+    _name = 'stock.scan.resolver'
+    _description = 'Barcode Scan Resolver'
+
+    @api.model
+    def _query_codes(self, codes):
+        """Look up codes on the indexed code columns with a single query
+
+        Returns:
+            dict mapping each found code to (model name, record id)
+        """
+        self.env['product.template'].flush_model(['barcode', 'qr_code', 'active'])
+        self.env['stock.location'].flush_model(['barcode', 'active'])
+        codes = tuple(codes)
+        self.env.cr.execute("""
+            SELECT barcode, 'product.template', id, 1 FROM product_template WHERE barcode IN %(codes)s AND active
+             UNION ALL
+            SELECT qr_code, 'product.template', id, 2 FROM product_template WHERE qr_code IN %(codes)s AND active
+             UNION ALL
+            SELECT barcode, 'stock.location', id, 3 FROM stock_location WHERE barcode IN %(codes)s AND active
+          ORDER BY 4, 3
+        """, {'codes': codes})
+        found = {}
+        for code, model_name, record_id, __ in self.env.cr.fetchall():
+            found.setdefault(code, (model_name, record_id))
+        return found
+
+    @api.model
+    @tools.ormcache('code')
+    def _resolve_code_cached(self, code):
+        """Cached (model name, record id) of a code, or None when unknown"""
+        return self._query_codes([code]).get(code)
+
+    @api.model
+    def resolve_code(self, code):
+        """Resolve one scanned code to a product or location
+
+        Served from the in-memory cache after the first scan of a code, until
+        product or location codes change.
+
+        Returns:
+            dict with 'model' and 'id', or False when the code is unknown
+        """
+        code = (code or '').strip()
+        if not code:
+            return False
+        result = self._resolve_code_cached(code)
+        return {'model': result[0], 'id': result[1]} if result else False
+
+    @api.model
+    def resolve_codes(self, codes):
+        """Resolve a list of scanned codes with one indexed query
+
+        Returns:
+            dict mapping each scanned code to {'model', 'id'}, or False when unknown
+        """
+        cleaned = {code: (code or '').strip() for code in codes}
+        lookup = {code for code in cleaned.values() if code}
+        found = self._query_codes(lookup) if lookup else {}
+        return {
+            code: {'model': found[key][0], 'id': found[key][1]} if key in found else False
+            for code, key in cleaned.items()
+        }
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidate the scan cache when products with codes are created"""
+        templates = super(ProductTemplate, self).create(vals_list)
+        if any({'barcode', 'qr_code'} & set(vals) for vals in vals_list):
+            self.env.registry.clear_cache()
+        return templates
+
+    def write(self, vals):
+        """Invalidate the scan cache when codes change"""
+        res = super(ProductTemplate, self).write(vals)
+        if {'barcode', 'qr_code', 'active'} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        """Invalidate the scan cache when records with codes are deleted"""
+        has_codes = any(template.barcode or template.qr_code for template in self)
+        res = super(ProductTemplate, self).unlink()
+        if has_codes:
+            self.env.registry.clear_cache()
+        return res
+
+
+class StockLocation(models.Model):
+    _inherit = 'stock.location'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Invalidate the scan cache when locations with codes are created"""
+        locations = super(StockLocation, self).create(vals_list)
+        if any(vals.get('barcode') for vals in vals_list):
+            self.env.registry.clear_cache()
+        return locations
+
+    def write(self, vals):
+        """Invalidate the scan cache when codes change"""
+        res = super(StockLocation, self).write(vals)
+        if {'barcode', 'active'} & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        """Invalidate the scan cache when records with codes are deleted"""
+        has_codes = any(self.mapped('barcode'))
+        res = super(StockLocation, self).unlink()
+        if has_codes:
+            self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+
+
+class StockLowStockAlert(models.Model):
+    _name = 'stock.low.stock.alert'
+    _description = 'Low Stock Alert'
+    _order = 'id desc'
+
+    product_tmpl_id = fields.Many2one('product.template', string='Product', required=True,
+                                      index=True, ondelete='cascade')
+    alert_type = fields.Selection([
+        ('low_stock', 'Low Stock'),
+        ('out_of_stock', 'Out of Stock'),
+    ], string='Alert Type', required=True)
+    on_hand_qty = fields.Float('On Hand', readonly=True)
+    min_stock_level = fields.Float('Minimum Stock Level', readonly=True)
+    reorder_quantity = fields.Float('Reorder Quantity', related='product_tmpl_id.reorder_quantity')
+    state = fields.Selection([
+        ('open', 'Open'),
+        ('resolved', 'Resolved'),
+    ], string='Status', default='open', required=True, index=True)
+    resolved_date = fields.Datetime('Resolved Date', readonly=True)
+
+    def init(self):
+        """At most one open alert per product"""
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS stock_low_stock_alert_open_uniq
+                ON stock_low_stock_alert (product_tmpl_id)
+             WHERE state = 'open'
+        """)
+        self.env.cr.execute("DROP INDEX IF EXISTS stock_low_stock_alert_unconsumed_index")
+
+    @api.model
+    def _record_status_changes(self, changes, quantities):
+        """Open or resolve alerts for products whose stock status changed
+
+        Products getting their first status, such as new products, raise no alert.
+
+        Args:
+            changes: dict mapping template id to (old status, new status)
+            quantities: dict mapping template id to on-hand quantity
+        """
+        changes = {template_id: change for template_id, change in changes.items() if change[0]}
+        if not changes:
+            return
+        open_alerts = {
+            alert.product_tmpl_id.id: alert
+            for alert in self.search([('product_tmpl_id', 'in', list(changes)), ('state', '=', 'open')])
+        }
+        templates = self.env['product.template'].browse(list(changes))
+
+        to_resolve = self.browse()
+        rows = []
+        for template in templates:
+            new_status = changes[template.id][1]
+            alert = open_alerts.get(template.id)
+            if alert and alert.alert_type == new_status:
+                continue
+            if alert:
+                to_resolve |= alert
+            if new_status in ('low_stock', 'out_of_stock'):
+                rows.append((template.id, new_status, quantities.get(template.id, 0.0),
+                             template.min_stock_level, self.env.uid, self.env.uid))
+
+        if to_resolve:
+            to_resolve.write({'state': 'resolved', 'resolved_date': fields.Datetime.now()})
+            # Free the open-alert index slot before inserting replacements
+            to_resolve.flush_recordset(['state'])
+        if rows:
+            # A concurrent validation may have opened the same alert: keep theirs
+            row_template = "(%s, %s, %s, %s, 'open', %s, %s, NOW() AT TIME ZONE 'UTC', NOW() AT TIME ZONE 'UTC')"
+            self.env.cr.execute(f"""
+                INSERT INTO stock_low_stock_alert (
+                    product_tmpl_id, alert_type, on_hand_qty, min_stock_level, state,
+                    create_uid, write_uid, create_date, write_date
+                )
+                VALUES {", ".join([row_template] * len(rows))}
+                ON CONFLICT (product_tmpl_id) WHERE state = 'open' DO NOTHING
+            """, [value for row in rows for value in row])
+            self.invalidate_model()
+
+    @api.model
+    def fetch_alerts(self, consumer, limit=1000):
+        """Alerts a consumer has not acknowledged yet, for incremental consumers
+
+        Every consumer keeps its own acknowledgements: alert ids are not
+        allocated in commit order, so an id cursor would skip alerts.
+
+        Args:
+            consumer: name identifying the consumer of the feed
+            limit: maximum number of alerts to return
+
+        Returns:
+            list of alerts not acknowledged by the consumer, oldest first
+        """
+        self.env['stock.low.stock.alert.ack'].flush_model()
+        self.env.cr.execute("""
+            SELECT alert.id
+              FROM stock_low_stock_alert alert
+             WHERE NOT EXISTS (
+                   SELECT 1 FROM stock_low_stock_alert_ack ack
+                    WHERE ack.alert_id = alert.id AND ack.consumer = %s
+             )
+          ORDER BY alert.id
+             LIMIT %s
+        """, [consumer, limit])
+        alert_ids = [row[0] for row in self.env.cr.fetchall()]
+        return self.browse(alert_ids).read(
+            ['product_tmpl_id', 'alert_type', 'on_hand_qty', 'min_stock_level', 'state', 'create_date'])
+
+    @api.model
+    def ack_alerts(self, consumer, alert_ids):
+        """Acknowledge alerts for a consumer, so they are not fetched by it again"""
+        if not alert_ids:
+            return True
+        self.check_access_rights('read')
+        self.env.cr.execute("""
+            INSERT INTO stock_low_stock_alert_ack (alert_id, consumer, create_uid, create_date, write_uid, write_date)
+            SELECT id, %(consumer)s, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM stock_low_stock_alert
+             WHERE id IN %(ids)s
+            ON CONFLICT (alert_id, consumer) DO NOTHING
+        """, {'consumer': consumer, 'ids': tuple(alert_ids), 'uid': self.env.uid})
+        return True
+
+    def action_resolve(self):
+        """Resolve alert manually"""
+        self.filtered(lambda alert: alert.state == 'open').write({
+            'state': 'resolved',
+            'resolved_date': fields.Datetime.now(),
+        })
+
+    def action_generate_reorder_suggestion(self):
+        """Open the reorder suggestion of the product"""
+        self.ensure_one()
+        return self.product_tmpl_id.action_generate_reorder_suggestion()
+
+
+class StockLowStockAlertAck(models.Model):
+    _name = 'stock.low.stock.alert.ack'
+    _description = 'Low Stock Alert Acknowledgement'
+
+    alert_id = fields.Many2one('stock.low.stock.alert', string='Alert', required=True, ondelete='cascade')
+    consumer = fields.Char('Consumer', required=True)
+
+    _sql_constraints = [
+        ('alert_consumer_uniq', 'unique(alert_id, consumer)', 'An alert is acknowledged once per consumer!'),
+    ]
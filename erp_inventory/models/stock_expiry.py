@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+EXPIRY_ALERT_DAYS = 30
+# Removal strategy method reserving quants by their expiry date
+FEFO_REMOVAL = 'expiry_fefo'
+
+
+class StockQuant(models.Model):
+    _inherit = 'stock.quant'
+
+    def init(self):
+        """Indexes for FEFO reservation and near-expiry range scans"""
+        super(StockQuant, self).init()
+        self.env.cr.execute("DROP INDEX IF EXISTS stock_quant_product_location_expiry_index")
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS stock_quant_product_expiry_index
+                ON stock_quant (product_id, expiry_date, in_date, id)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS stock_quant_expiry_date_index
+                ON stock_quant (expiry_date)
+             WHERE expiry_date IS NOT NULL
+        """)
+
+    @api.model
+    def _get_removal_strategy_order(self, removal_strategy):
+        """Earliest-expiring quants first, then quants without expiry date, older stock first"""
+        if removal_strategy == FEFO_REMOVAL:
+            return 'expiry_date, in_date, id'
+        return super(StockQuant, self)._get_removal_strategy_order(removal_strategy)
+
+
+class StockExpiryAlert(models.Model):
+    _name = 'stock.expiry.alert'
+    _description = 'Stock Expiry Alert'
+    _order = 'expiry_date, id'
+
+    quant_id = fields.Many2one('stock.quant', string='Quant', required=True, index=True, ondelete='cascade')
+    product_id = fields.Many2one('product.product', string='Product', readonly=True, ondelete='cascade')
+    location_id = fields.Many2one('stock.location', string='Location', readonly=True, ondelete='cascade')
+    warehouse_id = fields.Many2one('stock.warehouse', related='location_id.warehouse_id', store=True)
+    batch_number = fields.Char('Batch Number', readonly=True)
+    expiry_date = fields.Date('Expiry Date', readonly=True, index=True)
+    quantity = fields.Float('Quantity', readonly=True)
+    state = fields.Selection([
+        ('open', 'Open'),
+        ('resolved', 'Resolved'),
+    ], string='Status', default='open', required=True, index=True)
+    resolved_date = fields.Datetime('Resolved Date', readonly=True)
+
+    def init(self):
+        """At most one open alert per quant"""
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS stock_expiry_alert_open_uniq
+                ON stock_expiry_alert (quant_id)
+             WHERE state = 'open'
+        """)
+
+    @api.model
+    def _sweep(self, days=EXPIRY_ALERT_DAYS):
+        """Raise alerts for internal stock expiring within a number of days
+
+        New alerts come from one range scan on the quant expiry date, skipping
+        quants already alerted for the same date; open alerts whose quant was
+        emptied or whose expiry date changed are resolved.
+
+        Returns:
+            tuple of (number of alerts raised, number of alerts resolved)
+        """
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity', 'expiry_date', 'batch_number'])
+        self.env['stock.location'].flush_model(['usage', 'warehouse_id'])
+        limit_date = fields.Date.context_today(self) + timedelta(days=days)
+        params = {'limit_date': limit_date, 'uid': self.env.uid}
+
+        self.env.cr.execute("""
+            UPDATE stock_expiry_alert alert
+               SET state = 'resolved',
+                   resolved_date = NOW() AT TIME ZONE 'UTC',
+                   write_uid = %(uid)s,
+                   write_date = NOW() AT TIME ZONE 'UTC'
+              FROM stock_quant quant
+             WHERE alert.quant_id = quant.id
+               AND alert.state = 'open'
+               AND (quant.quantity <= 0 OR quant.expiry_date IS DISTINCT FROM alert.expiry_date
+                    OR quant.expiry_date > %(limit_date)s)
+        """, params)
+        resolved = self.env.cr.rowcount
+
+        self.env.cr.execute("""
+            INSERT INTO stock_expiry_alert (
+                quant_id, product_id, location_id, warehouse_id, batch_number,
+                expiry_date, quantity, state,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT quant.id, quant.product_id, quant.location_id, location.warehouse_id, quant.batch_number,
+                   quant.expiry_date, quant.quantity, 'open',
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM stock_quant quant
+              JOIN stock_location location ON location.id = quant.location_id
+             WHERE quant.expiry_date <= %(limit_date)s
+               AND quant.quantity > 0
+               AND location.usage = 'internal'
+               AND NOT EXISTS (
+                   SELECT 1 FROM stock_expiry_alert alert
+                    WHERE alert.quant_id = quant.id AND alert.expiry_date = quant.expiry_date
+               )
+            ON CONFLICT (quant_id) WHERE state = 'open' DO NOTHING
+        """, params)
+        raised = self.env.cr.rowcount
+        self.invalidate_model()
+        return raised, resolved
+
+    @api.model
+    def cron_expiry_sweep(self, days=EXPIRY_ALERT_DAYS):
+        """Cron job to raise near-expiry alerts"""
+        raised, resolved = self._sweep(days)
+        _logger.info(f"Expiry sweep raised {raised} alerts and resolved {resolved}")
+        return True
+
+    def action_resolve(self):
+        """Resolve alert manually"""
+        self.filtered(lambda alert: alert.state == 'open').write({
+            'state': 'resolved',
+            'resolved_date': fields.Datetime.now(),
+        })
@@ -1,21 +1,32 @@
 # -*- coding: utf-8 -*-
 
+import logging
+import threading
+
 from odoo import models, fields, api
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+DELIVERY_BATCH_SIZE = 50
+
+
+MOVE_REASONS = [
+    ('sale', 'Sale Order'),
+    ('purchase', 'Purchase Order'),
+    ('adjustment', 'Inventory Adjustment'),
+    ('return', 'Return'),
+    ('transfer', 'Internal Transfer'),
+    ('manufacturing', 'Manufacturing'),
+    ('scrap', 'Scrap'),
+]
 
 
 class StockMove(models.Model):
     _inherit = 'stock.move'
 
     # Additional tracking fields
-    move_reason = fields.Selection([
-        ('sale', 'Sale Order'),
-        ('purchase', 'Purchase Order'),
-        ('adjustment', 'Inventory Adjustment'),
-        ('return', 'Return'),
-        ('transfer', 'Internal Transfer'),
-        ('manufacturing', 'Manufacturing'),
-        ('scrap', 'Scrap'),
-    ], string='Move Reason', default='adjustment')
+    move_reason = fields.Selection(MOVE_REASONS, string='Move Reason', default='adjustment')
     
     approved_by = fields.Many2one('res.users', string='Approved By')
     approval_date = fields.Datetime('Approval Date')
@@ -28,6 +39,16 @@ class StockMove(models.Model):
         """Calculate the cost impact of this stock move"""
         for move in self:
             move.cost_impact = move.product_uom_qty * move.product_id.standard_price
+    
+    def _action_done(self, cancel_backorder=False):
+        """Refresh stock status of the moved products and warehouse utilization"""
+        moves = super(StockMove, self)._action_done(cancel_backorder=cancel_backorder)
+        templates = moves.product_id.product_tmpl_id
+        if templates:
+            templates.sudo()._refresh_stock_status()
+        self.env['stock.warehouse'].sudo()._add_moved_volume(moves)
+        self.env['stock.move.cost.report'].sudo()._add_late_moves(moves.ids)
+        return moves
 
 
 class StockPicking(models.Model):
@@ -48,7 +69,84 @@ class StockPicking(models.Model):
     actual_delivery_date = fields.Datetime('Actual Delivery Date')
     
     def action_confirm_delivery(self):
-        """Confirm delivery and set actual delivery date"""
-        self.ensure_one()
-        self.actual_delivery_date = fields.Datetime.now()
-        return self.button_validate()
+        """Confirm delivery and set actual delivery date
+
+        A single picking goes through the regular validation, wizards included.
+        Several pickings are validated in batches. The delivery date is only
+        stamped on pickings that end up done.
+        """
+        pickings = self.filtered(lambda picking: picking.state not in ('done', 'cancel'))
+        if len(self) == 1:
+            res = self.button_validate()
+            if self.state == 'done':
+                self.write({'actual_delivery_date': fields.Datetime.now()})
+                self._on_delivery_confirmed()
+            return res
+
+        validated, failed = pickings._validate_deliveries_in_batches()
+        message = f'{len(validated)} deliveries confirmed'
+        if failed:
+            message += f', {len(failed)} failed: {", ".join(failed.mapped("name"))}'
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Deliveries Confirmed',
+                'message': message,
+                'type': 'warning' if failed else 'success',
+                'sticky': bool(failed),
+            }
+        }
+
+    def _validate_deliveries_in_batches(self):
+        """Validate pickings batch by batch, committing after each batch
+
+        A failing batch is rolled back and retried picking by picking so one
+        faulty delivery does not block the others.
+
+        Returns:
+            tuple of (validated pickings, failed pickings)
+        """
+        batch_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'erp_inventory.delivery_confirm_batch_size', DELIVERY_BATCH_SIZE))
+        testing = getattr(threading.current_thread(), 'testing', False)
+        validated = self.browse()
+        failed = self.browse()
+        for index in range(0, len(self), batch_size):
+            batch = self[index:index + batch_size]
+            try:
+                with self.env.cr.savepoint():
+                    batch.with_context(skip_backorder=True)._validate_delivery_batch()
+                done = batch
+            except Exception:
+                done = self.browse()
+                for picking in batch:
+                    try:
+                        with self.env.cr.savepoint():
+                            picking.with_context(skip_backorder=True)._validate_delivery_batch()
+                        done |= picking
+                    except Exception as e:
+                        _logger.warning(f"Delivery confirmation failed for {picking.name}: {e}")
+                        failed |= picking
+            if done:
+                done._on_delivery_confirmed()
+            validated |= done
+            if not testing:
+                self.env.cr.commit()
+        return validated, failed
+
+    def _validate_delivery_batch(self):
+        """Validate pickings without interactive wizards, failing if one is required
+
+        The delivery date is stamped here, so it is rolled back with the
+        savepoint of a failed validation.
+        """
+        res = self.button_validate()
+        if isinstance(res, dict) or any(picking.state != 'done' for picking in self):
+            raise UserError(f"Validation of {', '.join(self.mapped('name'))} needs user input")
+        self.write({'actual_delivery_date': fields.Datetime.now()})
+        self.flush_model()
+
+    def _on_delivery_confirmed(self):
+        """Hook called once per batch of pickings validated as delivered"""
+        return True
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import models, fields, api
+
+from .stock_move import MOVE_REASONS
+
+_logger = logging.getLogger(__name__)
+
+LAST_MOVE_PARAM = 'erp_inventory.move_cost_report_last_move_id'
+BATCH_SIZE = 100000
+
+
+class StockMoveCostReport(models.Model):
+    _name = 'stock.move.cost.report'
+    _description = 'Stock Move Cost Analysis'
+    _order = 'day desc, product_id'
+
+    day = fields.Date('Day', readonly=True, index=True)
+    product_id = fields.Many2one('product.product', string='Product', readonly=True, ondelete='cascade')
+    product_tmpl_id = fields.Many2one('product.template', string='Product Template', readonly=True,
+                                      index=True, ondelete='cascade')
+    move_reason = fields.Selection(MOVE_REASONS, string='Move Reason', readonly=True)
+    warehouse_id = fields.Many2one('stock.warehouse', string='Warehouse', readonly=True, ondelete='cascade')
+    company_id = fields.Many2one('res.company', string='Company', readonly=True)
+    currency_id = fields.Many2one('res.currency', related='company_id.currency_id')
+
+    move_count = fields.Integer('Moves', readonly=True)
+    quantity = fields.Float('Quantity', readonly=True)
+    cost_impact = fields.Monetary('Cost Impact', readonly=True, currency_field='currency_id')
+
+    def init(self):
+        """One row per day, product, reason, warehouse and company"""
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS stock_move_cost_report_key_uniq
+                ON stock_move_cost_report (day, product_id, COALESCE(move_reason, ''),
+                                           COALESCE(warehouse_id, 0), company_id)
+        """)
+
+    @api.model
+    def _get_last_move_id(self, lock):
+        """Read the last processed move id, locking its parameter row
+
+        Folding new moves takes the lock exclusively while validations take it
+        shared, so a move is never skipped nor counted twice by both paths. A
+        validation whose snapshot predates a newer watermark fails to lock with
+        a serialization error, and is retried.
+
+        Returns:
+            the last processed move id, or None when the report was never built
+        """
+        self.env.cr.execute(f"""
+            SELECT value FROM ir_config_parameter WHERE key = %s FOR {lock}
+        """, [LAST_MOVE_PARAM])
+        row = self.env.cr.fetchone()
+        return int(row[0]) if row else None
+
+    @api.model
+    def _fold_moves(self, where, params):
+        """Add the aggregated cost impact of done moves matching a condition
+
+        Moves are summed in SQL; the cost of each product is read once per
+        company and applied to the group totals.
+        """
+        self.env['stock.move'].flush_model(['state', 'product_id', 'product_uom_qty', 'date',
+                                            'move_reason', 'location_id', 'location_dest_id', 'company_id'])
+        self.env.cr.execute(f"""
+            SELECT move.date::date,
+                   move.product_id,
+                   product.product_tmpl_id,
+                   move.move_reason,
+                   COALESCE(dest.warehouse_id, source.warehouse_id),
+                   move.company_id,
+                   COUNT(*),
+                   SUM(move.product_uom_qty)
+              FROM stock_move move
+              JOIN product_product product ON product.id = move.product_id
+              JOIN stock_location source ON source.id = move.location_id
+              JOIN stock_location dest ON dest.id = move.location_dest_id
+             WHERE move.state = 'done' AND {where}
+          GROUP BY 1, 2, 3, 4, 5, 6
+        """, params)
+        groups = self.env.cr.fetchall()
+        if not groups:
+            return
+
+        costs = {}
+        for company_id in {group[5] for group in groups}:
+            products = self.env['product.product'].with_company(company_id).browse(
+                {group[1] for group in groups if group[5] == company_id})
+            costs.update({(product.id, company_id): product.standard_price for product in products})
+
+        rows = [
+            (day, product_id, tmpl_id, reason, warehouse_id, company_id, count, quantity,
+             quantity * costs[product_id, company_id], self.env.uid, self.env.uid)
+            for day, product_id, tmpl_id, reason, warehouse_id, company_id, count, quantity in groups
+        ]
+        row_template = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW() AT TIME ZONE 'UTC', NOW() AT TIME ZONE 'UTC')"
+        self.env.cr.execute(f"""
+            INSERT INTO stock_move_cost_report (
+                day, product_id, product_tmpl_id, move_reason, warehouse_id, company_id,
+                move_count, quantity, cost_impact, create_uid, write_uid,
+                create_date, write_date
+            )
+            VALUES {", ".join([row_template] * len(rows))}
+            ON CONFLICT (day, product_id, COALESCE(move_reason, ''), COALESCE(warehouse_id, 0), company_id)
+            DO UPDATE SET move_count = stock_move_cost_report.move_count + EXCLUDED.move_count,
+                          quantity = stock_move_cost_report.quantity + EXCLUDED.quantity,
+                          cost_impact = stock_move_cost_report.cost_impact + EXCLUDED.cost_impact,
+                          write_uid = EXCLUDED.write_uid,
+                          write_date = EXCLUDED.write_date
+        """, [value for row in rows for value in row])
+        self.invalidate_model()
+
+    @api.model
+    def _add_late_moves(self, move_ids):
+        """Fold in moves validated after the refresh already passed their id"""
+        if not move_ids:
+            return
+        last_move_id = self._get_last_move_id('SHARE')
+        late_ids = [move_id for move_id in move_ids if last_move_id is not None and move_id <= last_move_id]
+        if late_ids:
+            self._fold_moves("move.id IN %s", [tuple(late_ids)])
+
+    @api.model
+    def _lock_last_move_id(self, commit):
+        """Take the exclusive lock on the last processed move id, and read it
+
+        When committing, a new read committed transaction is started first:
+        queries run once the lock is granted then see every validation that
+        held the shared lock, which a snapshot taken before the lock would miss.
+        """
+        if commit:
+            self.env.cr.commit()
+            self.env.cr.execute("SET TRANSACTION ISOLATION LEVEL READ COMMITTED")
+        return self._get_last_move_id('UPDATE')
+
+    @api.model
+    def _refresh(self, commit=False):
+        """Fold in done moves created since the last processed move id, batch by batch
+
+        Args:
+            commit: run each batch in its own committed transaction, as the cron
+                does while validations run concurrently
+        """
+        if self._lock_last_move_id(commit) is None:
+            self.env['ir.config_parameter'].sudo().set_param(LAST_MOVE_PARAM, 0)
+        last_move_id = self._lock_last_move_id(commit)
+        self.env.cr.execute("SELECT MAX(id) FROM stock_move")
+        max_move_id = self.env.cr.fetchone()[0] or 0
+
+        while last_move_id < max_move_id:
+            batch_end = min(last_move_id + BATCH_SIZE, max_move_id)
+            self._fold_moves("move.id > %s AND move.id <= %s", [last_move_id, batch_end])
+            last_move_id = batch_end
+            self.env.cr.execute("UPDATE ir_config_parameter SET value = %s WHERE key = %s",
+                                [str(last_move_id), LAST_MOVE_PARAM])
+            if commit:
+                self._lock_last_move_id(commit)
+        return last_move_id
+
+    @api.model
+    def _build_move_cost_report(self):
+        """Build the cost analysis in the current transaction, on module install"""
+        last_move_id = self._refresh(commit=False)
+        _logger.info(f"Stock move cost report built up to move {last_move_id}")
+        return True
+
+    @api.model
+    def cron_refresh_move_cost_report(self):
+        """Cron job to fold newly done stock moves into the cost analysis"""
+        last_move_id = self._refresh(commit=True)
+        _logger.info(f"Stock move cost report refreshed up to move {last_move_id}")
+        return True
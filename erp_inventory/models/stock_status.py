@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import models, api
+
+_logger = logging.getLogger(__name__)
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    def _get_on_hand_quantities(self):
+        """On-hand quantity in internal locations per template, in one grouped query
+
+        Returns:
+            dict mapping template id to quantity; templates without stock are missing
+        """
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity'])
+        query = """
+            SELECT product.product_tmpl_id, SUM(quant.quantity)
+              FROM stock_quant quant
+              JOIN product_product product ON product.id = quant.product_id
+              JOIN stock_location location ON location.id = quant.location_id
+             WHERE location.usage = 'internal'
+        """
+        params = []
+        if self:
+            query += " AND product.product_tmpl_id IN %s"
+            params.append(tuple(self.ids))
+        query += " GROUP BY product.product_tmpl_id"
+        self.env.cr.execute(query, params)
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _get_stock_status(self, quantity, min_stock_level):
+        """Stock status and low-stock flag for an on-hand quantity"""
+        if quantity <= 0:
+            return 'out_of_stock', quantity < min_stock_level
+        if quantity < min_stock_level:
+            return 'low_stock', True
+        return 'in_stock', False
+
+    def _refresh_stock_status(self):
+        """Recompute stock status of storable templates, writing only those that changed
+
+        An empty recordset refreshes every storable template.
+
+        Returns:
+            dict mapping changed template ids to (old status, new status)
+        """
+        if self:
+            templates = self.filtered(lambda template: template.type == 'product')
+            quantities = templates._get_on_hand_quantities() if templates else {}
+        else:
+            templates = self.search([('type', '=', 'product')])
+            quantities = self._get_on_hand_quantities()
+
+        changes = {}
+        to_write = {}
+        for template in templates:
+            status, is_low = self._get_stock_status(quantities.get(template.id, 0.0), template.min_stock_level)
+            if status != template.stock_status or is_low != template.is_low_stock:
+                changes[template.id] = (template.stock_status, status)
+                to_write.setdefault((status, is_low), []).append(template.id)
+
+        # At most one write per distinct status
+        for (status, is_low), ids in to_write.items():
+            self.browse(ids).write({'stock_status': status, 'is_low_stock': is_low})
+        self.env['stock.low.stock.alert'].sudo()._record_status_changes(changes, quantities)
+        return changes
+
+    @api.model
+    def cron_refresh_stock_status(self):
+        """Cron job to sweep stock status of all storable products"""
+        changes = self.browse()._refresh_stock_status()
+        _logger.info(f"Stock status sweep updated {len(changes)} products")
+        return True
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, fields, api
 from odoo.exceptions import ValidationError
 
@@ -10,25 +12,89 @@ class Warehouse(models.Model):
     # Additional warehouse fields
     manager_id = fields.Many2one('res.users', string='Warehouse Manager')
     capacity = fields.Float('Storage Capacity', help="Total storage capacity in cubic meters")
-    current_utilization = fields.Float('Current Utilization %', compute='_compute_utilization')
+    occupied_volume = fields.Float('Occupied Volume', readonly=True,
+                                   help="Volume of stock in the stock location tree, in cubic meters")
+    current_utilization = fields.Float('Current Utilization %', compute='_compute_utilization', store=True)
     address = fields.Text('Warehouse Address')
     contact_phone = fields.Char('Contact Phone')
     contact_email = fields.Char('Contact Email')
     is_active = fields.Boolean('Active', default=True)
     
-    @api.depends('lot_stock_id')
+    @api.depends('occupied_volume', 'capacity')
     def _compute_utilization(self):
         """Calculate warehouse utilization percentage"""
         for warehouse in self:
-            # Simplified calculation - can be enhanced based on actual volume
             if warehouse.capacity > 0:
-                total_products = self.env['stock.quant'].search_count([
-                    ('location_id', 'child_of', warehouse.lot_stock_id.id),
-                    ('quantity', '>', 0)
-                ])
-                warehouse.current_utilization = min((total_products / warehouse.capacity) * 100, 100)
+                warehouse.current_utilization = min((warehouse.occupied_volume / warehouse.capacity) * 100, 100)
             else:
                 warehouse.current_utilization = 0.0
+    
+    def _refresh_occupied_volume(self):
+        """Recompute occupied volume of warehouses with one grouped query
+        
+        Sums quantity x product volume over the quants of each warehouse's stock
+        location tree, matched by parent_path prefix. An empty recordset refreshes
+        every warehouse.
+        """
+        warehouses = self or self.with_context(active_test=False).search([])
+        if not warehouses:
+            return
+        self.env['stock.quant'].flush_model(['product_id', 'location_id', 'quantity'])
+        self.env['stock.location'].flush_model(['parent_path'])
+        self.env['product.product'].flush_model(['volume'])
+        self.env.cr.execute("""
+            SELECT warehouse.id, COALESCE(SUM(quant.quantity * product.volume), 0)
+              FROM stock_warehouse warehouse
+              JOIN stock_location root ON root.id = warehouse.lot_stock_id
+              LEFT JOIN stock_location location ON location.parent_path LIKE root.parent_path || '%%'
+              LEFT JOIN stock_quant quant ON quant.location_id = location.id AND quant.quantity > 0
+              LEFT JOIN product_product product ON product.id = quant.product_id
+             WHERE warehouse.id IN %s
+          GROUP BY warehouse.id
+        """, (tuple(warehouses.ids),))
+        volumes = dict(self.env.cr.fetchall())
+        for warehouse in warehouses:
+            volume = volumes.get(warehouse.id, 0.0)
+            if warehouse.occupied_volume != volume:
+                warehouse.occupied_volume = volume
+    
+    @api.model
+    def _add_moved_volume(self, moves):
+        """Apply the volume that done moves bring into or take out of warehouse stock
+        
+        The signed quantity x product volume of each move is added to the
+        warehouses whose stock location tree it enters or leaves, with one
+        relative update; the daily cron recomputes the totals from quants.
+        """
+        deltas = defaultdict(float)
+        for move in moves:
+            if not move.product_id.volume:
+                continue
+            volume = move.product_uom._compute_quantity(move.quantity, move.product_id.uom_id) * move.product_id.volume
+            for location, sign in ((move.location_dest_id, 1), (move.location_id, -1)):
+                warehouse = location.warehouse_id
+                if warehouse and (location.parent_path or '').startswith(warehouse.lot_stock_id.parent_path or '/'):
+                    deltas[warehouse.id] += sign * volume
+        deltas = {warehouse_id: delta for warehouse_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        self.flush_model(['occupied_volume', 'capacity'])
+        self.env.cr.execute(f"""
+            UPDATE stock_warehouse warehouse
+               SET occupied_volume = COALESCE(warehouse.occupied_volume, 0) + delta.volume,
+                   current_utilization = CASE WHEN warehouse.capacity > 0
+                       THEN LEAST((COALESCE(warehouse.occupied_volume, 0) + delta.volume) / warehouse.capacity * 100, 100)
+                       ELSE 0 END
+              FROM (VALUES {", ".join(["(%s, %s)"] * len(deltas))}) AS delta (id, volume)
+             WHERE warehouse.id = delta.id
+        """, [value for item in deltas.items() for value in item])
+        self.browse(deltas).invalidate_recordset(['occupied_volume', 'current_utilization'])
+    
+    @api.model
+    def cron_refresh_utilization(self):
+        """Cron job to recompute utilization of all warehouses"""
+        self.browse()._refresh_occupied_volume()
+        return True
 
 
 class StockLocation(models.Model):
@@ -39,24 +105,40 @@ class StockLocation(models.Model):
     rack = fields.Char('Rack')
     shelf = fields.Char('Shelf')
     bin = fields.Char('Bin')
-    barcode = fields.Char('Location Barcode')
+    barcode = fields.Char('Location Barcode', index=True)
     temperature_controlled = fields.Boolean('Temperature Controlled')
     temperature_range = fields.Char('Temperature Range')
     
-    @api.depends('aisle', 'rack', 'shelf', 'bin')
-    def _compute_display_name(self):
-        """Enhanced display name with location details"""
-        super()._compute_display_name()
+    location_label = fields.Char('Location Label', compute='_compute_location_label', store=True, index='trigram',
+                                 help="Full location name with aisle, rack, shelf and bin details")
+    
+    _rec_names_search = ['complete_name', 'barcode', 'location_label']
+    
+    @api.depends('complete_name', 'aisle', 'rack', 'shelf', 'bin')
+    def _compute_location_label(self):
+        """Compose the detailed location name once, when its parts change"""
         for location in self:
             if location.aisle or location.rack:
-                parts = [location.name]
+                parts = [location.complete_name or location.name]
                 if location.aisle:
                     parts.append(f"Aisle {location.aisle}")
                 if location.rack:
                     parts.append(f"Rack {location.rack}")
                 if location.shelf:
                     parts.append(f"Shelf {location.shelf}")
-                location.display_name = " - ".join(parts)
+                if location.bin:
+                    parts.append(f"Bin {location.bin}")
+                location.location_label = " - ".join(parts)
+            else:
+                location.location_label = False
+    
+    @api.depends('location_label')
+    def _compute_display_name(self):
+        """Enhanced display name with location details"""
+        detailed = self.filtered('location_label')
+        for location in detailed:
+            location.display_name = location.location_label
+        super(StockLocation, self - detailed)._compute_display_name()
 
 
 class StockQuant(models.Model):
@@ -70,6 +152,23 @@ class StockQuant(models.Model):
     @api.constrains('quantity')
     def _check_negative_quantity(self):
         """Prevent negative stock quantities"""
-        for quant in self:
-            if quant.quantity < 0 and quant.location_id.usage == 'internal':
-                raise ValidationError(f"Negative stock not allowed for {quant.product_id.name} at {quant.location_id.name}")
+        self.flush_recordset(['quantity', 'location_id', 'product_id'])
+        self.env.cr.execute("""
+            SELECT quant.product_id, quant.location_id
+              FROM stock_quant quant
+              JOIN stock_location location ON location.id = quant.location_id
+             WHERE quant.id IN %s
+               AND quant.quantity < 0
+               AND location.usage = 'internal'
+        """, [tuple(self.ids)])
+        offenders = self.env.cr.fetchall()
+        if offenders:
+            products = self.env['product.product'].browse({product_id for product_id, __ in offenders})
+            locations = self.env['stock.location'].browse({location_id for __, location_id in offenders})
+            product_names = {product.id: product.name for product in products}
+            location_names = {location.id: location.name for location in locations}
+            lines = "\n".join(
+                f"- {product_names[product_id]} at {location_names[location_id]}"
+                for product_id, location_id in offenders
+            )
+            raise ValidationError(f"Negative stock not allowed for:\n{lines}")
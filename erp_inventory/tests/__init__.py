@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+
+from . import test_stock_status
+from . import test_stock_alert
+from . import test_warehouse_utilization
+from . import test_scan_resolver
+from . import test_location_label
+from . import test_move_cost_report
+from . import test_stock_expiry
+from . import test_negative_stock
+from . import test_delivery_confirmation
+from . import test_delivery_eta
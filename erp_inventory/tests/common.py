@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import TransactionCase
+
+
+class TestErpInventoryCommon(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestErpInventoryCommon, cls).setUpClass()
+        cls.warehouse = cls.env['stock.warehouse'].create({
+            'name': 'ERP Test Warehouse',
+            'code': 'ERPTW',
+        })
+        cls.stock_location = cls.warehouse.lot_stock_id
+        cls.supplier_location = cls.env.ref('stock.stock_location_suppliers')
+        cls.customer_location = cls.env.ref('stock.stock_location_customers')
+        cls.product = cls.env['product.product'].create({
+            'name': 'ERP Test Product',
+            'type': 'product',
+            'standard_price': 10.0,
+            'volume': 0.5,
+        })
+        cls.product_tmpl = cls.product.product_tmpl_id
+
+    @classmethod
+    def _move_product(cls, product, quantity, location, location_dest, move_reason='adjustment'):
+        """Validate a stock move of a product between two locations"""
+        move = cls.env['stock.move'].create({
+            'name': product.name,
+            'product_id': product.id,
+            'product_uom_qty': quantity,
+            'product_uom': product.uom_id.id,
+            'location_id': location.id,
+            'location_dest_id': location_dest.id,
+            'move_reason': move_reason,
+        })
+        move._action_confirm()
+        move._action_assign()
+        move.quantity = quantity
+        move.picked = True
+        move._action_done()
+        return move
+
+    @classmethod
+    def _receive(cls, product, quantity, location=None):
+        return cls._move_product(product, quantity, cls.supplier_location, location or cls.stock_location, 'purchase')
+
+    @classmethod
+    def _deliver(cls, product, quantity, location=None):
+        return cls._move_product(product, quantity, location or cls.stock_location, cls.customer_location, 'sale')
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestDeliveryConfirmation(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestDeliveryConfirmation, cls).setUpClass()
+        cls.product_2 = cls.env['product.product'].create({'name': 'ERP Test Unstocked', 'type': 'product'})
+        cls._receive(cls.product, 100)
+        cls.env['ir.config_parameter'].sudo().set_param('erp_inventory.delivery_confirm_batch_size', 2)
+
+    def _create_delivery(self, product, quantity):
+        picking = self.env['stock.picking'].create({
+            'picking_type_id': self.warehouse.out_type_id.id,
+            'location_id': self.stock_location.id,
+            'location_dest_id': self.customer_location.id,
+            'move_ids': [(0, 0, {
+                'name': product.name,
+                'product_id': product.id,
+                'product_uom_qty': quantity,
+                'product_uom': product.uom_id.id,
+                'location_id': self.stock_location.id,
+                'location_dest_id': self.customer_location.id,
+            })],
+        })
+        picking.action_confirm()
+        picking.action_assign()
+        return picking
+
+    def test_batch_with_partial_failure(self):
+        """A failing delivery is isolated; the rest of its batch and other batches are validated"""
+        first = self._create_delivery(self.product, 10)
+        unstocked = self._create_delivery(self.product_2, 5)
+        third = self._create_delivery(self.product, 20)
+        pickings = first | unstocked | third
+
+        result = pickings.action_confirm_delivery()
+
+        self.assertEqual((first | third).mapped('state'), ['done', 'done'])
+        self.assertNotEqual(unstocked.state, 'done')
+        self.assertTrue(first.actual_delivery_date)
+        self.assertTrue(third.actual_delivery_date)
+        self.assertFalse(unstocked.actual_delivery_date)
+        self.assertEqual(result['params']['type'], 'warning')
+        self.assertIn(unstocked.name, result['params']['message'])
+        self.assertIn('2 deliveries confirmed', result['params']['message'])
+
+    def test_batches_return_outcome(self):
+        """Batch validation reports validated and failed pickings"""
+        deliveries = self._create_delivery(self.product, 5) | self._create_delivery(self.product, 5)
+        unstocked = self._create_delivery(self.product_2, 5)
+        validated, failed = (deliveries | unstocked)._validate_deliveries_in_batches()
+        self.assertEqual(validated, deliveries)
+        self.assertEqual(failed, unstocked)
+        self.assertEqual(set(deliveries.mapped('state')), {'done'})
+        self.assertEqual(self.product.qty_available, 90.0)
+
+    def test_all_confirmed(self):
+        pickings = self._create_delivery(self.product, 5) | self._create_delivery(self.product, 5)
+        result = pickings.action_confirm_delivery()
+        self.assertEqual(result['params']['type'], 'success')
+        self.assertEqual(set(pickings.mapped('state')), {'done'})
+
+    def test_single_delivery(self):
+        """A single picking goes through the regular validation and gets its delivery date"""
+        picking = self._create_delivery(self.product, 5)
+        picking.action_confirm_delivery()
+        self.assertEqual(picking.state, 'done')
+        self.assertTrue(picking.actual_delivery_date)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestDeliveryEta(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestDeliveryEta, cls).setUpClass()
+        cls.region = cls.env['res.country.state'].search([], limit=1)
+        cls.partner = cls.env['res.partner'].create({'name': 'ERP Test Consignee', 'state_id': cls.region.id})
+        cls.out_type = cls.warehouse.out_type_id
+        estimated = fields.Datetime.now().replace(microsecond=0) - timedelta(days=5)
+        # Delays in hours of past deliveries: median 5
+        delays = [2, 4, 5, 6, 8]
+        pickings = cls.env['stock.picking'].create([{
+            'picking_type_id': cls.out_type.id,
+            'location_id': cls.stock_location.id,
+            'location_dest_id': cls.customer_location.id,
+            'partner_id': cls.partner.id,
+            'vehicle_number': 'ERP-TRK-1',
+            'estimated_delivery_date': estimated,
+        } for __ in delays])
+        cls.env.flush_all()
+        for picking, delay in zip(pickings, delays):
+            cls.env.cr.execute("UPDATE stock_picking SET state = 'done', actual_delivery_date = %s WHERE id = %s",
+                               [estimated + timedelta(hours=delay), picking.id])
+        pickings.invalidate_recordset()
+        cls.env['stock.delivery.eta']._fit()
+
+    def test_fitted_distributions(self):
+        """Delays are fitted per route, vehicle and region"""
+        Eta = self.env['stock.delivery.eta']
+        route = Eta.search([('dimension', '=', 'route'), ('picking_type_id', '=', self.out_type.id)])
+        vehicle = Eta.search([('dimension', '=', 'vehicle'), ('vehicle_number', '=', 'ERP-TRK-1')])
+        self.assertRecordValues(route | vehicle, [
+            {'sample_count': 5, 'median_delay': 5.0, 'mean_delay': 5.0},
+            {'sample_count': 5, 'median_delay': 5.0, 'mean_delay': 5.0},
+        ])
+        self.assertAlmostEqual(vehicle.p90_delay, 7.2)
+        self.assertTrue(Eta.search([('dimension', '=', 'all')]))
+
+    def test_expected_delay_fallback(self):
+        """The most specific distribution with enough samples is used"""
+        Eta = self.env['stock.delivery.eta']
+        table = Eta._get_delay_table()
+        self.assertEqual(table['vehicle', 'ERP-TRK-1'], 5.0)
+        self.assertEqual(Eta._get_expected_delay(False, 'ERP-TRK-1', False), 5.0)
+        self.assertEqual(Eta._get_expected_delay(self.out_type.id, 'ERP-NEW-TRUCK', False, table), 5.0)
+        self.assertEqual(Eta._get_expected_delay(False, False, False, {}), 0.0)
+        self.assertEqual(Eta._get_expected_delay(False, False, False, {('all', None): 1.5}), 1.5)
+
+        # Thin distributions are ignored
+        Eta.search([('vehicle_number', '=', 'ERP-TRK-1')]).sample_count = 2
+        self.assertNotIn(('vehicle', 'ERP-TRK-1'), Eta._get_delay_table())
+
+    def test_predicted_delivery_date(self):
+        """Open pickings are stamped with their estimated date plus the expected delay"""
+        self._receive(self.product, 10)
+        estimated = fields.Datetime.now().replace(microsecond=0) + timedelta(days=2)
+        picking = self.env['stock.picking'].create({
+            'picking_type_id': self.out_type.id,
+            'location_id': self.stock_location.id,
+            'location_dest_id': self.customer_location.id,
+            'partner_id': self.partner.id,
+            'vehicle_number': 'ERP-TRK-1',
+            'estimated_delivery_date': estimated,
+            'move_ids': [(0, 0, {
+                'name': self.product.name,
+                'product_id': self.product.id,
+                'product_uom_qty': 2.0,
+                'product_uom': self.product.uom_id.id,
+                'location_id': self.stock_location.id,
+                'location_dest_id': self.customer_location.id,
+            })],
+        })
+        self.assertFalse(picking.predicted_delivery_date)
+
+        picking.action_confirm()
+        self.assertEqual(picking.predicted_delivery_date, estimated + timedelta(hours=5))
+
+        # Done pickings keep their prediction
+        picking.button_validate()
+        self.assertEqual(picking.state, 'done')
+        self.assertEqual(picking.predicted_delivery_date, estimated + timedelta(hours=5))
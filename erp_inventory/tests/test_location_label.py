@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestLocationLabel(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestLocationLabel, cls).setUpClass()
+        cls.zone = cls.env['stock.location'].create({
+            'name': 'Cold Zone',
+            'location_id': cls.stock_location.id,
+        })
+        cls.bin = cls.env['stock.location'].create({
+            'name': 'Bin 7',
+            'location_id': cls.zone.id,
+            'aisle': 'A',
+            'rack': '3',
+            'shelf': '2',
+            'bin': '7',
+        })
+
+    def test_label_composition(self):
+        """Locations with an aisle or rack display their full position"""
+        self.assertEqual(self.bin.location_label, 'ERPTW/Stock/Cold Zone/Bin 7 - Aisle A - Rack 3 - Shelf 2 - Bin 7')
+        self.assertEqual(self.bin.display_name, self.bin.location_label)
+        self.assertFalse(self.zone.location_label)
+        self.assertEqual(self.zone.display_name, 'ERPTW/Stock/Cold Zone')
+
+    def test_label_follows_parents(self):
+        """Renaming a parent location or editing a position part updates stored labels"""
+        self.zone.name = 'Frozen Zone'
+        self.assertEqual(self.bin.location_label, 'ERPTW/Stock/Frozen Zone/Bin 7 - Aisle A - Rack 3 - Shelf 2 - Bin 7')
+        self.bin.write({'shelf': False, 'bin': False})
+        self.assertEqual(self.bin.location_label, 'ERPTW/Stock/Frozen Zone/Bin 7 - Aisle A - Rack 3')
+        self.bin.write({'aisle': False, 'rack': False})
+        self.assertFalse(self.bin.location_label)
+        self.assertEqual(self.bin.display_name, 'ERPTW/Stock/Frozen Zone/Bin 7')
+
+    def test_search_by_label(self):
+        """Locations are found by name search on their label"""
+        results = self.env['stock.location'].name_search('Aisle A - Rack 3')
+        self.assertIn(self.bin.id, [location_id for location_id, __ in results])
+        self.assertEqual(self.env['stock.location'].search([('location_label', 'ilike', 'Rack 3 - Shelf 2')]), self.bin)
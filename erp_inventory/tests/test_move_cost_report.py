@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestMoveCostReport(TestErpInventoryCommon):
+
+    def setUp(self):
+        super(TestMoveCostReport, self).setUp()
+        self.Report = self.env['stock.move.cost.report']
+        # Start from a report that is up to date with existing moves
+        self.Report._refresh()
+
+    def _get_rows(self, move_reason):
+        return self.Report.search([('product_id', '=', self.product.id), ('move_reason', '=', move_reason)])
+
+    def test_refresh_folds_new_moves(self):
+        """Done moves are summed per day, product, reason and warehouse"""
+        self._receive(self.product, 20)
+        self._receive(self.product, 5)
+        self._deliver(self.product, 8)
+        self.assertFalse(self._get_rows('purchase'))
+
+        self.Report._refresh()
+        received = self._get_rows('purchase')
+        self.assertRecordValues(received, [{
+            'move_count': 2, 'quantity': 25.0, 'cost_impact': 250.0, 'warehouse_id': self.warehouse.id,
+        }])
+        self.assertRecordValues(self._get_rows('sale'), [{'move_count': 1, 'quantity': 8.0, 'cost_impact': 80.0}])
+
+        # A refresh without new moves changes nothing
+        self.Report._refresh()
+        self.assertEqual(received.move_count, 2)
+
+        self._receive(self.product, 5)
+        self.Report._refresh()
+        self.assertRecordValues(received, [{'move_count': 3, 'quantity': 30.0, 'cost_impact': 300.0}])
+
+    def test_late_validation(self):
+        """Moves validated after the refresh passed their id are added once"""
+        move = self.env['stock.move'].create({
+            'name': self.product.name,
+            'product_id': self.product.id,
+            'product_uom_qty': 4.0,
+            'product_uom': self.product.uom_id.id,
+            'location_id': self.supplier_location.id,
+            'location_dest_id': self.stock_location.id,
+            'move_reason': 'return',
+        })
+        move._action_confirm()
+        self.Report._refresh()
+        self.assertFalse(self._get_rows('return'))
+
+        move.quantity = 4.0
+        move.picked = True
+        move._action_done()
+        self.assertRecordValues(self._get_rows('return'), [{'move_count': 1, 'quantity': 4.0, 'cost_impact': 40.0}])
+
+        self.Report._refresh()
+        self.assertEqual(self._get_rows('return').move_count, 1)
+
+    def test_build_from_scratch(self):
+        """Building the report without a watermark folds every done move"""
+        self._receive(self.product, 20)
+        self.env.cr.execute("DELETE FROM stock_move_cost_report")
+        self.env['ir.config_parameter'].sudo().search([
+            ('key', '=', 'erp_inventory.move_cost_report_last_move_id'),
+        ]).unlink()
+        self.Report.invalidate_model()
+
+        self.Report._build_move_cost_report()
+        self.assertRecordValues(self._get_rows('purchase'), [{'move_count': 1, 'quantity': 20.0}])
+        self.env.cr.execute("SELECT MAX(id) FROM stock_move")
+        self.assertEqual(int(self.env['ir.config_parameter'].sudo().get_param(
+            'erp_inventory.move_cost_report_last_move_id')), self.env.cr.fetchone()[0])
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import ValidationError
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestNegativeStock(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestNegativeStock, cls).setUpClass()
+        cls.product_2 = cls.env['product.product'].create({'name': 'ERP Test Product Two', 'type': 'product'})
+        cls.quants = cls.env['stock.quant'].create([{
+            'product_id': product.id,
+            'location_id': cls.stock_location.id,
+            'quantity': 5.0,
+        } for product in (cls.product, cls.product_2)])
+
+    def test_negative_internal_stock(self):
+        """Every quant going negative in internal locations is reported at once"""
+        with self.assertRaises(ValidationError) as error:
+            self.quants.write({'quantity': -1.0})
+        message = str(error.exception)
+        self.assertIn('ERP Test Product at Stock', message)
+        self.assertIn('ERP Test Product Two at Stock', message)
+
+    def test_positive_and_external_stock(self):
+        """Positive stock and negative stock outside internal locations are allowed"""
+        self.quants.write({'quantity': 0.0})
+        customer_quant = self.env['stock.quant'].create({
+            'product_id': self.product.id,
+            'location_id': self.customer_location.id,
+            'quantity': -5.0,
+        })
+        self.assertEqual(customer_quant.quantity, -5.0)
+
+    def test_move_validation_blocked(self):
+        """Delivering more than the internal stock fails validation"""
+        with self.assertRaises(ValidationError):
+            self._deliver(self.product, 8)
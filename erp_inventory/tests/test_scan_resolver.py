@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestScanResolver(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestScanResolver, cls).setUpClass()
+        cls.product_tmpl.write({'barcode': 'ERP-SCAN-001', 'qr_code': 'ERP-QR-001'})
+        cls.location = cls.env['stock.location'].create({
+            'name': 'ERP Scan Bin',
+            'location_id': cls.stock_location.id,
+            'barcode': 'ERP-LOC-001',
+        })
+        cls.resolver = cls.env['stock.scan.resolver']
+
+    def test_resolve_code(self):
+        """Product barcodes, QR codes and location barcodes resolve to their record"""
+        product = {'model': 'product.template', 'id': self.product_tmpl.id}
+        self.assertEqual(self.resolver.resolve_code('ERP-SCAN-001'), product)
+        self.assertEqual(self.resolver.resolve_code(' ERP-QR-001\n'), product)
+        self.assertEqual(self.resolver.resolve_code('ERP-LOC-001'), {'model': 'stock.location', 'id': self.location.id})
+        self.assertFalse(self.resolver.resolve_code('ERP-UNKNOWN'))
+        self.assertFalse(self.resolver.resolve_code(''))
+        self.assertFalse(self.resolver.resolve_code(False))
+
+    def test_resolve_codes(self):
+        """A list of scans is resolved at once, unknown codes included"""
+        self.assertEqual(self.resolver.resolve_codes(['ERP-SCAN-001', 'ERP-LOC-001 ', 'ERP-UNKNOWN', '']), {
+            'ERP-SCAN-001': {'model': 'product.template', 'id': self.product_tmpl.id},
+            'ERP-LOC-001 ': {'model': 'stock.location', 'id': self.location.id},
+            'ERP-UNKNOWN': False,
+            '': False,
+        })
+
+    def test_product_codes_win(self):
+        """A code used by a product and a location resolves to the product"""
+        self.location.barcode = 'ERP-SCAN-001'
+        self.assertEqual(self.resolver.resolve_code('ERP-SCAN-001')['model'], 'product.template')
+
+    def test_cache_follows_code_changes(self):
+        """Cached resolutions are dropped when codes change or records are archived"""
+        self.assertTrue(self.resolver.resolve_code('ERP-SCAN-001'))
+        self.assertFalse(self.resolver.resolve_code('ERP-SCAN-002'))
+
+        self.product_tmpl.barcode = 'ERP-SCAN-002'
+        self.assertFalse(self.resolver.resolve_code('ERP-SCAN-001'))
+        self.assertEqual(self.resolver.resolve_code('ERP-SCAN-002')['id'], self.product_tmpl.id)
+
+        self.assertTrue(self.resolver.resolve_code('ERP-LOC-001'))
+        self.location.active = False
+        self.assertFalse(self.resolver.resolve_code('ERP-LOC-001'))
+
+        other = self.env['product.template'].create({'name': 'ERP Scan Other', 'barcode': 'ERP-SCAN-003'})
+        self.assertEqual(self.resolver.resolve_code('ERP-SCAN-003')['id'], other.id)
+        other.unlink()
+        self.assertFalse(self.resolver.resolve_code('ERP-SCAN-003'))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestStockAlert(TestErpInventoryCommon):
+
+    def _get_alerts(self, template):
+        return self.env['stock.low.stock.alert'].search([('product_tmpl_id', '=', template.id)], order='id')
+
+    def _fetch(self, consumer):
+        return [
+            alert for alert in self.env['stock.low.stock.alert'].fetch_alerts(consumer)
+            if alert['product_tmpl_id'][0] == self.product_tmpl.id
+        ]
+
+    def test_alert_lifecycle(self):
+        """Status changes open one alert per product and resolve the previous one"""
+        self.assertFalse(self._get_alerts(self.product_tmpl), "New products raise no alert")
+
+        self._receive(self.product, 20)
+        self.assertFalse(self._get_alerts(self.product_tmpl))
+
+        self._deliver(self.product, 15)
+        low_alert = self._get_alerts(self.product_tmpl)
+        self.assertRecordValues(low_alert, [{
+            'alert_type': 'low_stock', 'state': 'open', 'on_hand_qty': 5.0, 'min_stock_level': 10.0,
+        }])
+
+        # Staying low raises nothing new
+        self._deliver(self.product, 1)
+        self.assertEqual(self._get_alerts(self.product_tmpl), low_alert)
+
+        self._deliver(self.product, 4)
+        alerts = self._get_alerts(self.product_tmpl)
+        self.assertRecordValues(alerts, [
+            {'alert_type': 'low_stock', 'state': 'resolved'},
+            {'alert_type': 'out_of_stock', 'state': 'open'},
+        ])
+        self.assertTrue(alerts[0].resolved_date)
+
+        self._receive(self.product, 50)
+        self.assertEqual(set(self._get_alerts(self.product_tmpl).mapped('state')), {'resolved'})
+
+    def test_consumers_acknowledge_separately(self):
+        """Each consumer fetches an alert until it acknowledges it"""
+        self._receive(self.product, 20)
+        self._deliver(self.product, 15)
+        self._deliver(self.product, 5)
+
+        fetched = self._fetch('erp_test_dashboard')
+        self.assertEqual([alert['alert_type'] for alert in fetched], ['low_stock', 'out_of_stock'])
+        self.env['stock.low.stock.alert'].ack_alerts('erp_test_dashboard', [fetched[0]['id']])
+        self.assertEqual([alert['id'] for alert in self._fetch('erp_test_dashboard')], [fetched[1]['id']])
+        self.assertEqual(len(self._fetch('erp_test_mailer')), 2)
+
+        # Acknowledging twice is harmless
+        self.env['stock.low.stock.alert'].ack_alerts('erp_test_dashboard', [alert['id'] for alert in fetched])
+        self.assertFalse(self._fetch('erp_test_dashboard'))
+        self.assertEqual(self.env['stock.low.stock.alert.ack'].search_count([
+            ('alert_id', 'in', [alert['id'] for alert in fetched]),
+            ('consumer', '=', 'erp_test_dashboard'),
+        ]), 2)
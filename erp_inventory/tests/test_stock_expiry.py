@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestStockExpiry(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestStockExpiry, cls).setUpClass()
+        cls.today = fields.Date.context_today(cls.env['stock.expiry.alert'])
+        cls.stock_location.removal_strategy_id = cls.env.ref('erp_inventory.removal_expiry_fefo')
+        cls.quant_late, cls.quant_soon, cls.quant_undated = cls.env['stock.quant'].create([{
+            'product_id': cls.product.id,
+            'location_id': cls.stock_location.id,
+            'quantity': 5.0,
+            'batch_number': batch_number,
+            'expiry_date': expiry_date,
+        } for batch_number, expiry_date in (
+            ('B-LATE', cls.today + timedelta(days=40)),
+            ('B-SOON', cls.today + timedelta(days=10)),
+            ('B-NONE', False),
+        )])
+
+    def test_fefo_reservation(self):
+        """Deliveries reserve the earliest-expiring stock first, undated stock last"""
+        move = self.env['stock.move'].create({
+            'name': self.product.name,
+            'product_id': self.product.id,
+            'product_uom_qty': 12.0,
+            'product_uom': self.product.uom_id.id,
+            'location_id': self.stock_location.id,
+            'location_dest_id': self.customer_location.id,
+        })
+        move._action_confirm()
+        move._action_assign()
+        self.assertEqual(
+            [self.quant_soon.reserved_quantity, self.quant_late.reserved_quantity, self.quant_undated.reserved_quantity],
+            [5.0, 5.0, 2.0])
+
+    def test_removal_order(self):
+        self.assertEqual(self.env['stock.quant']._get_removal_strategy_order('expiry_fefo'), 'expiry_date, in_date, id')
+
+    def test_expiry_sweep(self):
+        """The sweep alerts stock expiring soon once, and resolves stale alerts"""
+        Alert = self.env['stock.expiry.alert']
+        Alert._sweep()
+        alert = Alert.search([('quant_id', 'in', (self.quant_soon | self.quant_late | self.quant_undated).ids)])
+        self.assertRecordValues(alert, [{
+            'quant_id': self.quant_soon.id, 'batch_number': 'B-SOON', 'quantity': 5.0,
+            'expiry_date': self.today + timedelta(days=10), 'warehouse_id': self.warehouse.id, 'state': 'open',
+        }])
+
+        Alert._sweep()
+        self.assertEqual(Alert.search_count([('quant_id', '=', self.quant_soon.id)]), 1)
+
+        # A new expiry date resolves the alert; an expiry within range raises a new one
+        self.quant_soon.expiry_date = self.today + timedelta(days=20)
+        Alert._sweep()
+        alerts = Alert.search([('quant_id', '=', self.quant_soon.id)], order='id')
+        self.assertEqual(alerts.mapped('state'), ['resolved', 'open'])
+
+        self.quant_soon.quantity = 0.0
+        Alert._sweep()
+        self.assertEqual(set(alerts.mapped('state')), {'resolved'})
+
+        Alert._sweep(days=60)
+        self.assertEqual(Alert.search([('quant_id', '=', self.quant_late.id)]).state, 'open')
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestStockStatus(TestErpInventoryCommon):
+
+    def _assert_status(self, template, status, is_low):
+        self.assertEqual((template.stock_status, template.is_low_stock), (status, is_low))
+
+    def test_new_product_status(self):
+        """New storable products start out of stock; consumables get no status"""
+        self._assert_status(self.product_tmpl, 'out_of_stock', True)
+        consumable = self.env['product.template'].create({'name': 'ERP Test Consumable', 'type': 'consu'})
+        self._assert_status(consumable, False, False)
+
+    def test_status_follows_done_moves(self):
+        """Validated moves update the status of the moved products"""
+        self._receive(self.product, 5)
+        self._assert_status(self.product_tmpl, 'low_stock', True)
+        self._receive(self.product, 20)
+        self._assert_status(self.product_tmpl, 'in_stock', False)
+        self._deliver(self.product, 25)
+        self._assert_status(self.product_tmpl, 'out_of_stock', True)
+
+    def test_status_counts_internal_stock_only(self):
+        """Stock in non-internal locations is not on hand"""
+        self._receive(self.product, 30)
+        self._deliver(self.product, 25)
+        self._assert_status(self.product_tmpl, 'low_stock', True)
+        self.assertEqual(self.product_tmpl._get_on_hand_quantities(), {self.product_tmpl.id: 5.0})
+
+    def test_status_follows_thresholds(self):
+        """Changing the minimum stock level re-evaluates the status"""
+        self._receive(self.product, 25)
+        self.product_tmpl.write({'min_stock_level': 30.0, 'max_stock_level': 100.0})
+        self._assert_status(self.product_tmpl, 'low_stock', True)
+        self.product_tmpl.min_stock_level = 0.0
+        self._assert_status(self.product_tmpl, 'in_stock', False)
+
+    def test_refresh_writes_changed_only(self):
+        """A refresh reports and writes only templates whose status changed"""
+        other = self.env['product.product'].create({'name': 'ERP Test Other', 'type': 'product'})
+        templates = self.product_tmpl | other.product_tmpl_id
+        self.assertEqual(templates._refresh_stock_status(), {})
+
+        # Quants changed without a stock move are caught by the sweep
+        self.env['stock.quant']._update_available_quantity(self.product, self.stock_location, 50.0)
+        self._assert_status(self.product_tmpl, 'out_of_stock', True)
+        self.env['product.template'].cron_refresh_stock_status()
+        self._assert_status(self.product_tmpl, 'in_stock', False)
+        self._assert_status(other.product_tmpl_id, 'out_of_stock', True)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests.common import tagged
+
+from .common import TestErpInventoryCommon
+
+
+@tagged('post_install', '-at_install')
+class TestWarehouseUtilization(TestErpInventoryCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestWarehouseUtilization, cls).setUpClass()
+        cls.warehouse.capacity = 100.0
+        cls.shelf_location = cls.env['stock.location'].create({
+            'name': 'ERP Test Shelf',
+            'location_id': cls.stock_location.id,
+        })
+
+    def _assert_volume(self, volume, utilization):
+        self.assertAlmostEqual(self.warehouse.occupied_volume, volume)
+        self.assertAlmostEqual(self.warehouse.current_utilization, utilization)
+
+    def test_moves_update_volume(self):
+        """Done moves entering or leaving the stock tree adjust the occupied volume"""
+        self._assert_volume(0.0, 0.0)
+        self._receive(self.product, 20)
+        self._assert_volume(10.0, 10.0)
+        self._receive(self.product, 10, self.shelf_location)
+        self._assert_volume(15.0, 15.0)
+
+        # Moves inside the stock tree leave the volume unchanged
+        self._move_product(self.product, 5, self.stock_location, self.shelf_location, 'transfer')
+        self._assert_volume(15.0, 15.0)
+
+        self._deliver(self.product, 8, self.shelf_location)
+        self._assert_volume(11.0, 11.0)
+
+    def test_refresh_matches_quants(self):
+        """The grouped refresh recomputes the volume from quants in the stock tree"""
+        self._receive(self.product, 20)
+        self._receive(self.product, 30, self.shelf_location)
+        # Stock of other warehouses is not counted
+        other_warehouse = self.env['stock.warehouse'].create({'name': 'ERP Test Other Warehouse', 'code': 'ERPOW'})
+        self._receive(self.product, 40, other_warehouse.lot_stock_id)
+
+        self.env.cr.execute("UPDATE stock_warehouse SET occupied_volume = 0 WHERE id = %s", [self.warehouse.id])
+        self.warehouse.invalidate_recordset(['occupied_volume'])
+        self.env['stock.warehouse'].cron_refresh_utilization()
+        self._assert_volume(25.0, 25.0)
+        self.assertAlmostEqual(other_warehouse.occupied_volume, 20.0)
+
+    def test_utilization_capped(self):
+        """Utilization tops out at 100% and is zero without a capacity"""
+        self._receive(self.product, 300)
+        self._assert_volume(150.0, 100.0)
+        self.warehouse.capacity = 0.0
+        self.assertEqual(self.warehouse.current_utilization, 0.0)
@@ -16,7 +16,7 @@
     """,
     'author': 'Your Name',
     'website': 'https://www.yourcompany.com',
-    'depends': ['base', 'sale', 'account', 'erp_inventory'],
+    'depends': ['base', 'sale', 'sale_stock', 'account', 'erp_inventory'],
     'data': [
         'security/sales_security.xml',
         'security/ir.model.access.csv',
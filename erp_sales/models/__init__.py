@@ -2,3 +2,4 @@
 
 from . import sale_order
 from . import customer
+from . import stock_picking
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+
+
+class StockPicking(models.Model):
+    _inherit = 'stock.picking'
+
+    def _on_delivery_confirmed(self):
+        """Stamp the actual delivery date on the sale orders of delivered pickings"""
+        res = super(StockPicking, self)._on_delivery_confirmed()
+        delivery_dates = {}
+        for picking in self.filtered(lambda p: p.sale_id and p.picking_type_code == 'outgoing'):
+            delivery_date = fields.Date.context_today(picking, picking.actual_delivery_date or fields.Datetime.now())
+            delivery_dates[picking.sale_id] = max(delivery_dates.get(picking.sale_id, delivery_date), delivery_date)
+
+        # One write per distinct date
+        orders_by_date = {}
+        for order, delivery_date in delivery_dates.items():
+            orders_by_date.setdefault(delivery_date, self.env['sale.order'])
+            orders_by_date[delivery_date] |= order
+        for delivery_date, orders in orders_by_date.items():
+            orders.sudo().write({'actual_delivery_date': delivery_date})
+        return res
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestSaleDeliveryConfirmation(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestSaleDeliveryConfirmation, cls).setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'ERP Test Customer'})
+        cls.product = cls.env['product.product'].create({'name': 'ERP Test Sold Product', 'type': 'product'})
+        cls.warehouse = cls.env['stock.warehouse'].search([('company_id', '=', cls.env.company.id)], limit=1)
+        cls.env['stock.quant']._update_available_quantity(cls.product, cls.warehouse.lot_stock_id, 50.0)
+
+    def _create_order(self, quantity):
+        order = self.env['sale.order'].create({
+            'partner_id': self.partner.id,
+            'warehouse_id': self.warehouse.id,
+            'order_line': [(0, 0, {'product_id': self.product.id, 'product_uom_qty': quantity})],
+        })
+        order.action_confirm()
+        return order
+
+    def test_bulk_confirmation_stamps_orders(self):
+        """Orders of pickings confirmed in bulk get their actual delivery date"""
+        orders = self._create_order(5) | self._create_order(10)
+        pending = self._create_order(3)
+
+        orders.picking_ids.action_confirm_delivery()
+
+        today = fields.Date.context_today(orders)
+        self.assertEqual(orders.mapped('actual_delivery_date'), [today, today])
+        self.assertEqual(set(orders.mapped('delivery_status')), {'delivered'})
+        self.assertFalse(pending.actual_delivery_date)
+
+    def test_single_confirmation_stamps_order(self):
+        order = self._create_order(5)
+        order.picking_ids.action_confirm_delivery()
+        self.assertEqual(order.picking_ids.state, 'done')
+        self.assertEqual(order.actual_delivery_date, fields.Date.context_today(order))